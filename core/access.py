@@ -26,9 +26,10 @@ See:
 from __future__ import annotations
 
 from typing import Optional
+import weakref
 
 from django.contrib.auth import get_user_model
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db.models import Q, QuerySet
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -65,6 +66,131 @@ ADMIN_LIKE_ROLES = frozenset({ROLE_ADMIN, ROLE_OWNER})
 
 User = get_user_model()
 
+#: Attribute under which a request-bound Principal is stored on the user.
+PRINCIPAL_ATTR = "_kibray_principal"
+
+#: Live bound principals, so write paths can drop their memoized state.
+_BOUND_PRINCIPALS: "weakref.WeakSet[Principal]" = weakref.WeakSet()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Layer 0 — Request-scoped principal
+# ─────────────────────────────────────────────────────────────────────────────
+class Principal:
+    """Who the current user is, loaded once per request.
+
+    Every helper in this module receives a ``user`` and used to reach into
+    ``user.profile`` / ``accessible_projects()`` on its own, so decorators,
+    nav, DRF permissions and context processors each repeated the same
+    queries. A Principal memoizes that state:
+
+      - ``profile`` / ``role``      — the Profile row (misses are remembered)
+      - ``employee``                — the linked Employee row (or None)
+      - ``accessible_project_ids``  — frozenset behind accessible_projects()
+      - per-project ClientProjectAccess rows and profit-share membership
+
+    Memoization only happens for principals BOUND to a user object by
+    :func:`bind_principal` (done by ``PrincipalMiddleware`` and the DRF
+    authentication class for each request's fresh ``request.user``). For a
+    plain user object the helpers get a transient Principal and keep the
+    old always-fresh semantics, so long-lived user objects (shell, tests,
+    Celery tasks) never see stale permissions.
+    """
+
+    def __init__(self, user, *, bound: bool = False):
+        self.user = user
+        self.bound = bound
+        self._profile_missing = False
+        self._memo: dict = {}
+
+    # Identity ───────────────────────────────────────────────────────────────
+    @property
+    def profile(self):
+        user = self.user
+        # __class__ (not type()) so a SimpleLazyObject request.user resolves
+        # to the real User model.
+        descriptor = getattr(user.__class__, "profile", None)
+        if descriptor is None:
+            return None
+        if self._profile_missing and not descriptor.is_cached(user):
+            return None
+        try:
+            return user.profile
+        except ObjectDoesNotExist:
+            self._profile_missing = True
+            return None
+
+    @property
+    def role(self) -> Optional[str]:
+        profile = self.profile
+        return getattr(profile, "role", None) if profile else None
+
+    @property
+    def has_full_access(self) -> bool:
+        """Same fast path accessible_projects() uses for "all projects"."""
+        user = self.user
+        if user.is_superuser or user.is_staff:
+            return True
+        return self.role in {ROLE_ADMIN, ROLE_OWNER, ROLE_DESIGNER, ROLE_SUPERINTENDENT}
+
+    # Memoized lookups (bound principals only) ───────────────────────────────
+    def invalidate(self) -> None:
+        """Forget memoized lookups (after a write that changes access)."""
+        self._memo.clear()
+
+    def memo(self, key, loader):
+        """Return ``loader()``, cached under ``key`` when the principal is bound."""
+        if not self.bound:
+            return loader()
+        if key not in self._memo:
+            self._memo[key] = loader()
+        return self._memo[key]
+
+    @property
+    def employee(self):
+        from core.models import Employee
+
+        return self.memo("employee", lambda: Employee.objects.filter(user=self.user).first())
+
+    @property
+    def accessible_project_ids(self) -> frozenset:
+        return self.memo(
+            "project_ids",
+            lambda: frozenset(_accessible_projects_qs(self.user).values_list("pk", flat=True)),
+        )
+
+
+def bind_principal(user) -> Optional[Principal]:
+    """Attach a memoizing Principal to ``user`` for the rest of the request."""
+    if not _authed(user):
+        return None
+    principal = getattr(user, PRINCIPAL_ATTR, None)
+    if principal is None:
+        principal = Principal(user, bound=True)
+        setattr(user, PRINCIPAL_ATTR, principal)
+        _BOUND_PRINCIPALS.add(principal)
+    return principal
+
+
+def invalidate_principals(user_id=None) -> None:
+    """Invalidate bound principals of ``user_id`` (all of them when None).
+
+    Called from the signal handlers that write project-access rows
+    (PM/resource assignments, time entries, ClientProjectAccess) so a view
+    that grants access and then checks it in the same request sees the write.
+    """
+    for principal in list(_BOUND_PRINCIPALS):
+        if user_id is None or principal.user.pk == user_id:
+            principal.invalidate()
+
+
+def get_principal(user) -> Principal:
+    """Return the request-bound Principal for ``user`` or a transient one."""
+    principal = getattr(user, PRINCIPAL_ATTR, None)
+    if principal is None:
+        principal = Principal(user)
+    return principal
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Layer 1 — Role identity
@@ -81,8 +207,7 @@ def get_role(user) -> Optional[str]:
     """
     if not _authed(user):
         return None
-    profile = getattr(user, "profile", None)
-    return getattr(profile, "role", None) if profile else None
+    return get_principal(user).role
 
 
 def is_admin(user) -> bool:
@@ -172,9 +297,12 @@ def is_profit_share_member(user) -> bool:
         return True
     from core.models import PartnerAccount
 
-    return PartnerAccount.objects.filter(
-        owner=user, is_business=False, is_active_socio=True
-    ).exists()
+    return get_principal(user).memo(
+        "profit_share_member",
+        lambda: PartnerAccount.objects.filter(
+            owner=user, is_business=False, is_active_socio=True
+        ).exists(),
+    )
 
 
 def is_internal(user) -> bool:
@@ -260,6 +388,20 @@ def accessible_projects(user) -> "QuerySet":
       - other internal roles (designer/superintendent/owner) → all projects
         (default; tighten when business rules clarify)
     """
+    from core.models import Project
+
+    if not _authed(user):
+        return Project.objects.none()
+
+    principal = get_principal(user)
+    if principal.bound and not principal.has_full_access:
+        # Resolved once per request; later calls reuse the id set.
+        return Project.objects.filter(pk__in=principal.accessible_project_ids)
+    return _accessible_projects_qs(user)
+
+
+def _accessible_projects_qs(user) -> "QuerySet":
+    """Uncached implementation of :func:`accessible_projects`."""
     # Lazy import to avoid circular imports at module load
     from core.models import Project
 
@@ -314,6 +456,15 @@ def can_view_project(user, project) -> bool:
     if role in {ROLE_OWNER, ROLE_DESIGNER, ROLE_SUPERINTENDENT}:
         return True
 
+    principal = get_principal(user)
+    if principal.bound and role in {ROLE_PM, ROLE_EMPLOYEE, ROLE_CLIENT}:
+        if project.pk in principal.accessible_project_ids:
+            return True
+        if role != ROLE_CLIENT:
+            return False
+        # Clients fall through: the legacy text match below compares
+        # stripped values, which the SQL iexact match can miss.
+
     if role == ROLE_PM:
         return project.pm_assignments.filter(pm=user).exists()
 
@@ -352,9 +503,12 @@ def get_client_access(user, project):
     if not is_client(user) or project is None:
         return None
     from core.models import ClientProjectAccess
-    return ClientProjectAccess.objects.filter(
-        user=user, project=project, is_active=True
-    ).first()
+    return get_principal(user).memo(
+        ("client_access", project.pk),
+        lambda: ClientProjectAccess.objects.filter(
+            user=user, project=project, is_active=True
+        ).first(),
+    )
 
 
 def _client_has_project_access(user, project) -> bool:
@@ -684,6 +838,8 @@ __all__ = [
     "ROLE_ADMIN", "ROLE_OWNER", "ROLE_PM", "ROLE_EMPLOYEE",
     "ROLE_CLIENT", "ROLE_DESIGNER", "ROLE_SUPERINTENDENT", "ROLE_PARTNER",
     "ALL_ROLES", "INTERNAL_ROLES", "ADMIN_LIKE_ROLES",
+    # Layer 0
+    "Principal", "bind_principal", "get_principal", "invalidate_principals",
     # Layer 1
     "get_role", "is_admin", "is_owner", "is_pm", "is_employee",
     "is_client", "is_designer", "is_superintendent",
@@ -0,0 +1,100 @@
+"""
+Annotated read-only serializer fields.
+
+Per-row counts used to be ``SerializerMethodField``s running one query per
+object (``obj.pins.filter(...).count()``), so list endpoints issued
+1 + N (or 1 + k·N) queries. An ``AnnotatedField`` declares the aggregate
+once, as a query expression:
+
+    class FloorPlanSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
+        pin_count = AnnotatedField(count_related(PlanPin, "plan", status="active"))
+
+and the viewset adds every declared aggregate to its queryset:
+
+    def get_queryset(self):
+        return FloorPlanSerializer.annotate_queryset(FloorPlan.objects.all())
+
+The field reads ``annotated_<field name>`` from the instance; objects that
+did not come from an annotated queryset (create/update responses, ad-hoc
+``Serializer(obj).data``) fall back to ``fallback(obj)``, or to a one-row
+query evaluating the same expression.
+
+The aggregates are correlated subqueries (``count_related``/``sum_related``)
+rather than JOIN + GROUP BY, so several of them on one queryset neither
+multiply rows nor interfere with ``values()``/``ordering`` elsewhere.
+"""
+
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+ANNOTATION_PREFIX = "annotated_"
+
+
+def count_related(model, fk, *filters, **lookups):
+    """Number of ``model`` rows whose ``fk`` points at the outer row."""
+    qs = (
+        model._default_manager.filter(*filters, **{fk: OuterRef("pk")}, **lookups)
+        .order_by()
+        .values(fk)
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(qs[:1], output_field=IntegerField()), Value(0))
+
+
+def sum_related(model, fk, field, *filters, output_field=None, **lookups):
+    """``SUM(field)`` over the ``model`` rows whose ``fk`` points at the outer row (0 when none)."""
+    output_field = output_field or DecimalField(max_digits=14, decimal_places=2)
+    qs = (
+        model._default_manager.filter(*filters, **{fk: OuterRef("pk")}, **lookups)
+        .order_by()
+        .values(fk)
+        .annotate(total=Sum(field))
+        .values("total")
+    )
+    return Coalesce(Subquery(qs[:1], output_field=output_field), Value(0), output_field=output_field)
+
+
+class AnnotatedField(serializers.ReadOnlyField):
+    """Read-only value computed by the database through a queryset annotation."""
+
+    def __init__(self, expression, fallback=None, coerce=None, **kwargs):
+        self.expression = expression
+        self.fallback = fallback
+        self.coerce = coerce
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        name = ANNOTATION_PREFIX + self.field_name
+        if name in instance.__dict__:
+            return instance.__dict__[name]
+        if self.fallback is not None:
+            return self.fallback(instance)
+        if instance.pk is None:
+            return None
+        return (
+            type(instance)
+            ._default_manager.filter(pk=instance.pk)
+            .annotate(**{name: self.expression})
+            .values_list(name, flat=True)
+            .first()
+        )
+
+    def to_representation(self, value):
+        if self.coerce is not None and value is not None:
+            return self.coerce(value)
+        return value
+
+
+class AnnotatedFieldsMixin:
+    """Serializer mixin exposing ``annotate_queryset`` for its ``AnnotatedField``s."""
+
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        annotations = {
+            ANNOTATION_PREFIX + name: field.expression
+            for name, field in cls._declared_fields.items()
+            if isinstance(field, AnnotatedField)
+        }
+        return queryset.annotate(**annotations) if annotations else queryset
@@ -0,0 +1,22 @@
+"""
+Authentication classes for the Kibray API
+"""
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.access import bind_principal
+
+
+class PrincipalJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that binds a request-scoped ``core.access.Principal``.
+
+    Session-authenticated requests get their principal from
+    ``PrincipalMiddleware``; JWT users are only resolved inside DRF, so the
+    binding happens here on the freshly loaded user instead.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        bind_principal(user)
+        return user
@@ -1,11 +1,15 @@
 from django.db import transaction
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.models import Employee, Task, FloorPlan
 from core.notifications import notify_task_created
+from core.services.change_stamps import touch
+from core.services.delta_sync import record_changes
 
 STATUS_CHOICES = {"Pending", "In Progress", "Under Review", "Completed", "Cancelled"}
 PRIORITY_CHOICES = {"low", "medium", "high", "urgent"}
@@ -249,3 +253,188 @@ class BulkTaskUpdateAPIView(APIView):
             },
             status=status.HTTP_200_OK,
         )
+
+
+class BulkWriteMixin:
+    """Batch create/update for a ModelViewSet (offline sync).
+
+    Adds ``<list url>bulk/``:
+
+        POST   [{...}, {...}]                 create (also {"items": [...]})
+        PATCH  [{"id": 7, ...}, ...]          partial update
+
+    Items are validated with the viewset's serializer (``many=True``); valid
+    ones are written with ONE ``bulk_create``/``bulk_update`` in ONE
+    transaction, invalid ones are reported and skipped. ``bulk_create`` and
+    ``bulk_update`` bypass ``save()`` and signals, so viewsets reproduce
+    them through hooks, once per batch:
+
+        bulk_prepare(items, created)     derived fields, write-only inputs (item.extra),
+                                         reject items (item.error)
+        bulk_after_write(items, created) side effects (notifications, caches)
+
+    Response: {"created"|"updated": n, "failed": n, "results": [
+        {"index": 0, "status": "created", "id": 12, "client_id": "..."},
+        {"index": 1, "status": "error", "errors": {...}}]}
+    A ``client_id`` sent with an item is echoed back so offline clients can
+    map their local records to server ids.
+    """
+
+    bulk_max_items = 500
+    bulk_operations = ("create", "update")
+    # Model fields set by bulk_prepare that bulk_update must also write
+    bulk_derived_fields = ()
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        created = request.method == "POST"
+        operation = "create" if created else "update"
+        if operation not in self.bulk_operations:
+            return Response(
+                {"error": f"Bulk {operation} is not supported here"},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        payload = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(payload, list) or not payload:
+            return Response({"error": "items must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(payload) > self.bulk_max_items:
+            return Response(
+                {"error": f"At most {self.bulk_max_items} items per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = self._bulk_validate_create(payload) if created else self._bulk_validate_update(payload)
+        valid = [item for item in items if item.error is None]
+        if valid:
+            with transaction.atomic():
+                self.bulk_prepare(valid, created)
+                valid = [item for item in valid if item.error is None]
+                if valid:
+                    self._bulk_write(valid, created)
+                    self.bulk_after_write(valid, created)
+
+        results = []
+        for item in items:
+            result = {"index": item.index}
+            if item.client_id is not None:
+                result["client_id"] = item.client_id
+            if item.error is None:
+                result.update(status="created" if created else "updated", id=item.instance.pk)
+            else:
+                result.update(status="error", errors=item.error)
+            results.append(result)
+        failed = sum(1 for item in items if item.error is not None)
+        return Response(
+            {"created" if created else "updated": len(items) - failed, "failed": failed, "results": results},
+            status=status.HTTP_200_OK,
+        )
+
+    # Hooks -----------------------------------------------------------------
+
+    def get_bulk_create_defaults(self):
+        """Extra attributes for every created instance (what perform_create would pass to save())."""
+        return {}
+
+    def bulk_prepare(self, items, created):
+        pass
+
+    def bulk_after_write(self, items, created):
+        pass
+
+    # Internals -------------------------------------------------------------
+
+    def _bulk_validate_create(self, payload):
+        child = self.get_serializer(data=payload, many=True).child
+        model = child.Meta.model
+        defaults = self.get_bulk_create_defaults()
+        items = []
+        for index, data in enumerate(payload):
+            item = BulkItem(index, data)
+            items.append(item)
+            try:
+                validated = child.run_validation(data)
+            except DRFValidationError as e:
+                item.error = e.detail
+                continue
+            item.m2m, item.extra = _split_non_column_values(model, validated)
+            item.instance = model(**validated, **defaults)
+        return items
+
+    def _bulk_validate_update(self, payload):
+        ids = [data.get("id") for data in payload if isinstance(data, dict)]
+        instances = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=[i for i in ids if i])}
+        items = []
+        for index, data in enumerate(payload):
+            item = BulkItem(index, data)
+            items.append(item)
+            instance = instances.get(data.get("id")) if isinstance(data, dict) else None
+            if instance is None:
+                item.error = {"id": ["Not found."]}
+                continue
+            serializer = self.get_serializer(instance, data=data, partial=True)
+            if not serializer.is_valid():
+                item.error = serializer.errors
+                continue
+            validated = dict(serializer.validated_data)
+            item.m2m, item.extra = _split_non_column_values(type(instance), validated)
+            for name, value in validated.items():
+                setattr(instance, name, value)
+            item.instance, item.fields = instance, set(validated)
+        return items
+
+    def _bulk_write(self, items, created):
+        instances = [item.instance for item in items]
+        model = type(instances[0])
+        if created:
+            model.objects.bulk_create(instances)
+        else:
+            fields = set(self.bulk_derived_fields).union(*(item.fields for item in items))
+            if fields:
+                model.objects.bulk_update(instances, sorted(fields))
+        _bulk_set_many_to_many(model, items)
+        # No post_save either: log synced models for delta sync (no-op otherwise)
+        # and bump the model's change stamp for conditional GETs
+        record_changes(instances)
+        touch(model._meta.label)
+
+
+class BulkItem:
+    """One element of a bulk request while it is validated and written."""
+
+    def __init__(self, index, data):
+        self.index = index
+        self.client_id = data.get("client_id") if isinstance(data, dict) else None
+        self.instance = None
+        self.m2m = {}
+        self.extra = {}  # validated values that are not model fields (write-only inputs)
+        self.fields = set()
+        self.error = None
+
+
+def _split_non_column_values(model, validated):
+    """Pop many-to-many values (set after the rows exist) and non-field inputs out of ``validated``."""
+    many_to_many = {f.name for f in model._meta.many_to_many}
+    columns = {f.name for f in model._meta.concrete_fields}
+    m2m = {name: validated.pop(name) for name in list(validated) if name in many_to_many}
+    extra = {name: validated.pop(name) for name in list(validated) if name not in columns}
+    return m2m, extra
+
+
+def _bulk_set_many_to_many(model, items):
+    """``.set()`` for every item's m2m values with one delete and one insert per field."""
+    by_field = {}
+    for item in items:
+        for name, values in item.m2m.items():
+            by_field.setdefault(name, []).append((item.instance, values))
+    for name, pairs in by_field.items():
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        through.objects.filter(**{f"{source}__in": [obj.pk for obj, _ in pairs]}).delete()
+        through.objects.bulk_create(
+            [
+                through(**{f"{source}_id": obj.pk, f"{target}_id": getattr(value, "pk", value)})
+                for obj, values in pairs
+                for value in values
+            ]
+        )
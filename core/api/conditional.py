@@ -0,0 +1,141 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-heavy API resources.
+
+Dashboards and mobile clients poll the same lists (projects, floor plans,
+pins, schedule phases, color samples, BI metrics) and used to re-download
+identical payloads each time. A viewset opts in with the mixin:
+
+    class FloorPlanViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+        conditional_models = ("core.PlanPin", "core.Project", ...)
+
+After authentication and permissions, and before the handler runs, the
+mixin computes a version for the response from:
+
+  * one aggregate over the filtered queryset (only the looked-up row for
+    ``retrieve``): row count, max pk and max ``updated_at`` when the model
+    has one;
+  * the change stamps of the queryset's model and of ``conditional_models``.
+    A stamp is the time a model's rows were last written. It is kept in the
+    cache (``core.services.change_stamps``), bumped by post_save/post_delete
+    receivers or by ``touch()`` where rows are written with ``update()``/bulk
+    methods. Most of these models have no ``updated_at``, and nested or
+    annotated data (pins on a plan, task counts on a project) changes when
+    other tables are written;
+  * the user, the path with its query string, the Accept header and today's
+    date (fields such as ``is_overdue`` depend on it).
+
+A matching ``If-None-Match`` (or ``If-Modified-Since``) answers
+``304 Not Modified`` before anything is serialized. Other responses carry
+``ETag``, ``Last-Modified`` and ``Cache-Control: private, no-cache``, so
+clients revalidate every time. A repeat read costs one small aggregate query
+and one cache ``get_many``. Viewsets without a queryset (BI) use the stamps
+alone; ``conditional_max_age`` covers payloads served from a result cache.
+
+Every model named in ``conditional_models`` (and every queryset model) must
+be listed in ``change_stamps.TRACKED_MODELS``, otherwise nothing bumps its
+stamp.
+"""
+
+import hashlib
+import time
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import exceptions, status
+from rest_framework.generics import GenericAPIView
+
+from core.services.change_stamps import stamps
+
+
+def _summarize(queryset):
+    model = queryset.model
+    aggregates = {"rows": Count("pk"), "top": Max("pk")}
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        aggregates["updated"] = Max("updated_at")
+    queryset = queryset.order_by()
+    if queryset.query.annotations or queryset.query.distinct:
+        # Aggregate over the matching ids, not over the annotated/distinct rows
+        queryset = model._default_manager.filter(pk__in=queryset.values("pk"))
+    return queryset.aggregate(**aggregates)
+
+
+class _NotModified(exceptions.APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """Answer unchanged GETs with ``304 Not Modified`` (see module docstring)."""
+
+    # Models, besides the queryset's own, whose writes change the payload
+    conditional_models = ()
+    conditional_actions = ("list", "retrieve")
+    # Seconds a payload may lag its sources (server-side result caches): the
+    # version then also rolls over that often, and Last-Modified is omitted
+    conditional_max_age = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.resource_version = None
+        if request.method in ("GET", "HEAD") and self.action in self.conditional_actions:
+            self.resource_version = self.get_resource_version()
+            etag, last_modified = self.resource_version
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise _NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        version = getattr(self, "resource_version", None)
+        if version and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = version
+            response.headers["ETag"] = etag
+            if last_modified is not None:
+                response.headers["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ("Accept", "Authorization", "Cookie"))
+        return response
+
+    def get_conditional_queryset(self):
+        """Rows the response is built from; None when it has no queryset."""
+        if not isinstance(self, GenericAPIView):
+            return None
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_resource_version(self):
+        """``(etag, last_modified)`` of the response about to be built."""
+        request = self.request
+        parts = [request.user.pk, request.get_full_path(), request.headers.get("Accept", ""), timezone.localdate()]
+        labels = list(self.conditional_models)
+        times = []
+        queryset = self.get_conditional_queryset()
+        if queryset is not None:
+            labels.append(queryset.model._meta.label)
+            summary = _summarize(queryset)
+            parts.append(sorted(summary.items()))
+            if summary.get("updated"):
+                times.append(summary["updated"].timestamp())
+        found = stamps(labels)
+        parts.append([found[label] for label in labels])
+        last_modified = None
+        if self.conditional_max_age:
+            parts.append(int(time.time() // self.conditional_max_age))
+        elif labels:
+            # HTTP dates have one-second resolution
+            last_modified = int(max(times + list(found.values())))
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        return quote_etag(digest), last_modified
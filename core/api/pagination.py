@@ -4,14 +4,27 @@ Custom pagination classes for the Kibray API
 iOS-optimized pagination with consistent response structure
 """
 
+import base64
+import binascii
 from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+from uuid import UUID
 
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
+    BasePagination,
     CursorPagination,
     LimitOffsetPagination,
     PageNumberPagination,
 )
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -103,7 +116,7 @@ class ChatMessageCursorPagination(CursorPagination):
     """
 
     page_size = 50
-    ordering = "-created_at"  # Newest messages first
+    ordering = ("-created_at", "-id")  # Newest messages first; id keeps ties stable
     cursor_query_param = "cursor"
     page_size_query_param = "page_size"
     max_page_size = 100
@@ -172,3 +185,199 @@ class NotificationCursorPagination(CursorPagination):
                 ]
             )
         )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on a composite, indexed sort key
+
+    Page-number and limit/offset pagination cost a COUNT(*) plus an OFFSET
+    scan per page, so deep pages get linearly slower. This paginator
+    remembers the sort key of the last row served and asks for the rows
+    after it, e.g. for ordering ("-created_at", "-id"):
+
+        WHERE created_at < :c OR (created_at = :c AND id < :id)
+        ORDER BY created_at DESC, id DESC LIMIT :page_size + 1
+
+    which an index on the same columns answers in constant time at any depth.
+    The last ordering field must be unique (usually "id") and none of them
+    nullable. Unlike ``CursorPagination`` no OFFSET is used to break ties.
+
+    The total is optional: ``?count=exact`` runs COUNT(*); otherwise PostgreSQL
+    returns the planner's row estimate and other databases return null.
+
+    Response (same keys as StandardResultsSetPagination where they apply):
+        {"count": 1234 | null, "count_is_estimate": bool, "next": url | null,
+         "previous": url | null, "page_size": 50, "has_more": bool, "results": [...]}
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.count, self.count_is_estimate = self.get_count(queryset, request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor["reverse"])
+        ordering = [_invert(f) for f in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(_after(ordering, cursor["values"]))
+        rows = list(queryset[: self.page_size + 1])
+        has_extra = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Forward: more rows after this page; backward: we came from a later page
+        self.has_next = (not reverse and has_extra) or (reverse and bool(rows))
+        self.has_previous = (reverse and has_extra) or (not reverse and cursor is not None and bool(rows))
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_count(self, queryset, request):
+        if request.query_params.get(self.count_query_param) == "exact":
+            return queryset.count(), False
+        return estimate_count(queryset), True
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            values = data["v"]
+            if len(values) != len(self.ordering):
+                raise ValueError("cursor does not match ordering")
+            values = [_to_python(model, f.lstrip("-"), v) for f, v in zip(self.ordering, values)]
+            return {"values": values, "reverse": bool(data.get("r"))}
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        # getattr also covers annotations used as keys (e.g. a search rank)
+        values = [_json_value(getattr(row, f.lstrip("-"))) for f in self.ordering]
+        payload = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.last, reverse=False) if self.has_next else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.first, reverse=True) if self.has_previous else None
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("count_is_estimate", self.count_is_estimate),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("page_size", self.page_size),
+                    ("has_more", self.has_next),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "nullable": True},
+                "count_is_estimate": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "page_size": {"type": "integer"},
+                "has_more": {"type": "boolean"},
+                "results": schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """
+    Opt a viewset into KeysetPagination without breaking existing clients
+
+    Requests carrying the cursor parameter (``?cursor=`` for the first page)
+    are paginated by ``keyset_pagination_class`` on ``keyset_ordering``;
+    all other requests keep using ``pagination_class``.
+    """
+
+    keyset_pagination_class = KeysetPagination
+    keyset_ordering = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.uses_keyset_pagination():
+            self._paginator = self.keyset_pagination_class(ordering=self.keyset_ordering)
+        return super().paginator
+
+    def uses_keyset_pagination(self):
+        request = getattr(self, "request", None)
+        return request is not None and self.keyset_pagination_class.cursor_query_param in request.query_params
+
+
+def estimate_count(queryset):
+    """Planner row estimate for ``queryset`` (PostgreSQL only, else None)."""
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    try:
+        plan = queryset.order_by().explain(format="json")
+        return int(json.loads(plan)[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+
+def _invert(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _after(ordering, values):
+    """Rows strictly after ``values`` in ``ordering`` (lexicographic)."""
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def _to_python(model, name, value):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return value
+    return field.to_python(value)
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
@@ -1,7 +1,12 @@
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.api.annotations import AnnotatedField, AnnotatedFieldsMixin, count_related, sum_related
 from core.models import (
     AuditLog,
     BudgetLine,
@@ -12,6 +17,7 @@ from core.models import (
     CostCode,
     DailyFocusSession,
     DailyLog,
+    DamagePhoto,
     DamageReport,
     Employee,  # ⭐ Added for Employee serializer
     Expense,
@@ -31,7 +37,9 @@ from core.models import (
     SchedulePhaseV2,
     ScheduleItemV2,
     Task,
+    TaskStatusChange,
     TaskTemplate,
+    TimeEntry,
     WeatherSnapshot,
 )
 
@@ -339,6 +347,9 @@ class SitePhotoSerializer(serializers.ModelSerializer):
             "uploader_name",
             "image",
             "thumbnail",
+            "medium",
+            "webp",
+            "processing_status",
             "location_lat",
             "location_lng",
             "location_accuracy_m",
@@ -352,64 +363,26 @@ class SitePhotoSerializer(serializers.ModelSerializer):
             "visibility",
             "created_at",
         ]
-        read_only_fields = ["created_by", "thumbnail", "created_at"]
+        read_only_fields = [
+            "created_by",
+            "thumbnail",
+            "medium",
+            "webp",
+            "processing_status",
+            "created_at",
+        ]
 
     def create(self, validated_data):
+        # EXIF GPS (when lat/lng are not provided) and renditions are filled
+        # in by the background image pipeline — see core/services/image_pipeline.py.
         req = self.context.get("request")
         user = getattr(req, "user", None)
         if user and not validated_data.get("created_by"):
             validated_data["created_by"] = user
-        # Attempt EXIF GPS extraction if not provided
-        try:
-            img = validated_data.get("image")
-            if img and (
-                not validated_data.get("location_lat") or not validated_data.get("location_lng")
-            ):
-                from PIL import Image
-                from PIL.ExifTags import GPSTAGS, TAGS
-
-                image = Image.open(img)
-                exif_data = image.getexif()
-                gps_info = None
-                for tag_id in exif_data:
-                    tag = TAGS.get(tag_id, tag_id)
-                    if tag == "GPSInfo":
-                        gps_info = exif_data.get(tag_id)
-                        break
-
-                def _dms_to_deg(dms, ref):
-                    try:
-                        deg = float(dms[0][0]) / float(dms[0][1])
-                        min_ = float(dms[1][0]) / float(dms[1][1])
-                        sec = float(dms[2][0]) / float(dms[2][1])
-                        val = deg + (min_ / 60.0) + (sec / 3600.0)
-                        if ref in ["S", "W"]:
-                            val = -val
-                        return round(val, 6)
-                    except Exception:
-                        return None
-
-                if gps_info:
-                    lat = None
-                    lon = None
-                    lat_dms = gps_info.get(GPSTAGS.get(2))
-                    lat_ref = gps_info.get(GPSTAGS.get(1))
-                    lon_dms = gps_info.get(GPSTAGS.get(4))
-                    lon_ref = gps_info.get(GPSTAGS.get(3))
-                    if lat_dms and lat_ref:
-                        lat = _dms_to_deg(lat_dms, lat_ref)
-                    if lon_dms and lon_ref:
-                        lon = _dms_to_deg(lon_dms, lon_ref)
-                    if lat is not None and validated_data.get("location_lat") is None:
-                        validated_data["location_lat"] = lat
-                    if lon is not None and validated_data.get("location_lng") is None:
-                        validated_data["location_lng"] = lon
-        except Exception:
-            pass
         return super().create(validated_data)
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     assigned_to_name = serializers.CharField(
         source="assigned_to.get_full_name", read_only=True, allow_null=True
     )
@@ -420,14 +393,22 @@ class TaskSerializer(serializers.ModelSerializer):
     # Make priority and due_date writable for API updates
     priority = serializers.ChoiceField(choices=["low", "medium", "high", "urgent"], required=False)
     due_date = serializers.DateField(required=False, allow_null=True)
-    total_hours = serializers.FloatField(read_only=True)
+    total_hours = AnnotatedField(
+        Cast("time_tracked_seconds", FloatField()) / 3600.0
+        + Cast(sum_related(TimeEntry, "task", "hours_worked"), FloatField()),
+        fallback=lambda task: task.total_hours,
+        coerce=lambda hours: round(float(hours), 2),
+    )
     time_tracked_hours = serializers.SerializerMethodField()
     # Read-only representation and a write-only input for dependencies
     dependencies_ids = serializers.SerializerMethodField(read_only=True)
     dependencies = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False, allow_empty=True
     )
-    reopen_events_count = serializers.IntegerField(read_only=True)
+    reopen_events_count = AnnotatedField(
+        count_related(TaskStatusChange, "task", ~Q(new_status="Completed"), old_status="Completed"),
+        fallback=lambda task: task.reopen_events_count,
+    )
 
     class Meta:
         model = Task
@@ -460,7 +441,8 @@ class TaskSerializer(serializers.ModelSerializer):
         return obj.get_time_tracked_hours()
 
     def get_dependencies_ids(self, obj):
-        return list(obj.dependencies.values_list("id", flat=True))
+        # .all() so a prefetch_related("dependencies") is used
+        return [dep.id for dep in obj.dependencies.all()]
 
     def create(self, validated_data):
         deps = validated_data.pop("dependencies", None)
@@ -590,7 +572,7 @@ class ChangeOrderSerializer(serializers.ModelSerializer):
         read_only_fields = ["date_created", "title"]
 
 
-class DamageReportSerializer(serializers.ModelSerializer):
+class DamageReportSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     reported_by_name = serializers.CharField(
         source="reported_by.get_full_name", read_only=True, allow_null=True
     )
@@ -604,7 +586,7 @@ class DamageReportSerializer(serializers.ModelSerializer):
     linked_touchup_id = serializers.IntegerField(
         source="linked_touchup.id", read_only=True, allow_null=True
     )
-    photo_count = serializers.SerializerMethodField()
+    photo_count = AnnotatedField(count_related(DamagePhoto, "report"))
     photos = DamagePhotoSerializer(many=True, read_only=True)
 
     class Meta:
@@ -647,9 +629,6 @@ class DamageReportSerializer(serializers.ModelSerializer):
             "linked_touchup_id",
         ]
 
-    def get_photo_count(self, obj):
-        return obj.photos.count()
-
 
 class ColorSampleSerializer(serializers.ModelSerializer):
     project_name = serializers.CharField(source="project.name", read_only=True)
@@ -781,17 +760,18 @@ class PlanPinSerializer(serializers.ModelSerializer):
         ]
 
 
-class FloorPlanSerializer(serializers.ModelSerializer):
+class FloorPlanSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     project_name = serializers.CharField(source="project.name", read_only=True)
     pins = PlanPinSerializer(many=True, read_only=True)
-    pin_count = serializers.SerializerMethodField()
+    # Active pins only
+    pin_count = AnnotatedField(count_related(PlanPin, "plan", status="active"))
     created_by_name = serializers.CharField(
         source="created_by.get_full_name", read_only=True, allow_null=True
     )
     replaced_by_id = serializers.IntegerField(
         source="replaced_by.id", read_only=True, allow_null=True
     )
-    pending_migration_count = serializers.SerializerMethodField()
+    pending_migration_count = AnnotatedField(count_related(PlanPin, "plan", status="pending_migration"))
 
     class Meta:
         model = FloorPlan
@@ -824,14 +804,6 @@ class FloorPlanSerializer(serializers.ModelSerializer):
         "created_by_name",
     ]
 
-    def get_pin_count(self, obj):
-        """Count active pins only"""
-        return obj.pins.filter(status="active").count()
-
-    def get_pending_migration_count(self, obj):
-        """Count pins pending migration"""
-        return obj.pins.filter(status="pending_migration").count()
-
 
 class ProjectListSerializer(serializers.ModelSerializer):
     class Meta:
@@ -901,13 +873,27 @@ class ScheduleItemSerializer(serializers.ModelSerializer):
 # =============================================================================
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     """Complete project serializer with financial summary"""
 
-    profit = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
-    budget_remaining = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
-    income_count = serializers.SerializerMethodField()
-    expense_count = serializers.SerializerMethodField()
+    # Same arithmetic as Project.profit() / Project.budget_remaining, in SQL
+    profit = AnnotatedField(
+        sum_related(Income, "project", "amount") - sum_related(Expense, "project", "amount"),
+        fallback=lambda project: project.profit(),
+        coerce=serializers.DecimalField(max_digits=10, decimal_places=2).to_representation,
+    )
+    budget_remaining = AnnotatedField(
+        Coalesce(
+            NullIf(sum_related(BudgetLine, "project", "baseline_amount"), Value(Decimal("0"))),
+            "budget_total",
+            Value(Decimal("0")),
+        )
+        - sum_related(Expense, "project", "amount"),
+        fallback=lambda project: project.budget_remaining,
+        coerce=serializers.DecimalField(max_digits=10, decimal_places=2).to_representation,
+    )
+    income_count = AnnotatedField(count_related(Income, "project"))
+    expense_count = AnnotatedField(count_related(Expense, "project"))
 
     class Meta:
         model = Project
@@ -947,12 +933,6 @@ class ProjectSerializer(serializers.ModelSerializer):
             "budget_remaining",
         ]
 
-    def get_income_count(self, obj):
-        return obj.incomes.count()
-
-    def get_expense_count(self, obj):
-        return obj.expenses.count()
-
 
 class IncomeSerializer(serializers.ModelSerializer):
     """Income serializer with project details"""
@@ -1045,26 +1025,17 @@ class ExpenseSerializer(serializers.ModelSerializer):
         return value
 
 
-class CostCodeSerializer(serializers.ModelSerializer):
+class CostCodeSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     """Cost code serializer"""
 
-    expense_count = serializers.SerializerMethodField()
-    total_expenses = serializers.SerializerMethodField()
+    expense_count = AnnotatedField(count_related(Expense, "cost_code"))
+    total_expenses = AnnotatedField(sum_related(Expense, "cost_code", "amount"))
 
     class Meta:
         model = CostCode
         fields = ["id", "code", "name", "category", "active", "expense_count", "total_expenses"]
         read_only_fields = ["expense_count", "total_expenses"]
 
-    def get_expense_count(self, obj):
-        return obj.expenses.count()
-
-    def get_total_expenses(self, obj):
-        from django.db.models import Sum
-
-        total = obj.expenses.aggregate(total=Sum("amount"))["total"]
-        return total or 0
-
 
 # -------------------------------
 # Invoices (Module 6) - API
@@ -1253,14 +1224,14 @@ class ClientRequestAttachmentSerializer(serializers.ModelSerializer):
         read_only_fields = ["uploaded_by", "size_bytes", "uploaded_at"]
 
 
-class ChatChannelSerializer(serializers.ModelSerializer):
+class ChatChannelSerializer(AnnotatedFieldsMixin, serializers.ModelSerializer):
     """Chat channel with participant info"""
 
     project_name = serializers.CharField(source="project.name", read_only=True)
     created_by_name = serializers.CharField(
         source="created_by.get_full_name", read_only=True, allow_null=True
     )
-    participant_count = serializers.SerializerMethodField()
+    participant_count = AnnotatedField(count_related(ChatChannel.participants.through, "chatchannel"))
     participant_usernames = serializers.SerializerMethodField()
 
     class Meta:
@@ -1283,11 +1254,9 @@ class ChatChannelSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_by", "created_at"]
 
-    def get_participant_count(self, obj):
-        return obj.participants.count()
-
     def get_participant_usernames(self, obj):
-        return list(obj.participants.values_list("username", flat=True))
+        # .all() so the viewset's prefetch_related("participants") is used
+        return [user.username for user in obj.participants.all()]
 
 
 class ChatMentionSerializer(serializers.ModelSerializer):
@@ -0,0 +1,105 @@
+"""
+Delta sync for offline-first clients.
+
+    GET /api/v1/sync/?cursor=<cursor>&collections=tasks,notifications&limit=500
+
+Returns what changed since ``cursor`` (see ``core.services.delta_sync``):
+
+    {"reset": false, "cursor": "...", "has_more": false,
+     "changes": {"tasks": {"upserts": [...], "deletes": [12, 13]}}}
+
+``reset: true`` means the cursor is missing or too old: reload the lists,
+then keep the returned cursor. While ``has_more`` is true, call again with
+the new cursor straight away.
+"""
+
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.models import DailyPlan, Project, TouchUp
+from core.services import delta_sync
+
+from .serializer_classes.task_serializers import TaskListSerializer
+from .serializers import NotificationSerializer
+
+
+class ProjectSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = ["id", "name", "project_code", "address", "client", "start_date", "end_date", "created_at"]
+
+
+class DailyPlanSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyPlan
+        fields = [
+            "id",
+            "project",
+            "plan_date",
+            "status",
+            "completion_deadline",
+            "admin_approved",
+            "estimated_hours_total",
+            "actual_hours_worked",
+            "updated_at",
+        ]
+
+
+class TouchUpSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TouchUp
+        fields = [
+            "id",
+            "project",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assigned_to",
+            "floor_plan",
+            "pin_x",
+            "pin_y",
+            "due_date",
+            "created_at",
+            "closed_at",
+        ]
+
+
+SERIALIZERS = {
+    "projects": ProjectSyncSerializer,
+    "tasks": TaskListSerializer,
+    "daily_plans": DailyPlanSyncSerializer,
+    "touchups": TouchUpSyncSerializer,
+    "notifications": NotificationSerializer,
+}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def delta_sync_view(request):
+    """Changes to the user's synced collections since ``cursor``."""
+    collections = None
+    if request.query_params.get("collections"):
+        collections = [c.strip() for c in request.query_params["collections"].split(",") if c.strip()]
+        unknown = sorted(set(collections) - set(SERIALIZERS))
+        if unknown:
+            return Response(
+                {"error": f"Unknown collections: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+    try:
+        limit = int(request.query_params.get("limit") or delta_sync.DEFAULT_LIMIT)
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    result = delta_sync.changes_since(request.user, request.query_params.get("cursor"), collections, limit)
+    context = {"request": request}
+    result["changes"] = {
+        collection: {
+            "upserts": SERIALIZERS[collection](bucket["upserts"], many=True, context=context).data,
+            "deletes": bucket["deletes"],
+        }
+        for collection, bucket in result["changes"].items()
+    }
+    return Response(result)
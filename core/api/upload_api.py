@@ -0,0 +1,142 @@
+"""
+Resumable chat attachment uploads over HTTP.
+
+Same protocol as the WebSocket ``file_upload`` actions (see
+``core.services.resumable_upload``), for clients on flaky connections or
+behind proxies that drop WebSockets:
+
+    POST   /api/v1/uploads/                      start  {filename, file_type, file_size, channel_id}
+    GET    /api/v1/uploads/<session_id>/         status (offset to resume from)
+    PUT    /api/v1/uploads/<session_id>/chunk/   raw bytes, ``Upload-Offset`` header
+    POST   /api/v1/uploads/<session_id>/complete/
+    DELETE /api/v1/uploads/<session_id>/         cancel
+"""
+
+import logging
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.access import can_view_project
+from core.models import ChatChannel
+from core.services import resumable_upload
+from core.websocket_file_handler import file_handler
+
+logger = logging.getLogger(__name__)
+
+
+def _channel_for(user, channel_id):
+    channel = ChatChannel.objects.select_related("project").filter(pk=channel_id).first()
+    if channel is None or not can_view_project(user, channel.project):
+        return None
+    return channel
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def start_upload(request):
+    """Open a resumable upload session for a chat attachment."""
+    data = request.data
+    channel_id = data.get("channel_id")
+    if _channel_for(request.user, channel_id) is None:
+        return Response({"error": "Channel not found"}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        file_size = int(data.get("file_size") or 0)
+    except (TypeError, ValueError):
+        return Response({"error": "file_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    metadata = {
+        "filename": data.get("filename"),
+        "file_type": data.get("file_type"),
+        "file_size": file_size,
+        "channel_id": channel_id,
+    }
+    is_valid, error = file_handler.validate_file_metadata(
+        metadata["filename"], metadata["file_type"], file_size
+    )
+    if not is_valid:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        state = resumable_upload.start_session(
+            request.user.id,
+            metadata["filename"],
+            metadata["file_type"],
+            file_size,
+            session_id=data.get("session_id"),
+            channel_id=channel_id,
+        )
+    except resumable_upload.UploadError as e:
+        return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+
+    return Response(
+        {
+            "session_id": state["session_id"],
+            "offset": 0,
+            "max_chunk_size": resumable_upload.MAX_CHUNK_SIZE,
+        },
+        status=status.HTTP_201_CREATED,
+    )
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAuthenticated])
+def upload_session(request, session_id):
+    """Resume point of an upload (GET) or cancel it (DELETE)."""
+    if request.method == "DELETE":
+        if not file_handler.cancel_upload(session_id, request.user.id):
+            return Response({"error": "Invalid session"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    progress = file_handler.get_session_progress(session_id, request.user.id)
+    if progress is None:
+        return Response({"error": "Invalid session"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(progress)
+
+
+@api_view(["PUT"])
+@permission_classes([IsAuthenticated])
+def upload_chunk(request, session_id):
+    """Append the raw request body at ``Upload-Offset``."""
+    offset = request.headers.get("Upload-Offset")
+    if offset is None or not offset.isdigit():
+        return Response({"error": "Upload-Offset header required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if length > resumable_upload.MAX_CHUNK_SIZE:
+        return Response({"error": "Chunk too large"}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    try:
+        state = resumable_upload.append_chunk(
+            session_id, int(offset), request.read(resumable_upload.MAX_CHUNK_SIZE + 1), user_id=request.user.id
+        )
+    except resumable_upload.UploadError as e:
+        if str(e) == "Invalid session":
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {"error": str(e), "offset": e.expected_offset}, status=status.HTTP_409_CONFLICT
+        )
+    return Response({"offset": state["offset"], "progress": resumable_upload.progress(state)})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def complete_upload(request, session_id):
+    """Assemble the parts into the final file and create the ``FileAttachment``."""
+    state = resumable_upload.get_session(session_id, request.user.id)
+    if state is None:
+        return Response({"error": "Invalid session"}, status=status.HTTP_404_NOT_FOUND)
+    channel_id = state["meta"].get("channel_id")
+    if _channel_for(request.user, channel_id) is None:
+        return Response({"error": "Channel not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    attachment_id, file_url, thumbnail_url = file_handler.complete_upload(session_id, request.user, channel_id)
+    if not attachment_id:
+        return Response({"error": file_url}, status=status.HTTP_409_CONFLICT)
+    return Response(
+        {"attachment_id": attachment_id, "file_url": file_url, "thumbnail_url": thumbnail_url},
+        status=status.HTTP_201_CREATED,
+    )
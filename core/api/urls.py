@@ -25,7 +25,7 @@ from core.views_health import (
     readiness_check,
 )
 
-from . import schedule_api, sop_api
+from . import schedule_api, sop_api, sync_api, upload_api
 from .bulk_views import BulkTaskUpdateAPIView, BulkTaskAssignAPIView, TaskDetailAPIView
 from .dashboard_extra import ClientDashboardView, ProjectDashboardView
 from .focus_api import DailyFocusSessionViewSet, FocusTaskViewSet
@@ -310,6 +310,13 @@ urlpatterns = [
         PMPerformanceDashboardView.as_view(),
         name="analytics-pm-performance",
     ),
+    # Resumable chat attachment uploads
+    path("uploads/", upload_api.start_upload, name="upload-start"),
+    path("uploads/<str:session_id>/", upload_api.upload_session, name="upload-session"),
+    path("uploads/<str:session_id>/chunk/", upload_api.upload_chunk, name="upload-chunk"),
+    path("uploads/<str:session_id>/complete/", upload_api.complete_upload, name="upload-complete"),
+    # Delta sync for offline clients
+    path("sync/", sync_api.delta_sync_view, name="delta-sync"),
     # SOP Express API
     path("sop/generate/", sop_api.generate_sop_with_ai, name="sop-generate-ai"),
     path("sop/save/", sop_api.save_sop, name="sop-save"),
@@ -5,6 +5,7 @@ from decimal import Decimal, InvalidOperation
 import json
 import re
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import DecimalField, F, Q, Sum
 from django.db.models.functions import Coalesce
@@ -76,7 +77,9 @@ from core.models import (
 )
 
 from .filters import ExpenseFilter, IncomeFilter, InvoiceFilter, ProjectFilter
-from .pagination import StandardResultsSetPagination
+from .bulk_views import BulkWriteMixin
+from .conditional import ConditionalGetMixin
+from .pagination import KeysetPagination, KeysetPaginationMixin, StandardResultsSetPagination
 from .serializers import (
     AuditLogSerializer,
     BudgetLineSerializer,
@@ -137,9 +140,10 @@ user_model = get_user_model()
 
 
 # Notifications
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -148,7 +152,13 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["post"])
     def mark_all_read(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        from core.services import delta_sync
+
+        unread = Notification.objects.filter(user=request.user, is_read=False)
+        ids = list(unread.values_list("id", flat=True))
+        Notification.objects.filter(id__in=ids).update(is_read=True)
+        # update() sends no post_save: log the rows for delta sync ourselves
+        delta_sync.record_changes(Notification(pk=pk, user_id=request.user.pk) for pk in ids)
         return Response({"status": "ok"})
 
     @action(detail=True, methods=["post"])
@@ -354,7 +364,7 @@ class PermissionMatrixViewSet(viewsets.ModelViewSet):
         )
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(KeysetPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """
     Q16.2: Comprehensive audit trail (read-only)
     - Admins can view all logs
@@ -366,6 +376,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ["user", "action", "entity_type", "entity_id", "success"]
     search_fields = ["username", "entity_repr", "ip_address"]
+    keyset_ordering = ("-timestamp", "-id")
 
     def get_permissions(self):
         # Allow any authenticated user to query their own activity/history
@@ -503,7 +514,11 @@ class ChatChannelViewSetReadOnly(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        qs = ChatChannel.objects.filter(participants=self.request.user).order_by("-created_at")
+        qs = ChatChannelSerializer.annotate_queryset(
+            ChatChannel.objects.filter(participants=self.request.user)
+            .select_related("project", "created_by")
+            .prefetch_related("participants")
+        ).order_by("-created_at")
         user = self.request.user
         # Role-based filtering per channel_type
         # Detect role via groups (consistent con setup_roles.py)
@@ -593,7 +608,9 @@ class TaskViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        qs = Task.objects.select_related("project", "assigned_to").order_by("-created_at")
+        qs = TaskSerializer.annotate_queryset(
+            Task.objects.select_related("project", "assigned_to").prefetch_related("dependencies")
+        ).order_by("-created_at")
         touchup_only = self.request.query_params.get("touchup")
         if touchup_only == "true":
             qs = qs.filter(is_touchup=True)
@@ -1077,7 +1094,7 @@ class DamageReportViewSet(viewsets.ModelViewSet):
     pagination_class = None
 
     def get_queryset(self):
-        return (
+        return DamageReportSerializer.annotate_queryset(
             DamageReport.objects.select_related(
                 "project",
                 "reported_by",
@@ -1647,7 +1664,7 @@ class TwoFactorTokenObtainPairView(TokenObtainPairView):
 
 
 # Floor Plans & Pins
-class FloorPlanViewSet(viewsets.ModelViewSet):
+class FloorPlanViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     MÓDULO 20: Floor Plans with versioning and pin migration.
 
@@ -1682,11 +1699,12 @@ class FloorPlanViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "level_identifier"]
     ordering_fields = ["created_at", "level", "version"]
     pagination_class = None  # Disabled for floor plans (usually small dataset)
+    conditional_models = ("core.PlanPin", "core.ColorSample", "core.Task", "core.Project", "auth.User")
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return FloorPlan.objects.none()
-        qs = (
+        qs = FloorPlanSerializer.annotate_queryset(
             FloorPlan.objects.prefetch_related(
                 "pins__color_sample", "pins__linked_task", "pins__created_by"
             )
@@ -1724,6 +1742,8 @@ class FloorPlanViewSet(viewsets.ModelViewSet):
         - Old plan marked as is_current=False
         - All pins marked as pending_migration
         """
+        from core.services import change_stamps
+
         old_plan = self.get_object()
         new_image = request.FILES.get("image")
         if not new_image:
@@ -1749,6 +1769,7 @@ class FloorPlanViewSet(viewsets.ModelViewSet):
 
         # Mark all active pins on old plan as pending migration
         PlanPin.objects.filter(plan=old_plan, status="active").update(status="pending_migration")
+        change_stamps.touch("core.PlanPin")
 
         return Response(
             FloorPlanSerializer(new_plan, context={"request": request}).data, status=201
@@ -2007,7 +2028,7 @@ def tasks_gantt_alias(request):
         )
 
 
-class PlanPinViewSet(viewsets.ModelViewSet):
+class PlanPinViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     MÓDULO 20: Plan Pins with annotations and client commenting.
 
@@ -2041,6 +2062,7 @@ class PlanPinViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "description"]
     ordering_fields = ["created_at"]
     pagination_class = None  # Usually small dataset per plan
+    conditional_models = ("core.FloorPlan", "core.ColorSample", "core.Task", "auth.User")
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -2142,7 +2164,7 @@ class PlanPinViewSet(viewsets.ModelViewSet):
 
 
 # Color Samples
-class ColorSampleViewSet(viewsets.ModelViewSet):
+class ColorSampleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     MÓDULO 19: Color Samples with KPISM numbering and approval workflow.
 
@@ -2178,6 +2200,7 @@ class ColorSampleViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "code", "room_location", "notes"]
     ordering_fields = ["created_at", "sample_number", "status"]
     pagination_class = StandardResultsSetPagination
+    conditional_models = ("core.Project", "auth.User")
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -2349,9 +2372,11 @@ class ColorSampleViewSet(viewsets.ModelViewSet):
 
 
 # Schedule Phases (V2)
-class SchedulePhaseViewSet(viewsets.ModelViewSet):
+class SchedulePhaseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = SchedulePhaseV2Serializer
     permission_classes = [IsAuthenticated]
+    # Phases nest their items, and items their tasks
+    conditional_models = ("core.ScheduleItemV2", "core.ScheduleTaskV2", "auth.User")
 
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update"):
@@ -2743,7 +2768,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Anonymous users return an empty queryset.
         """
         from core.access import accessible_projects
-        return accessible_projects(self.request.user).order_by("-created_at")
+        qs = accessible_projects(self.request.user).order_by("-created_at")
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "annotate_queryset"):
+            qs = serializer_class.annotate_queryset(qs)
+        return qs
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -3008,7 +3037,7 @@ class CostCodeViewSet(viewsets.ModelViewSet):
     ordering_fields = ["code", "name", "category"]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = CostCodeSerializer.annotate_queryset(super().get_queryset())
         active_only = self.request.query_params.get("active")
         if active_only == "true":
             queryset = queryset.filter(active=True)
@@ -3777,7 +3806,7 @@ class DailyPlanViewSet(viewsets.ModelViewSet):
         )
 
 
-class PlannedActivityViewSet(viewsets.ModelViewSet):
+class PlannedActivityViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     # CRUD for PlannedActivity with material checks
 
     queryset = (
@@ -3792,6 +3821,34 @@ class PlannedActivityViewSet(viewsets.ModelViewSet):
     search_fields = ["title", "description"]
     ordering_fields = ["order", "created_at", "updated_at"]
     ordering = ["order"]
+    # daily_plan is read-only in the serializer, so activities are created
+    # through their plan; crews sync status/progress/hours in bulk.
+    bulk_operations = ("update",)
+    bulk_derived_fields = ("updated_at",)
+
+    def bulk_prepare(self, items, created):
+        from django.utils import timezone
+
+        from core.models import Employee
+
+        requested = {pk for item in items for pk in item.extra.get("assigned_employee_ids") or ()}
+        existing = set(Employee.objects.filter(id__in=requested).values_list("id", flat=True))
+        now = timezone.now()
+        for item in items:
+            item.instance.updated_at = now
+            if "assigned_employee_ids" in item.extra:
+                item.m2m["assigned_employees"] = [
+                    pk for pk in item.extra["assigned_employee_ids"] if pk in existing
+                ]
+
+    def bulk_after_write(self, items, created):
+        # Once per batch instead of the per-row post_save / m2m_changed receivers
+        from core.services.crew_allocation import invalidate_allocation_index
+
+        plan_ids = {item.instance.daily_plan_id for item in items}
+        invalidate_allocation_index(
+            *DailyPlan.objects.filter(pk__in=plan_ids).values_list("plan_date", flat=True)
+        )
 
     @action(detail=True, methods=["post"])
     def check_materials(self, request, pk=None):
@@ -4006,7 +4063,7 @@ class AISuggestionViewSet(viewsets.ModelViewSet):
 # ============================================================================
 
 
-class TimeEntryViewSet(viewsets.ModelViewSet):
+class TimeEntryViewSet(BulkWriteMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     queryset = TimeEntry.objects.all().select_related("employee", "project", "task")
     serializer_class = TimeEntrySerializer
     permission_classes = [IsAuthenticated]
@@ -4021,6 +4078,19 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ["date", "start_time", "end_time", "hours_worked"]
     ordering = ["-date", "-start_time"]
+    keyset_ordering = ("-date", "-id")
+    bulk_derived_fields = ("hours_worked",)
+
+    def bulk_prepare(self, items, created):
+        # What TimeEntry.save() does: hours_worked and the rate snapshots
+        for item in items:
+            item.instance.compute_derived_fields()
+
+    def bulk_after_write(self, items, created):
+        # Once per batch instead of the per-row post_save receiver
+        from core.access import invalidate_principals
+
+        invalidate_principals()
 
     def get_queryset(self):
         """SECURITY (Phase 9): scope time entries by project access.
@@ -4410,7 +4480,7 @@ class ProjectInventoryViewSet(viewsets.ModelViewSet):
         return Response({"low_stock": data, "count": len(data)})
 
 
-class InventoryMovementViewSet(viewsets.ModelViewSet):
+class InventoryMovementViewSet(BulkWriteMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     # ViewSet for inventory movements (receive, consume, transfer).
 
     serializer_class = InventoryMovementSerializer
@@ -4418,6 +4488,21 @@ class InventoryMovementViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["item", "movement_type", "from_location", "to_location"]
     ordering_fields = ["created_at"]
+    keyset_ordering = ("-created_at", "-id")
+    # Applied movements are immutable stock history: bulk create only
+    bulk_operations = ("create",)
+
+    def get_bulk_create_defaults(self):
+        return {"created_by": self.request.user}
+
+    def bulk_prepare(self, items, created):
+        # Stock is updated for the whole batch at once; movements that would
+        # leave negative inventory are rejected and not stored.
+        from core.services.inventory_movements import apply_movements
+
+        errors = apply_movements([item.instance for item in items])
+        for position, error in errors.items():
+            items[position].error = {"detail": error}
 
     def get_queryset(self):
         return InventoryMovement.objects.select_related(
@@ -4830,7 +4915,7 @@ class ChatChannelViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = self.Serializer.annotate_queryset(super().get_queryset())
         user = self.request.user
 
         # Staff can see all channels
@@ -4888,7 +4973,7 @@ class ChatChannelViewSet(viewsets.ModelViewSet):
             return Response({"error": gettext("User not found")}, status=404)
 
 
-class ChatMessageViewSet(viewsets.ModelViewSet):
+class ChatMessageViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     # Chat Messages API - messages with @mentions, entity linking, and attachments
     # Features:
     # - Automatic @mention parsing (e.g., @username, @task#123)
@@ -4922,6 +5007,7 @@ class ChatMessageViewSet(viewsets.ModelViewSet):
     search_fields = ["message"]
     ordering_fields = ["created_at"]
     ordering = ["-created_at"]  # Default ordering for cursor pagination
+    keyset_ordering = ("-created_at", "-id")
 
     def _check_pm_trainee_write_permission(self, message=None, channel=None):
         # Helper: deny PM Trainee write access on general_client channel
@@ -5105,11 +5191,12 @@ class DailyLogSanitizedViewSet(viewsets.ReadOnlyModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class SitePhotoViewSet(viewsets.ModelViewSet):
+class SitePhotoViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     # MÓDULO 18: Site Photos with GPS auto-tagging, thumbnail generation, and gallery system.
     # Features:
-    # - GPS extraction from EXIF data (handled in serializer)
-    # - Auto-generate thumbnails on save (handled in model)
+    # - GPS extraction from EXIF data and thumbnail/medium/WebP renditions,
+    #   built in the background (core.tasks.process_site_photo_image);
+    #   uploads return immediately with processing_status="pending"
     # - Filter by project, damage_report, photo_type, date_range
     # - Gallery action for organized photo viewing
     # - ClientProjectAccess enforcement for non-staff users
@@ -5142,6 +5229,8 @@ class SitePhotoViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "photo_type"]
     # Conditional pagination: small datasets return a list; large datasets paginate
     pagination_class = StandardResultsSetPagination
+    # Uploads stay one file per request; captions/rooms/types are synced in bulk
+    bulk_operations = ("update",)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -6408,11 +6497,26 @@ class ClientInvoiceApprovalAPIView(APIView):
 # ============================================================================
 
 
-class BIAnalyticsViewSet(viewsets.ViewSet):
+class BIAnalyticsViewSet(ConditionalGetMixin, viewsets.ViewSet):
     # API endpoints for Business Intelligence metrics and analytics.
     # Provides JSON access to financial KPIs, cash flow projections,
     # project margins, and inventory risk data for SPA/dashboard consumption.
     permission_classes = [IsAuthenticated, IsStaffOrAdmin]
+    # No queryset: versioned by the change stamps of what the metrics read
+    conditional_actions = ("company_kpis", "cash_flow_projection", "project_margins", "inventory_risk", "top_performers")
+    conditional_models = (
+        "core.ChangeOrder",
+        "core.Expense",
+        "core.Income",
+        "core.InventoryItem",
+        "core.Invoice",
+        "core.PayrollRecord",
+        "core.Project",
+        "core.ProjectInventory",
+        "core.TimeEntry",
+    )
+    # FinancialAnalyticsService caches its results for BI_CACHE_TTL
+    conditional_max_age = getattr(settings, "BI_CACHE_TTL", 300)
 
     @action(detail=False, methods=["get"], url_path="kpis")
     def company_kpis(self, request):
@@ -6851,6 +6955,7 @@ class ChatMessageSearchView(APIView):
         # - user: Filter by user ID (optional)
         # - limit: Results per page (default 20, max 100)
         # - offset: Pagination offset (default 0)
+        # - cursor: Keyset pagination instead of limit/offset (``cursor=`` for the first page)
         from django.contrib.postgres.search import SearchQuery, SearchRank
 
         from core.api.serializers import ChatMessageSerializer
@@ -6888,6 +6993,12 @@ class ChatMessageSearchView(APIView):
             .order_by("-rank", "-created_at")
         )
 
+        if "cursor" in request.GET:
+            # Seek past the last (rank, created_at, id) served; no OFFSET scan
+            paginator = KeysetPagination(ordering=("-rank", "-created_at", "-id"))
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            return paginator.get_paginated_response(ChatMessageSerializer(page, many=True).data)
+
         # Pagination
         limit = min(int(request.GET.get("limit", 20)), 100)
         offset = int(request.GET.get("offset", 0))
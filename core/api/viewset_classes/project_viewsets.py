@@ -11,6 +11,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.api.conditional import ConditionalGetMixin
 from core.api.filter_classes import ProjectFilter
 from core.api.permission_classes import IsProjectMember
 from core.api.serializer_classes import (
@@ -23,7 +24,7 @@ from core.api.serializer_classes import (
 from core.models import Project
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for projects with full CRUD operations
     """
@@ -36,6 +37,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
     search_fields = ["name", "address", "description", "client"]
     ordering_fields = ["name", "start_date", "end_date", "created_at"]
     ordering = ["name"]
+    # List/detail show task progress and counts, change orders and contacts
+    conditional_models = (
+        "core.ChangeOrder",
+        "core.ChangeOrderPhoto",
+        "core.ClientContact",
+        "core.ClientOrganization",
+        "core.Task",
+        "core.TaskImage",
+    )
 
     def get_queryset(self):
         """SECURITY (Phase 9): delegate scoping to core.access.
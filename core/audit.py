@@ -122,7 +122,10 @@ def log_user_logout(sender, request, user, **kwargs):
     if user:
         # Clear the active session key so no stale key remains
         try:
+            from kibray_backend.sessions import clear_active_session_key
+
             Profile.objects.filter(user=user).update(active_session_key="")
+            clear_active_session_key(user.pk)
         except Exception:
             pass
 
@@ -20,6 +20,8 @@ from django.core.cache import cache
 from django.utils import translation
 from django.utils.translation import gettext as _
 
+from core.websocket_wire import WireFormatMixin
+
 logger = logging.getLogger(__name__)
 
 
@@ -577,7 +579,7 @@ class NotificationConsumer(RateLimitMixin, AsyncWebsocketConsumer):
         Notification.objects.filter(id=notification_id, user=self.user).update(is_read=True)
 
 
-class DashboardConsumer(AsyncWebsocketConsumer):
+class DashboardConsumer(WireFormatMixin, AsyncWebsocketConsumer):
     """
     Real-time dashboard updates for project metrics.
 
@@ -607,7 +609,7 @@ class DashboardConsumer(AsyncWebsocketConsumer):
 
         # Send initial dashboard data
         dashboard_data = await self.get_dashboard_data()
-        await self.send(text_data=json.dumps({"type": "dashboard_data", **dashboard_data}))
+        await self.send_event({"type": "dashboard_data", **dashboard_data})
 
     async def disconnect(self, close_code):
         """Disconnect from dashboard channel"""
@@ -615,36 +617,25 @@ class DashboardConsumer(AsyncWebsocketConsumer):
 
     async def dashboard_update(self, event):
         """Send dashboard update to WebSocket"""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "dashboard_update",
-                    "metric": event["metric"],
-                    "value": event["value"],
-                    "timestamp": event["timestamp"],
-                }
-            )
+        await self.send_event(
+            {
+                "type": "dashboard_update",
+                "metric": event["metric"],
+                "value": event["value"],
+                "timestamp": event["timestamp"],
+            }
         )
 
+    async def dashboard_snapshot(self, event):
+        """Send the snapshot computed once for all viewers (core.services.dashboard_publisher)"""
+        await self.send_event({"type": "dashboard_data", **event["snapshot"]})
+
     @database_sync_to_async
     def get_dashboard_data(self):
-        """Get current dashboard metrics"""
-        from core.models import Project
+        """Get current dashboard metrics (cached snapshot shared by all viewers)"""
+        from core.services.dashboard_publisher import current_snapshot
 
-        try:
-            project = Project.objects.get(id=self.project_id)
-            ev_data = project.earned_value_summary()
-
-            return {
-                "project_name": project.name,
-                "earned_value": ev_data,
-                "budget_total": float(project.budget_total),
-                "total_expenses": float(project.total_expenses),
-                "budget_remaining": float(project.budget_remaining),
-                "profit": float(project.profit()),
-            }
-        except Project.DoesNotExist:
-            return {}
+        return current_snapshot(self.project_id)
 
 
 class AdminDashboardConsumer(AsyncWebsocketConsumer):
@@ -758,7 +749,7 @@ class QualityInspectionConsumer(AsyncWebsocketConsumer):
         )
 
 
-class TaskConsumer(RateLimitMixin, AsyncWebsocketConsumer):
+class TaskConsumer(WireFormatMixin, RateLimitMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer for real-time task updates.
     Handles task creation, updates, deletion, and status changes.
@@ -793,15 +784,13 @@ class TaskConsumer(RateLimitMixin, AsyncWebsocketConsumer):
         await self.accept()
 
         # Send connection confirmation
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "connection_established",
-                    "message": _("Connected to task updates"),
-                    "project_id": self.project_id,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+        await self.send_event(
+            {
+                "type": "connection_established",
+                "message": _("Connected to task updates"),
+                "project_id": self.project_id,
+                "timestamp": datetime.now().isoformat(),
+            }
         )
 
     async def disconnect(self, close_code):
@@ -821,71 +810,59 @@ class TaskConsumer(RateLimitMixin, AsyncWebsocketConsumer):
             if action == "subscribe_task":
                 task_id = data.get("task_id")
                 # Handle task subscription logic
-                await self.send(
-                    text_data=json.dumps(
-                        {
-                            "type": "task_subscribed",
-                            "task_id": task_id,
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    )
+                await self.send_event(
+                    {
+                        "type": "task_subscribed",
+                        "task_id": task_id,
+                        "timestamp": datetime.now().isoformat(),
+                    }
                 )
         except json.JSONDecodeError:
-            await self.send(
-                text_data=json.dumps({"type": "error", "message": "Invalid JSON format"})
-            )
+            await self.send_event({"type": "error", "message": "Invalid JSON format"})
 
     async def task_created(self, event):
         """Send task created notification"""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "task_created",
-                    "task_id": event.get("task_id"),
-                    "task_data": event.get("task_data"),
-                    "timestamp": event.get("timestamp"),
-                }
-            )
+        await self.send_event(
+            {
+                "type": "task_created",
+                "task_id": event.get("task_id"),
+                "task_data": event.get("task_data"),
+                "timestamp": event.get("timestamp"),
+            }
         )
 
     async def task_updated(self, event):
         """Send task updated notification"""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "task_updated",
-                    "task_id": event.get("task_id"),
-                    "task_data": event.get("task_data"),
-                    "changes": event.get("changes"),
-                    "timestamp": event.get("timestamp"),
-                }
-            )
+        await self.send_event(
+            {
+                "type": "task_updated",
+                "task_id": event.get("task_id"),
+                "task_data": event.get("task_data"),
+                "changes": event.get("changes"),
+                "timestamp": event.get("timestamp"),
+            }
         )
 
     async def task_deleted(self, event):
         """Send task deleted notification"""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "task_deleted",
-                    "task_id": event.get("task_id"),
-                    "timestamp": event.get("timestamp"),
-                }
-            )
+        await self.send_event(
+            {
+                "type": "task_deleted",
+                "task_id": event.get("task_id"),
+                "timestamp": event.get("timestamp"),
+            }
         )
 
     async def task_status_changed(self, event):
         """Send task status change notification"""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "task_status_changed",
-                    "task_id": event.get("task_id"),
-                    "old_status": event.get("old_status"),
-                    "new_status": event.get("new_status"),
-                    "timestamp": event.get("timestamp"),
-                }
-            )
+        await self.send_event(
+            {
+                "type": "task_status_changed",
+                "task_id": event.get("task_id"),
+                "old_status": event.get("old_status"),
+                "new_status": event.get("new_status"),
+                "timestamp": event.get("timestamp"),
+            }
         )
 
 
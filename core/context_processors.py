@@ -64,9 +64,10 @@ def notification_badges(request):
             TimeEntry,
         )
 
+        from core.access import get_role
+
         user = request.user
-        profile = getattr(user, "profile", None)
-        role = getattr(profile, "role", None)
+        role = get_role(user)
 
         # Unread notifications (with security filter for clients)
         notification_qs = Notification.objects.filter(user=user, is_read=False)
@@ -119,9 +120,8 @@ def recent_projects(request):
 
     try:
         from core.models import Project
-        from core.access import ROLE_CLIENT, ROLE_EMPLOYEE, get_role  # Phase 9 Commit F
+        from core.access import ROLE_CLIENT, ROLE_EMPLOYEE, get_principal, get_role  # Phase 9 Commit F
 
-        profile = getattr(request.user, "profile", None)
         role = get_role(request.user)
 
         # If user is a client, only show their projects
@@ -135,7 +135,7 @@ def recent_projects(request):
         elif role == ROLE_EMPLOYEE and not request.user.is_staff:
             # Employees only see projects they are assigned to
             from core.models import ResourceAssignment
-            employee = getattr(request.user, "employee_profile", None)
+            employee = get_principal(request.user).employee
             if employee:
                 assigned_project_ids = (
                     ResourceAssignment.objects.filter(employee=employee)
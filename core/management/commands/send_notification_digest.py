@@ -2,11 +2,11 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMultiAlternatives
 from django.core.management.base import BaseCommand
-from django.template.loader import render_to_string
 from django.utils import timezone
 
+from core.services.email_delivery import build_digest_email, deliver
+
 User = get_user_model()
 
 
@@ -38,37 +38,26 @@ class Command(BaseCommand):
         for n in qs:
             by_user.setdefault(n.user_id, {"user": n.user, "items": []})["items"].append(n)
 
-        total_sent = 0
+        recipients, messages = [], []
         for uid, bundle in by_user.items():
             user = bundle["user"]
             items = bundle["items"]
             if not getattr(user, "email", None):
                 continue
 
-            context = {
-                "user": user,
-                "items": items[:25],  # cap list in email
-                "count": len(items),
-                "since": since,
-                "now": now,
-                "app_name": getattr(settings, "APP_NAME", "Kibray"),
-                "site_url": getattr(settings, "SITE_URL", ""),
-            }
-            context["remaining"] = max(0, context["count"] - len(context["items"]))
-            subject = f"[{context['app_name']}] Resumen de notificaciones ({context['count']})"
-            text_body = render_to_string("core/emails/notification_digest.txt", context)
-            html_body = render_to_string("core/emails/notification_digest.html", context)
-
             if dry_run:
-                self.stdout.write(self.style.NOTICE(f"[DRY] Would send {context['count']} to {user.email}"))
+                self.stdout.write(self.style.NOTICE(f"[DRY] Would send {len(items)} to {user.email}"))
                 continue
 
-            msg = EmailMultiAlternatives(subject, text_body, to=[user.email])
-            msg.attach_alternative(html_body, "text/html")
-            try:
-                msg.send()
+            recipients.append(user.email)
+            messages.append(build_digest_email(user, items, since, now))
+
+        # One SMTP connection for the whole run
+        total_sent = 0
+        for email, ok in zip(recipients, deliver(messages)):
+            if ok:
                 total_sent += 1
-            except Exception as ex:
-                self.stdout.write(self.style.ERROR(f"Failed to send to {user.email}: {ex}"))
+            else:
+                self.stdout.write(self.style.ERROR(f"Failed to send to {email}"))
 
         self.stdout.write(self.style.SUCCESS(f"Digest run complete. Emails sent: {total_sent}"))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.13 on 2026-10-19 04:30
+
+from django.db import migrations, models
+
+PROCESSING_CHOICES = [
+    ("pending", "Pending"),
+    ("processing", "Processing"),
+    ("ready", "Ready"),
+    ("failed", "Failed"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0190_ledgerentry_payment_method_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sitephoto",
+            name="medium",
+            field=models.ImageField(
+                blank=True,
+                help_text="Auto-generated medium rendition (JPEG)",
+                null=True,
+                upload_to="site_photos/medium/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="sitephoto",
+            name="webp",
+            field=models.ImageField(
+                blank=True,
+                help_text="Auto-generated medium rendition (WebP)",
+                null=True,
+                upload_to="site_photos/webp/",
+            ),
+        ),
+        # Existing photos were processed synchronously on upload: mark them
+        # "ready", then switch the default for new uploads to "pending".
+        migrations.AddField(
+            model_name="sitephoto",
+            name="processing_status",
+            field=models.CharField(
+                choices=PROCESSING_CHOICES,
+                default="ready",
+                help_text="Background image processing state (renditions + EXIF)",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="sitephoto",
+            name="processing_status",
+            field=models.CharField(
+                choices=PROCESSING_CHOICES,
+                default="pending",
+                help_text="Background image processing state (renditions + EXIF)",
+                max_length=20,
+            ),
+        ),
+    ]
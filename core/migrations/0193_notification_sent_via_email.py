@@ -0,0 +1,32 @@
+# Generated by Django 5.2.13 on 2026-10-19 04:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0192_push_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Existing notifications were already seen in-app: add the column as
+        # "sent" so the first hourly run does not email them, then switch the
+        # default for new rows.
+        migrations.AddField(
+            model_name='notification',
+            name='sent_via_email',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='sent_via_email',
+            field=models.BooleanField(default=False, help_text='Delivered by the hourly email task (send_pending_notifications)'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['sent_via_email', 'created_at'], name='core_notifi_sent_vi_6a7b4c_idx'),
+        ),
+    ]
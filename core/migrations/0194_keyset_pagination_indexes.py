@@ -0,0 +1,27 @@
+# Generated by Django 5.2.13 on 2026-10-19 05:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0193_notification_sent_via_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventorymovement',
+            index=models.Index(fields=['-created_at', '-id'], name='core_invent_created_f09938_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='core_notifi_user_id_ea1d2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['-date', '-id'], name='core_timeen_date_523ef5_idx'),
+        ),
+    ]
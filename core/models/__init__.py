@@ -685,6 +685,21 @@ class TimeEntry(models.Model):
         return Decimal("0.00")
 
     def save(self, *args, **kwargs):
+        self.compute_derived_fields()
+        super().save(*args, **kwargs)
+
+        # Handle invoice_line reverse FK assignment (if passed via __init__)
+        if hasattr(self, "_invoice_line_to_set") and self._invoice_line_to_set:
+            self._invoice_line_to_set.time_entry = self
+            self._invoice_line_to_set.save()
+            delattr(self, "_invoice_line_to_set")
+
+    def compute_derived_fields(self):
+        """Fill hours_worked and, for new entries, the rate snapshots.
+
+        Called by save(); bulk writers (bulk_create/bulk_update skip save())
+        call it themselves.
+        """
         # Calculate hours_worked from start/end times
         if self.start_time and self.end_time:
             s = self.start_time.hour * 60 + self.start_time.minute
@@ -729,19 +744,13 @@ class TimeEntry(models.Model):
             if self.billable_rate_snapshot is None:
                 self.billable_rate_snapshot = Decimal("0.00")
 
-        super().save(*args, **kwargs)
-
-        # Handle invoice_line reverse FK assignment (if passed via __init__)
-        if hasattr(self, "_invoice_line_to_set") and self._invoice_line_to_set:
-            self._invoice_line_to_set.time_entry = self
-            self._invoice_line_to_set.save()
-            delattr(self, "_invoice_line_to_set")
-
     def __str__(self):
         return f"{self.employee.first_name} | {self.date} | {self.project.name if self.project else 'No Project'}"
 
     class Meta:
         ordering = ["-date"]
+        # Keyset pagination key (KeysetPagination on ("-date", "-id"))
+        indexes = [models.Index(fields=["-date", "-id"])]
 
 
 # ---------------------
@@ -4932,6 +4941,34 @@ class SitePhoto(models.Model):
         blank=True,
         help_text="Auto-generated thumbnail",
     )
+    # Renditions built by core.services.image_pipeline in the background
+    medium = models.ImageField(
+        upload_to="site_photos/medium/",
+        null=True,
+        blank=True,
+        help_text="Auto-generated medium rendition (JPEG)",
+    )
+    webp = models.ImageField(
+        upload_to="site_photos/webp/",
+        null=True,
+        blank=True,
+        help_text="Auto-generated medium rendition (WebP)",
+    )
+    PROCESSING_PENDING = "pending"
+    PROCESSING_PROCESSING = "processing"
+    PROCESSING_READY = "ready"
+    PROCESSING_FAILED = "failed"
+    processing_status = models.CharField(
+        max_length=20,
+        choices=[
+            (PROCESSING_PENDING, "Pending"),
+            (PROCESSING_PROCESSING, "Processing"),
+            (PROCESSING_READY, "Ready"),
+            (PROCESSING_FAILED, "Failed"),
+        ],
+        default=PROCESSING_PENDING,
+        help_text="Background image processing state (renditions + EXIF)",
+    )
     # Link to floor plan pin for location reference
     plan_pin = models.ForeignKey(
         "PlanPin",
@@ -4954,53 +4991,37 @@ class SitePhoto(models.Model):
         return f"{self.project} · {self.room or 'Cuarto'} · {self.wall_ref or 'Pared'}"
 
     def save(self, *args, **kwargs):
-        """Q18.2: Auto-populate GPS from project location"""
-        if not self.location_lat and self.project:
-            # Try to get coordinates from project (assuming project has address field)
-            # This would integrate with a geocoding service in production
-            pass
-
-        # Q18.12: Generate thumbnail
-        if self.image and not self.thumbnail:
-            try:
-                from io import BytesIO
-                import os
-
-                from django.core.files.base import ContentFile
-                from PIL import Image
+        """Q18.2 / Q18.12: queue the image pipeline for new uploads.
 
-                # Open original image
-                img = Image.open(self.image)
+        Decoding, renditions (thumbnail/medium/WebP) and EXIF GPS extraction
+        run in ``core.tasks.process_site_photo_image`` after commit, so the
+        upload request returns as soon as the original is stored.
+        """
+        needs_processing = bool(self.image) and not self.thumbnail
+        if needs_processing:
+            self.processing_status = self.PROCESSING_PENDING
 
-                # Convert to RGB if necessary (for PNG with transparency)
-                if img.mode in ("RGBA", "LA", "P"):
-                    background = Image.new("RGB", img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1] if img.mode == "RGBA" else None)
-                    img = background
+        super().save(*args, **kwargs)
 
-                # Create thumbnail (max 300x300, preserve aspect ratio)
-                img.thumbnail((300, 300), Image.Resampling.LANCZOS)
+        if needs_processing:
+            from django.db import transaction
 
-                # Save to BytesIO
-                thumb_io = BytesIO()
-                img.save(thumb_io, format="JPEG", quality=85)
-                thumb_io.seek(0)
+            photo_id = self.pk
 
-                # Generate filename
-                original_name = os.path.basename(self.image.name)
-                name_without_ext = os.path.splitext(original_name)[0]
-                thumb_filename = f"{name_without_ext}_thumb.jpg"
+            def _enqueue_processing():
+                # Wrapped: never let a broker outage 500 the upload.
+                try:
+                    from core.tasks import process_site_photo_image
 
-                # Save thumbnail field
-                self.thumbnail.save(thumb_filename, ContentFile(thumb_io.read()), save=False)
-            except Exception as e:
-                # Log error but don't fail save
-                import logging
+                    process_site_photo_image.delay(photo_id)
+                except Exception as exc:
+                    import logging
 
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to generate thumbnail for SitePhoto: {e}")
+                    logging.getLogger(__name__).warning(
+                        "SitePhoto %s image processing enqueue failed (broker?): %s", photo_id, exc
+                    )
 
-        super().save(*args, **kwargs)
+            transaction.on_commit(_enqueue_processing)
 
     @property
     def approved_color(self):
@@ -5374,6 +5395,9 @@ class FloorPlan(models.Model):
 
         # Mark all active pins as pending migration
         self.pins.filter(status="active").update(status="pending_migration")
+        from core.services.change_stamps import touch
+
+        touch("core.PlanPin")
 
         # Create new version
         new_version = FloorPlan.objects.create(
@@ -6116,10 +6140,18 @@ class Notification(models.Model):
         max_length=255, blank=True, help_text="URL para redirigir al hacer clic"
     )
     is_read = models.BooleanField(default=False)
+    sent_via_email = models.BooleanField(
+        default=False, help_text="Delivered by the hourly email task (send_pending_notifications)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["sent_via_email", "created_at"]),
+            # Per-user feed, keyset-paginated on ("-created_at", "-id")
+            models.Index(fields=["user", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"[{self.notification_type}] {self.title} → {self.user.username}"
@@ -6833,6 +6865,7 @@ class InventoryMovement(models.Model):
             models.Index(fields=["to_location", "-created_at"]),
             models.Index(fields=["related_project", "-created_at"]),
             models.Index(fields=["movement_type", "-created_at"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def apply(self):
@@ -6917,23 +6950,23 @@ class InventoryMovement(models.Model):
         threshold = self.item.get_effective_threshold()
 
         if threshold and stock.quantity < threshold:
-            # Notify admins
-            from django.contrib.auth.models import User
+            # Notify admins (once per stock row per day, not on every movement)
+            from datetime import timedelta
 
-            from core.models import Notification
+            from django.contrib.auth.models import User
 
-            admins = User.objects.filter(is_staff=True, is_active=True)
+            from core.notifications import notify_users
 
-            for admin in admins:
-                Notification.objects.create(
-                    user=admin,
-                    notification_type="task_created",
-                    title=f"Low stock: {self.item.name}",
-                    message=f"Inventory of {self.item.name} at {stock.location} is below threshold ({stock.quantity} < {threshold})",
-                    related_object_type="inventory",
-                    related_object_id=stock.id,
-                    link_url="/inventory/",
-                )
+            notify_users(
+                User.objects.filter(is_staff=True, is_active=True),
+                notification_type="task_created",
+                title=f"Low stock: {self.item.name}",
+                message=f"Inventory of {self.item.name} at {stock.location} is below threshold ({stock.quantity} < {threshold})",
+                related_object_type="inventory",
+                related_object_id=stock.id,
+                link_url="/inventory/",
+                dedupe_window=timedelta(hours=24),
+            )
 
     def __str__(self):
         return f"{self.movement_type} {self.item} {self.quantity}"
@@ -7353,6 +7386,14 @@ class DailyPlan(models.Model):
 
         return timezone.now() > self.completion_deadline and self.status == "DRAFT"
 
+    def weather_coordinates(self):
+        """Coordinates used for this plan's weather lookup."""
+        # Geocoding requires external API (Google Maps, Mapbox)
+        # DEFERRED: When a geocoding service is configured, resolve project.address here
+        from core.services.weather_ingestion import DEFAULT_PLAN_COORDINATES
+
+        return DEFAULT_PLAN_COORDINATES
+
     def fetch_weather(self):
         """
         Q12.8: Obtener clima automáticamente basado en la ubicación del proyecto.
@@ -7361,10 +7402,7 @@ class DailyPlan(models.Model):
         if not self.project.address:
             return None
 
-        # Get project coordinates — geocoding requires external API (Google Maps, Mapbox)
-        # DEFERRED: When a geocoding service is configured, resolve project.address here
-        latitude = 40.7128  # Default NYC coordinates
-        longitude = -74.0060
+        latitude, longitude = self.weather_coordinates()
 
         try:
             from django.utils import timezone
@@ -10506,7 +10544,10 @@ from .daily_plan_ai import AIAnalysisLog, AISuggestion, TimelineView, VoiceComma
 from .focus_workflow import DailyFocusSession, FocusTask
 
 # PWA Push Notifications
-from .push_notifications import PushSubscription
+from .push_notifications import PushOutbox, PushSubscription
+
+# Delta sync change log
+from .sync import SyncChange
 
 # Profit-share module (socios) — Phase 2 (Jun 2026)
 from .profit_share import (
@@ -10537,7 +10578,9 @@ from .strategic_planning import (
 )
 
 __all__ = [
+    "PushOutbox",
     "PushSubscription",
+    "SyncChange",
     # Profit-share module (socios)
     "RateConfig",
     "PartnerAccount",
@@ -5,6 +5,7 @@ Stores push notification subscriptions for Progressive Web App
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -47,3 +48,57 @@ class PushSubscription(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.endpoint[:50]}..."
+
+
+class PushOutbox(models.Model):
+    """
+    Push notification waiting to be delivered by the outbox dispatcher.
+
+    Request and signal code only inserts rows here; the ``dispatch_push_outbox``
+    Celery task aggregates them per recipient and sends them through the
+    provider batch APIs (see ``core.services.push_outbox``).
+    """
+
+    CHANNEL_ONESIGNAL = "onesignal"
+    CHANNEL_FCM = "fcm"
+    CHANNEL_CHOICES = [
+        (CHANNEL_ONESIGNAL, "OneSignal"),
+        (CHANNEL_FCM, "Firebase Cloud Messaging"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_SENT, _("Sent")),
+        (STATUS_FAILED, _("Failed")),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="push_outbox",
+        verbose_name=_("User"),
+    )
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES, default=CHANNEL_ONESIGNAL)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=500, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Push Outbox Entry")
+        verbose_name_plural = _("Push Outbox")
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+        app_label = "core"
+
+    def __str__(self):
+        return f"{self.channel} push to {self.user_id}: {self.title[:40]} ({self.status})"
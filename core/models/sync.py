@@ -0,0 +1,38 @@
+"""
+Delta sync change log
+Feeds GET /api/v1/sync/ (see core.services.delta_sync)
+"""
+
+from django.db import models
+from django.utils import timezone
+
+
+class SyncChange(models.Model):
+    """
+    One create/update/delete of a synced row, in commit order.
+
+    Written by signals in the same transaction as the change itself, so the
+    log never mentions a row that was rolled back. The auto-increment ``id``
+    is the sync cursor. ``project_id``/``user_id`` are plain integers (not
+    foreign keys) so tombstones outlive the rows they describe; they scope
+    who may see the change.
+    """
+
+    collection = models.CharField(max_length=40)
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField(null=True, blank=True)
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["project_id", "id"]),
+            models.Index(fields=["user_id", "id"]),
+        ]
+        app_label = "core"
+
+    def __str__(self):
+        action = "deleted" if self.deleted else "changed"
+        return f"#{self.id} {self.collection}:{self.object_id} {action}"
@@ -1,128 +1,230 @@
 """
 Helper functions for creating notifications.
 Call these from views or signals when events occur.
+
+Every helper goes through ``notify_users``: the audience is resolved with one
+query, rows are inserted with one ``bulk_create`` and the WebSocket pushes are
+sent after commit in a single sync→async hop, so an event costs a constant
+number of queries whatever the audience size. ``dedupe_window`` drops alerts
+a recipient already got (same type, title and object) within the window.
 """
 
+import asyncio
+from datetime import timedelta
+import logging
+
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.urls import reverse
+from django.utils import timezone
 
 from core.models import Notification
+from core.services.delta_sync import record_changes
+
+logger = logging.getLogger(__name__)
+
+
+def project_managers():
+    return User.objects.filter(profile__role="project_manager", is_active=True)
+
+
+def project_clients(project):
+    """Users with client/owner access to ``project``."""
+    from core.models import ClientProjectAccess
+
+    return ClientProjectAccess.objects.filter(project=project, role__in=["client", "owner"]).values_list(
+        "user_id", flat=True
+    )
+
+
+def _audience_ids(audience) -> list[int]:
+    if isinstance(audience, QuerySet):
+        if audience.model is User:
+            audience = audience.values_list("id", flat=True)
+        return list(dict.fromkeys(audience))
+    return list(dict.fromkeys(getattr(u, "pk", u) for u in audience if u is not None))
+
+
+def notify_users(
+    audience,
+    *,
+    notification_type,
+    title,
+    message="",
+    link_url="",
+    related_object_type="",
+    related_object_id=None,
+    project=None,
+    exclude=(),
+    dedupe_window=None,
+):
+    """
+    Create the same notification for every user in ``audience``.
+
+    ``audience`` is a User queryset, a ``values_list`` of user ids, or an
+    iterable of users/ids. Returns the created notifications.
+    """
+    excluded = {getattr(u, "pk", u) for u in exclude if u is not None}
+    user_ids = [uid for uid in _audience_ids(audience) if uid not in excluded]
+    if not user_ids:
+        return []
+
+    if dedupe_window is not None:
+        if not isinstance(dedupe_window, timedelta):
+            dedupe_window = timedelta(seconds=dedupe_window)
+        already = set(
+            Notification.objects.filter(
+                user_id__in=user_ids,
+                notification_type=notification_type,
+                title=title,
+                related_object_type=related_object_type,
+                related_object_id=related_object_id,
+                created_at__gte=timezone.now() - dedupe_window,
+            ).values_list("user_id", flat=True)
+        )
+        user_ids = [uid for uid in user_ids if uid not in already]
+        if not user_ids:
+            return []
+
+    created = Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=uid,
+                project=project,
+                notification_type=notification_type,
+                title=title,
+                message=message,
+                link_url=link_url,
+                related_object_type=related_object_type,
+                related_object_id=related_object_id,
+            )
+            for uid in user_ids
+        ]
+    )
+    # bulk_create sends no post_save: log the rows for delta sync ourselves
+    record_changes(created)
+    transaction.on_commit(lambda: push_notifications(created))
+    return created
+
+
+def push_notifications(notifications):
+    """Send ``notification`` events to each recipient's ``notifications_<id>`` group."""
+    if not notifications:
+        return
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+
+        async def _send_all():
+            await asyncio.gather(
+                *(
+                    channel_layer.group_send(
+                        f"notifications_{n.user_id}",
+                        {
+                            "type": "notification",
+                            "notification_id": n.id,
+                            "title": n.title,
+                            "message": n.message,
+                            "notification_type": n.notification_type,
+                            "url": n.link_url,
+                            "timestamp": (n.created_at or timezone.now()).isoformat(),
+                        },
+                    )
+                    for n in notifications
+                )
+            )
+
+        async_to_sync(_send_all)()
+    except Exception as e:
+        logger.warning(f"WebSocket push for {len(notifications)} notifications failed: {e}")
 
 
 def notify_task_created(task, creator):
     """Notify PMs when a client creates a touch-up task."""
-    pms = User.objects.filter(profile__role="project_manager", is_active=True)
-    link = reverse("client_project_view", args=[task.project.id])
-    for pm in pms:
-        Notification.objects.create(
-            user=pm,
-            notification_type="task_created",
-            title=f"New task: {task.title}",
-            message=f"{creator.username} created a task in {task.project.name}",
-            related_object_type="task",
-            related_object_id=task.id,
-            link_url=link,
-        )
+    return notify_users(
+        project_managers(),
+        notification_type="task_created",
+        title=f"New task: {task.title}",
+        message=f"{creator.username} created a task in {task.project.name}",
+        related_object_type="task",
+        related_object_id=task.id,
+        link_url=reverse("client_project_view", args=[task.project.id]),
+    )
 
 
 def notify_task_assigned(task, assigned_to):
     """Notify employee when assigned to a task."""
     if not assigned_to or not assigned_to.user:
         return
-    link = reverse("client_project_view", args=[task.project.id])
-    Notification.objects.create(
-        user=assigned_to.user,
+    return notify_users(
+        [assigned_to.user],
         notification_type="task_assigned",
         title=f"Task assigned: {task.title}",
         message=f'You have been assigned to "{task.title}" in {task.project.name}',
         related_object_type="task",
         related_object_id=task.id,
-        link_url=link,
+        link_url=reverse("client_project_view", args=[task.project.id]),
     )
 
 
 def notify_task_completed(task, completer):
     """Notify client/owner/PM when task is completed."""
-    from core.models import ClientProjectAccess
-
-    link = reverse("client_project_view", args=[task.project.id])
     # Notify clients and owners
-    client_users = ClientProjectAccess.objects.filter(
-        project=task.project, role__in=["client", "owner"]
-    ).values_list("user", flat=True)
-    for uid in client_users:
-        try:
-            u = User.objects.get(id=uid)
-            Notification.objects.create(
-                user=u,
-                notification_type="task_completed",
-                title=f"Task completed: {task.title}",
-                message=f'{completer.username} completed "{task.title}"',
-                related_object_type="task",
-                related_object_id=task.id,
-                link_url=link,
-            )
-        except User.DoesNotExist:
-            pass
+    return notify_users(
+        project_clients(task.project),
+        notification_type="task_completed",
+        title=f"Task completed: {task.title}",
+        message=f'{completer.username} completed "{task.title}"',
+        related_object_type="task",
+        related_object_id=task.id,
+        link_url=reverse("client_project_view", args=[task.project.id]),
+    )
 
 
 def notify_color_review(color_sample, reviewer):
     """Notify PM/client when color sample status changes."""
-    link = reverse("color_sample_detail", args=[color_sample.id])
     # Notify PMs
-    pms = User.objects.filter(profile__role="project_manager", is_active=True)
-    for pm in pms:
-        Notification.objects.create(
-            user=pm,
-            notification_type="color_review",
-            title=f"Color under review: {color_sample.name or color_sample.code}",
-            message=f"{reviewer.username} changed status to {color_sample.get_status_display()}",
-            related_object_type="color_sample",
-            related_object_id=color_sample.id,
-            link_url=link,
-        )
+    return notify_users(
+        project_managers(),
+        notification_type="color_review",
+        title=f"Color under review: {color_sample.name or color_sample.code}",
+        message=f"{reviewer.username} changed status to {color_sample.get_status_display()}",
+        related_object_type="color_sample",
+        related_object_id=color_sample.id,
+        link_url=reverse("color_sample_detail", args=[color_sample.id]),
+    )
 
 
 def notify_color_approved(color_sample, approver):
     """Notify stakeholders when color is approved."""
-    from core.models import ClientProjectAccess
-
-    link = reverse("color_sample_detail", args=[color_sample.id])
     # Notify clients and owners
-    client_users = ClientProjectAccess.objects.filter(
-        project=color_sample.project, role__in=["client", "owner"]
-    ).values_list("user", flat=True)
-    for uid in client_users:
-        try:
-            u = User.objects.get(id=uid)
-            Notification.objects.create(
-                user=u,
-                notification_type="color_approved",
-                title=f"Color approved: {color_sample.name or color_sample.code}",
-                message=f"{approver.username} approved the color for {color_sample.project.name}",
-                related_object_type="color_sample",
-                related_object_id=color_sample.id,
-                link_url=link,
-            )
-        except User.DoesNotExist:
-            pass
+    return notify_users(
+        project_clients(color_sample.project),
+        notification_type="color_approved",
+        title=f"Color approved: {color_sample.name or color_sample.code}",
+        message=f"{approver.username} approved the color for {color_sample.project.name}",
+        related_object_type="color_sample",
+        related_object_id=color_sample.id,
+        link_url=reverse("color_sample_detail", args=[color_sample.id]),
+    )
 
 
 def notify_damage_reported(damage_report, reporter):
     """Notify PM when damage is reported."""
-    link = reverse("damage_report_detail", args=[damage_report.id])
-    pms = User.objects.filter(profile__role="project_manager", is_active=True)
-    staff = User.objects.filter(is_staff=True, is_active=True)
-    for u in set(list(pms) | set(staff)):
-        Notification.objects.create(
-            user=u,
-            notification_type="damage_reported",
-            title=f"Damage reported: {damage_report.title}",
-            message=f"{reporter.username} reported a damage ({damage_report.get_severity_display()}) in {damage_report.project.name}",
-            related_object_type="damage_report",
-            related_object_id=damage_report.id,
-            link_url=link,
-        )
+    return notify_users(
+        User.objects.filter(Q(profile__role="project_manager") | Q(is_staff=True), is_active=True),
+        notification_type="damage_reported",
+        title=f"Damage reported: {damage_report.title}",
+        message=f"{reporter.username} reported a damage ({damage_report.get_severity_display()}) in {damage_report.project.name}",
+        related_object_type="damage_report",
+        related_object_id=damage_report.id,
+        link_url=reverse("damage_report_detail", args=[damage_report.id]),
+    )
 
 
 def notify_chat_message(channel, sender, message_text):
@@ -19,50 +19,27 @@ class PushNotificationService:
     @staticmethod
     def send_notification(user_ids, heading, content, url=None, data=None):
         """
-        Send push notification to specific users
+        Queue push notification to specific users
+
+        Delivery happens in the push outbox dispatcher (core.services.push_outbox),
+        batched per recipient, so callers never wait on OneSignal.
 
         Args:
-            user_ids (list): List of OneSignal player IDs or Django user IDs
+            user_ids (list): List of Django user IDs (OneSignal external user IDs)
             heading (str): Notification heading/title
             content (str): Notification body text
             url (str): URL to open when notification clicked
             data (dict): Custom data to attach to notification
 
         Returns:
-            dict: Response from OneSignal API
+            int: Number of queued notifications
         """
-        if not hasattr(settings, "ONESIGNAL_APP_ID") or not settings.ONESIGNAL_APP_ID:
-            logger.warning("OneSignal not configured. Skipping push notification.")
-            return None
-
-        if not hasattr(settings, "ONESIGNAL_REST_API_KEY") or not settings.ONESIGNAL_REST_API_KEY:
-            logger.warning("OneSignal REST API Key not configured. Skipping push notification.")
-            return None
-
-        payload = {
-            "app_id": settings.ONESIGNAL_APP_ID,
-            "include_external_user_ids": [str(uid) for uid in user_ids],
-            "headings": {"en": heading},
-            "contents": {"en": content},
-            "web_url": url,
-            "data": data or {},
-        }
-
-        headers = {
-            "Content-Type": "application/json; charset=utf-8",
-            "Authorization": f"Basic {settings.ONESIGNAL_REST_API_KEY}",
-        }
+        from core.services.push_outbox import enqueue_push
 
-        try:
-            response = requests.post(
-                PushNotificationService.BASE_URL, json=payload, headers=headers, timeout=10
-            )
-            response.raise_for_status()
-            logger.info(f"Push notification sent to {len(user_ids)} users: {heading}")
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send push notification: {e}")
-            return None
+        queued = enqueue_push(user_ids, heading, content, url=url, data=data, channel="onesignal")
+        if queued:
+            logger.info(f"Push notification queued for {queued} users: {heading}")
+        return queued
 
     @staticmethod
     def send_to_all(heading, content, url=None, segments=None):
@@ -22,7 +22,7 @@ User = get_user_model()
 
 # Firebase Admin SDK
 try:
-    from firebase_admin import messaging
+    from firebase_admin import messaging  # noqa: F401  (availability probe)
 
     FIREBASE_AVAILABLE = True
 except ImportError:
@@ -427,9 +427,13 @@ def send_pwa_push(
     user, title: str, body: str, data: Optional[Dict] = None, url: Optional[str] = None
 ) -> dict:
     """
-    Send PWA push notification to user's subscribed devices
+    Queue PWA push notification to user's subscribed devices
     Uses Firebase Cloud Messaging for delivery
 
+    The push outbox dispatcher (core.services.push_outbox) sends it with
+    ``messaging.send_each`` together with the other pending notifications and
+    prunes unregistered subscriptions in bulk.
+
     Args:
         user: Django User instance
         title: Notification title
@@ -438,51 +442,13 @@ def send_pwa_push(
         url: Optional URL to open when clicked
 
     Returns:
-        dict with success/failure counts
+        dict with the number of queued notifications
     """
     if not FIREBASE_AVAILABLE:
         logger.error("Firebase Admin SDK not available")
-        return {"success_count": 0, "failure_count": 0, "errors": ["Firebase not configured"]}
-
-    from core.models import PushSubscription
-
-    subscriptions = PushSubscription.objects.filter(user=user)
-
-    if not subscriptions.exists():
-        return {"success_count": 0, "failure_count": 0, "errors": []}
-
-    results = {"success_count": 0, "failure_count": 0, "errors": []}
-
-    # Send to each subscription
-    for subscription in subscriptions:
-        try:
-            message = messaging.Message(
-                notification=messaging.Notification(title=title, body=body),
-                data=data or {},
-                token=subscription.endpoint,
-                webpush=messaging.WebpushConfig(
-                    headers={"Urgency": "high"},
-                    notification=messaging.WebpushNotification(
-                        title=title,
-                        body=body,
-                        icon="/static/icons/icon-192x192.png",
-                        badge="/static/icons/badge-72x72.png",
-                    ),
-                    fcm_options=messaging.WebpushFCMOptions(link=url) if url else None,
-                ),
-            )
-
-            response = messaging.send(message)
-            results["success_count"] += 1
-            logger.info(f"PWA push sent to {user.username}: {response}")
-
-        except Exception as e:
-            results["failure_count"] += 1
-            results["errors"].append(str(e))
-            logger.error(f"Failed push to subscription {subscription.id}: {e}")
+        return {"queued": 0, "errors": ["Firebase not configured"]}
 
-            # Remove invalid subscriptions
-            if "not-registered" in str(e).lower():
-                subscription.delete()
+    from core.services.push_outbox import enqueue_push
 
-    return results
+    queued = enqueue_push([user.pk], title, body, url=url, data=data, channel="fcm")
+    return {"queued": queued, "errors": []}
@@ -0,0 +1,63 @@
+"""
+Per-model change stamps: when were rows of a model last written?
+
+Used to validate cached API responses (``core.api.conditional``). A stamp
+is a timestamp in the cache, bumped by post_save/post_delete receivers in
+``core.signals`` for every model in ``TRACKED_MODELS``. Code that writes
+those models with ``update()``/``bulk_*`` (no signals) calls ``touch()``
+itself. A lost stamp restarts at the current time, so the next conditional
+request misses rather than wrongly matching.
+"""
+
+import time
+
+from django.core.cache import cache
+
+STAMP_KEY = "api:stamp:{}"
+
+# Models whose writes bump a stamp (receivers in core.signals)
+TRACKED_MODELS = (
+    "auth.User",
+    "core.ChangeOrder",
+    "core.ChangeOrderPhoto",
+    "core.ClientContact",
+    "core.ClientOrganization",
+    "core.ColorSample",
+    "core.Expense",
+    "core.FloorPlan",
+    "core.Income",
+    "core.InventoryItem",
+    "core.Invoice",
+    "core.PayrollRecord",
+    "core.PlanPin",
+    "core.Project",
+    "core.ProjectInventory",
+    "core.ScheduleItemV2",
+    "core.SchedulePhaseV2",
+    "core.ScheduleTaskV2",
+    "core.Task",
+    "core.TaskImage",
+    "core.TimeEntry",
+)
+
+
+def touch(*labels):
+    """Record that rows of the given models (``"core.PlanPin"``) just changed."""
+    now = time.time()
+    cache.set_many({STAMP_KEY.format(label.lower()): now for label in labels}, timeout=None)
+
+
+def stamps(labels) -> dict:
+    """``{label: last write time}`` for ``labels``."""
+    keys = {STAMP_KEY.format(label.lower()): label for label in labels}
+    found = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # Never written since the cache started, or evicted: start the clock
+        # now. If the cache is unreachable this differs on every call, so
+        # nothing validates instead of everything.
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+            found[key] = now
+    return {keys[key]: value for key, value in found.items()}
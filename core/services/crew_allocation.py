@@ -0,0 +1,126 @@
+"""
+Company-wide crew allocation index.
+
+Conflict and overtime checks used to walk every plan of the day, every
+activity and every ``assigned_employees`` relation in nested loops, one query
+per level. This module builds a per-date index in ONE query over the
+``PlannedActivity.assigned_employees`` through table:
+
+    employee_id -> [Allocation(activity, plan, project, hours), ...]
+
+The index is cached per plan date and dropped by the signal handlers in
+``core/signals.py`` whenever an activity, its assignments or its plan
+change, so every consumer (``DailyPlanAIAssistant``, the PM morning
+briefing, the planner workspace) gets constant-time lookups per employee.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+CACHE_KEY = "crew_allocation:{}"
+# Plan date moves and project renames are not invalidated; bound the staleness.
+CACHE_TIMEOUT = 600
+DAILY_HOURS_LIMIT = 8
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """One employee assigned to one planned activity."""
+
+    activity_id: int
+    activity_title: str
+    hours: float
+    plan_id: int
+    project_id: int
+    project_name: str
+
+
+class CrewAllocationIndex:
+    """Who works on what, and for how long, on one plan date (all projects)."""
+
+    def __init__(self, plan_date, rows=()):
+        self.plan_date = plan_date
+        self.by_employee: dict[int, list[Allocation]] = defaultdict(list)
+        self.names: dict[int, str] = {}
+        self.assigned_activity_ids: set[int] = set()
+        for emp_id, first, last, act_id, title, hours, plan_id, project_id, project_name in rows:
+            self.names[emp_id] = f"{first} {last}".strip()
+            self.assigned_activity_ids.add(act_id)
+            self.by_employee[emp_id].append(
+                Allocation(act_id, title, float(hours or 0), plan_id, project_id, project_name)
+            )
+        self.by_employee = dict(self.by_employee)
+
+    def allocations(self, employee_id) -> list[Allocation]:
+        return self.by_employee.get(employee_id, [])
+
+    def hours(self, employee_id, plan_id=None) -> float:
+        """Planned hours of ``employee_id`` for the day (optionally one plan only)."""
+        return sum(
+            a.hours for a in self.allocations(employee_id) if plan_id is None or a.plan_id == plan_id
+        )
+
+    def project_ids(self, employee_id) -> set[int]:
+        return {a.project_id for a in self.allocations(employee_id)}
+
+    def employees_for_plan(self, plan_id) -> set[int]:
+        return {emp_id for emp_id, allocs in self.by_employee.items() if any(a.plan_id == plan_id for a in allocs)}
+
+    def overbooked(self, limit=DAILY_HOURS_LIMIT) -> dict[int, float]:
+        """``{employee_id: hours}`` for everyone planned above ``limit`` hours."""
+        return {emp_id: total for emp_id in self.by_employee if (total := self.hours(emp_id)) > limit}
+
+    def double_booked(self) -> dict[int, set[int]]:
+        """``{employee_id: project_ids}`` for everyone planned on more than one project."""
+        return {emp_id: pids for emp_id in self.by_employee if len(pids := self.project_ids(emp_id)) > 1}
+
+    def as_json(self) -> dict:
+        """Per-employee summary keyed by id (string keys for JSON)."""
+        return {
+            str(emp_id): {
+                "name": self.names.get(emp_id, ""),
+                "hours": round(self.hours(emp_id), 2),
+                "project_ids": sorted(self.project_ids(emp_id)),
+                "activity_ids": [a.activity_id for a in allocs],
+            }
+            for emp_id, allocs in self.by_employee.items()
+        }
+
+
+def build_allocation_index(plan_date) -> CrewAllocationIndex:
+    """Build the index for ``plan_date`` with a single query."""
+    from core.models import PlannedActivity
+
+    through = PlannedActivity.assigned_employees.through
+    rows = through.objects.filter(plannedactivity__daily_plan__plan_date=plan_date).values_list(
+        "employee_id",
+        "employee__first_name",
+        "employee__last_name",
+        "plannedactivity_id",
+        "plannedactivity__title",
+        "plannedactivity__estimated_hours",
+        "plannedactivity__daily_plan_id",
+        "plannedactivity__daily_plan__project_id",
+        "plannedactivity__daily_plan__project__name",
+    )
+    return CrewAllocationIndex(plan_date, rows)
+
+
+def get_allocation_index(plan_date) -> CrewAllocationIndex:
+    """Cached ``build_allocation_index`` (per plan date)."""
+    key = CACHE_KEY.format(plan_date.isoformat())
+    index = cache.get(key)
+    if index is None:
+        index = build_allocation_index(plan_date)
+        cache.set(key, index, CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_allocation_index(*plan_dates) -> None:
+    for plan_date in plan_dates:
+        if plan_date:
+            cache.delete(CACHE_KEY.format(plan_date.isoformat()))
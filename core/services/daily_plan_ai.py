@@ -23,7 +23,6 @@ from django.utils import timezone
 from core.models import (
     ActivityTemplate,
     DailyPlan,
-    Employee,
     EmployeeCertification,
     InventoryItem,
     PlannedActivity,
@@ -348,12 +347,23 @@ class DailyPlanAIAssistant:
     def _check_employees(
         self, activities: list[PlannedActivity], plan_date
     ) -> tuple[list[str], list[EmployeeIssue]]:
-        """Check employee assignments and conflicts"""
+        """Check employee assignments and conflicts
+
+        Uses the company-wide crew allocation index for ``plan_date`` (one
+        cached query) instead of walking every plan, activity and assignment.
+        """
+        from core.services.crew_allocation import DAILY_HOURS_LIMIT, get_allocation_index
+
         passed = []
         issues = []
+        activities = list(activities)
+        if not activities:
+            return passed, issues
+        plan_id = activities[0].daily_plan_id
+        index = get_allocation_index(plan_date)
 
         # Check for unassigned activities
-        unassigned = [a for a in activities if not a.assigned_employees.exists()]
+        unassigned = [a for a in activities if a.id not in index.assigned_activity_ids]
         if unassigned:
             issues.append(
                 EmployeeIssue(
@@ -368,68 +378,43 @@ class DailyPlanAIAssistant:
         else:
             passed.append("All activities have assigned employees")
 
-        # Check for double-bookings
-        employee_hours = {}  # {employee_id: total_hours}
-        for activity in activities:
-            for emp in activity.assigned_employees.all():
-                hours = activity.estimated_hours or 0
-                employee_hours[emp.id] = employee_hours.get(emp.id, 0) + hours
-
-        # Check for overtime (> 8 hours per day)
-        for emp_id, total_hours in employee_hours.items():
-            if total_hours > 8:
-                try:
-                    employee = Employee.objects.get(id=emp_id)
-                    issues.append(
-                        EmployeeIssue(
-                            employee_name=f"{employee.first_name} {employee.last_name}",
-                            issue_type="overtime",
-                            description=f"Scheduled for {total_hours:.1f} hours (exceeds 8-hour limit)",
-                            severity="warning",
-                            suggestion="Reduce workload or split tasks among multiple employees",
-                            affected_activities=[
-                                a.id for a in activities if employee in a.assigned_employees.all()
-                            ],
-                        )
+        for emp_id in sorted(index.employees_for_plan(plan_id)):
+            name = index.names.get(emp_id, "")
+            here = [a.activity_id for a in index.allocations(emp_id) if a.plan_id == plan_id]
+
+            # Check for overtime (> 8 hours per day, across all projects)
+            total_hours = index.hours(emp_id)
+            if total_hours > DAILY_HOURS_LIMIT:
+                issues.append(
+                    EmployeeIssue(
+                        employee_name=name,
+                        issue_type="overtime",
+                        description=f"Scheduled for {total_hours:.1f} hours (exceeds 8-hour limit)",
+                        severity="warning",
+                        suggestion="Reduce workload or split tasks among multiple employees",
+                        affected_activities=here,
                     )
-                except Employee.DoesNotExist:
-                    pass
+                )
             else:
-                if emp_id not in [issue.employee_name for issue in issues]:
-                    try:
-                        employee = Employee.objects.get(id=emp_id)
-                        passed.append(
-                            f"Employee {employee.first_name} {employee.last_name} workload is reasonable"
-                        )
-                    except Employee.DoesNotExist:
-                        pass
-
-        # Check for conflicts with other projects on same date
-        all_employee_ids = list(employee_hours.keys())
-        if all_employee_ids and plan_date:
-            other_plans = DailyPlan.objects.filter(
-                date=plan_date,
-            ).exclude(pk=activities[0].daily_plan_id if activities else 0)
-
-            for other_plan in other_plans:
-                other_activities = other_plan.activities.prefetch_related("assigned_employees").all()
-                for other_activity in other_activities:
-                    for emp in other_activity.assigned_employees.filter(id__in=all_employee_ids):
-                        issues.append(
-                            EmployeeIssue(
-                                employee_name=f"{emp.first_name} {emp.last_name}",
-                                issue_type="double_booking",
-                                description=(
-                                    f"Also assigned to '{other_activity.title}' on project "
-                                    f"'{other_plan.project.name}' for the same date"
-                                ),
-                                severity="warning",
-                                suggestion="Verify this employee can work on multiple projects on the same day",
-                                affected_activities=[
-                                    a.id for a in activities if emp in a.assigned_employees.all()
-                                ],
-                            )
-                        )
+                passed.append(f"Employee {name} workload is reasonable")
+
+            # Check for conflicts with other projects on same date
+            for other in index.allocations(emp_id):
+                if other.plan_id == plan_id:
+                    continue
+                issues.append(
+                    EmployeeIssue(
+                        employee_name=name,
+                        issue_type="double_booking",
+                        description=(
+                            f"Also assigned to '{other.activity_title}' on project "
+                            f"'{other.project_name}' for the same date"
+                        ),
+                        severity="warning",
+                        suggestion="Verify this employee can work on multiple projects on the same day",
+                        affected_activities=here,
+                    )
+                )
 
         return passed, issues
 
@@ -0,0 +1,111 @@
+"""
+Per-project dashboard snapshots, computed once and pushed to every viewer.
+
+``DashboardConsumer`` used to load the project and run
+``earned_value_summary()``, ``profit()`` and ``budget_remaining`` for each
+socket, so N viewers of one project cost N identical sets of aggregate
+queries. Now:
+
+  * a write that moves the numbers (income, expense, budget line/progress,
+    payroll, the project itself) calls ``schedule(project_id)`` on commit;
+  * the first call of a burst queues ONE ``publish_project_dashboard`` task
+    ``DEBOUNCE_SECONDS`` later; further writes in the window ride along;
+  * the task computes the snapshot once, caches it and broadcasts the same
+    payload to the ``dashboard_project_<id>`` group;
+  * a viewer that connects gets the cached snapshot (computed on the spot
+    only when there is none, or it is from another day — PV moves daily).
+
+Projects nobody watched within ``SNAPSHOT_TTL`` have no snapshot and are not
+recomputed on writes; the next viewer computes one. DB load therefore
+depends on the rate of change bursts, not on the number of viewers.
+"""
+
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = 2
+SNAPSHOT_TTL = 86400  # a day: "someone has this dashboard open"
+SNAPSHOT_KEY = "dashboard:snapshot:{}"
+PENDING_KEY = "dashboard:pending:{}"
+
+
+def group_name(project_id) -> str:
+    return f"dashboard_project_{project_id}"
+
+
+def compute_snapshot(project_id) -> dict:
+    """Dashboard metrics for one project, JSON-ready ({} if it is gone)."""
+    from core.models import Project
+
+    project = Project.objects.filter(pk=project_id).first()
+    if project is None:
+        return {}
+    ev_data = project.earned_value_summary()
+    return {
+        "project_name": project.name,
+        "earned_value": {
+            key: value.isoformat() if key == "date" else (float(value) if value is not None else None)
+            for key, value in ev_data.items()
+        },
+        "budget_total": float(project.budget_total),
+        "total_expenses": float(project.total_expenses),
+        "budget_remaining": float(project.budget_remaining),
+        "profit": float(project.profit()),
+        "computed_on": timezone.localdate().isoformat(),
+        "timestamp": timezone.now().isoformat(),
+    }
+
+
+def current_snapshot(project_id) -> dict:
+    """Cached snapshot for a joining viewer; computed only when missing or stale."""
+    snapshot = cache.get(SNAPSHOT_KEY.format(project_id))
+    if snapshot is None or snapshot.get("computed_on") != timezone.localdate().isoformat():
+        snapshot = compute_snapshot(project_id)
+        cache.set(SNAPSHOT_KEY.format(project_id), snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def schedule(project_id) -> None:
+    """Republish the project's dashboard after the current transaction commits."""
+    if project_id is not None:
+        transaction.on_commit(lambda: _schedule_publish(project_id))
+
+
+def _schedule_publish(project_id):
+    if cache.get(SNAPSHOT_KEY.format(project_id)) is None:
+        return  # nobody watching
+    # One delayed publish per window collects the whole burst
+    if not cache.add(PENDING_KEY.format(project_id), 1, DEBOUNCE_SECONDS):
+        return
+    try:
+        from core.tasks import publish_project_dashboard
+
+        publish_project_dashboard.apply_async((project_id,), countdown=DEBOUNCE_SECONDS)
+    except Exception as e:
+        cache.delete(PENDING_KEY.format(project_id))
+        logger.warning(f"Could not schedule dashboard publish for project {project_id}: {e}")
+
+
+def publish(project_id) -> dict:
+    """Compute the snapshot once and send it to every viewer of the project."""
+    # Writes from here on schedule a new publish
+    cache.delete(PENDING_KEY.format(project_id))
+    snapshot = compute_snapshot(project_id)
+    cache.set(SNAPSHOT_KEY.format(project_id), snapshot, SNAPSHOT_TTL)
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(channel_layer.group_send)(
+                group_name(project_id), {"type": "dashboard_snapshot", "snapshot": snapshot}
+            )
+    except Exception as e:
+        logger.warning(f"Dashboard broadcast for project {project_id} failed: {e}")
+    return snapshot
@@ -0,0 +1,210 @@
+"""
+Delta sync for offline-first clients.
+
+Mobile/PWA clients used to re-pull whole lists (projects, tasks, daily plans,
+touch-ups, notifications) to stay current. Instead, every create/update/
+delete of a synced model appends a ``SyncChange`` row (signals in
+``core.signals``; bulk writers call ``record_changes``). A client keeps an
+opaque cursor and asks for what changed after it:
+
+    GET /api/v1/sync/?cursor=<cursor>
+
+and gets only the rows that changed since — current state for upserts, ids
+for deletes (tombstones) — scoped to what ``core.access`` lets the user see.
+
+Cursor rules:
+  * no cursor, or one older than ``RETENTION_DAYS`` (the log is pruned
+    after that), answers ``reset``: the client reloads its lists and keeps
+    the returned cursor, which was taken BEFORE it reloads, so nothing is
+    missed in between;
+  * ids are allocated at insert but transactions commit in any order, so a
+    change younger than ``SETTLE_SECONDS`` may still be preceded by an
+    uncommitted lower id. The cursor only advances past settled changes;
+    recent ones are sent again next time (upserts are idempotent).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import time
+
+from django.apps import apps
+from django.db.models import Max, Q
+from django.utils import timezone
+
+RETENTION_DAYS = 30
+SETTLE_SECONDS = 5
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+@dataclass(frozen=True)
+class SyncedModel:
+    collection: str
+    model: str  # app label, e.g. "core.Task"
+    project_attr: str | None = None  # attribute holding the project id (visibility)
+    user_attr: str | None = None  # attribute holding the owner id (per-user rows)
+    select_related: tuple = ()
+
+
+SYNCED_MODELS = [
+    SyncedModel("projects", "core.Project", project_attr="pk"),
+    SyncedModel("tasks", "core.Task", project_attr="project_id", select_related=("project", "assigned_to__user")),
+    SyncedModel("daily_plans", "core.DailyPlan", project_attr="project_id"),
+    SyncedModel("touchups", "core.TouchUp", project_attr="project_id"),
+    SyncedModel("notifications", "core.Notification", user_attr="user_id"),
+]
+BY_COLLECTION = {spec.collection: spec for spec in SYNCED_MODELS}
+BY_MODEL = {spec.model.lower(): spec for spec in SYNCED_MODELS}
+
+
+def spec_for(model) -> SyncedModel | None:
+    return BY_MODEL.get(model._meta.label_lower)
+
+
+def _entry(spec, instance, deleted):
+    from core.models import SyncChange
+
+    return SyncChange(
+        collection=spec.collection,
+        object_id=instance.pk,
+        project_id=getattr(instance, spec.project_attr) if spec.project_attr else None,
+        user_id=getattr(instance, spec.user_attr) if spec.user_attr else None,
+        deleted=deleted,
+    )
+
+
+def record_change(instance, deleted: bool = False) -> None:
+    """Log one saved/deleted instance of a synced model."""
+    spec = spec_for(type(instance))
+    if spec is not None and instance.pk is not None:
+        _entry(spec, instance, deleted).save()
+
+
+def record_changes(instances, deleted: bool = False) -> None:
+    """Log many instances (for ``bulk_create``/``update()`` paths, which send no signals)."""
+    from core.models import SyncChange
+
+    entries = []
+    for instance in instances:
+        spec = spec_for(type(instance))
+        if spec is not None and instance.pk is not None:
+            entries.append(_entry(spec, instance, deleted))
+    if entries:
+        SyncChange.objects.bulk_create(entries)
+
+
+# Cursor ----------------------------------------------------------------------
+
+
+def encode_cursor(change_id: int) -> str:
+    return f"{change_id}.{int(time.time())}"
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """Change id encoded in ``cursor``; None when missing, malformed or expired."""
+    if not cursor:
+        return None
+    try:
+        change_id, issued = (int(part) for part in cursor.split(".", 1))
+    except ValueError:
+        return None
+    if time.time() - issued > RETENTION_DAYS * 86400:
+        return None
+    return change_id
+
+
+def head() -> int:
+    from core.models import SyncChange
+
+    return SyncChange.objects.aggregate(head=Max("id"))["head"] or 0
+
+
+# Reading -----------------------------------------------------------------------
+
+
+def visible_changes(user):
+    """SyncChange rows ``user`` may see: their projects' rows and their own rows.
+
+    Project-scoped tombstones are visible to everyone: once a project is
+    deleted it no longer appears in ``accessible_projects``, yet clients must
+    still drop it and its cascaded rows. A tombstone carries only an id.
+    """
+    from core.access import accessible_projects
+    from core.models import SyncChange
+
+    return SyncChange.objects.filter(
+        Q(project_id__in=accessible_projects(user).values("pk"))
+        | Q(user_id=user.pk)
+        | Q(deleted=True, user_id__isnull=True)
+    )
+
+
+def changes_since(user, cursor: str | None, collections=None, limit: int = DEFAULT_LIMIT) -> dict:
+    """
+    Everything ``user`` may see that changed after ``cursor``.
+
+    Returns ``{"reset", "cursor", "has_more", "changes"}`` where ``changes``
+    maps collection -> {"upserts": [instances], "deletes": [ids]}; instances
+    are loaded once per collection, whatever the number of changes.
+    """
+    after = decode_cursor(cursor)
+    if after is None:
+        return {"reset": True, "cursor": encode_cursor(head()), "has_more": False, "changes": {}}
+
+    limit = max(1, min(limit, MAX_LIMIT))
+    qs = visible_changes(user).filter(id__gt=after).order_by("id")
+    if collections:
+        qs = qs.filter(collection__in=collections)
+    rows = list(qs.values_list("id", "collection", "object_id", "deleted", "changed_at")[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Latest state per object wins
+    latest = {}
+    for change_id, collection, object_id, deleted, _ in rows:
+        latest[(collection, object_id)] = deleted
+
+    changes = {}
+    for (collection, object_id), deleted in latest.items():
+        bucket = changes.setdefault(collection, {"upserts": [], "deletes": []})
+        bucket["deletes" if deleted else "upserts"].append(object_id)
+    for collection, bucket in changes.items():
+        spec = BY_COLLECTION[collection]
+        model = apps.get_model(spec.model)
+        found = {
+            obj.pk: obj
+            for obj in model._default_manager.filter(pk__in=bucket["upserts"]).select_related(*spec.select_related)
+        }
+        # Deleted after being logged as changed: the tombstone follows in a later row
+        bucket["upserts"] = [found[pk] for pk in bucket["upserts"] if pk in found]
+
+    return {
+        "reset": False,
+        "cursor": encode_cursor(_next_cursor(rows, after, has_more)),
+        "has_more": has_more,
+        "changes": changes,
+    }
+
+
+def _next_cursor(rows, after, has_more):
+    if not rows:
+        return after
+    if has_more:
+        return rows[-1][0]
+    settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    next_id = after
+    for change_id, _, _, _, changed_at in rows:
+        if changed_at > settled:
+            break
+        next_id = change_id
+    return next_id
+
+
+def prune(days: int = RETENTION_DAYS) -> int:
+    """Drop log rows older than the retention window (their cursors have expired)."""
+    from core.models import SyncChange
+
+    deleted, _ = SyncChange.objects.filter(changed_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
@@ -0,0 +1,179 @@
+"""
+Direct-to-storage transfers (presigned URLs).
+
+Downloads and uploads of project files used to stream every byte through a
+gunicorn worker (``FileResponse(file.open("rb"))`` / multipart POST). With
+S3 that doubles bandwidth and pins a sync worker for the whole transfer.
+
+This module hands the client a short-lived URL that talks to storage
+directly instead:
+
+- S3 (``storages.backends.s3boto3.S3Boto3Storage``): real presigned
+  ``GET`` / ``PUT`` URLs generated by boto3.
+- Local filesystem (dev, Railway volume): signed, expiring Django URLs
+  served by ``storage_signed_download`` / ``storage_signed_upload``. Those
+  still run in Django, but keep the exact same client contract so the
+  front-end does not care which backend is configured.
+
+Uploads finish with a completion callback (``ProjectFile`` is only created
+once the object exists in storage). Download counters are buffered in the
+cache and flushed in one ``F()`` update per file by
+``core.tasks.flush_file_download_counts``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_URL_TTL = 300  # seconds
+UPLOAD_URL_TTL = 900  # seconds
+UPLOAD_MAX_BYTES = 200 * 1024 * 1024
+
+_DOWNLOAD_SALT = "core.direct_storage.download"
+_UPLOAD_SALT = "core.direct_storage.upload"
+
+_PENDING_KEY = "file_downloads:pending:{}"
+_DIRTY_KEY = "file_downloads:dirty"
+_PENDING_TIMEOUT = 24 * 3600
+
+
+def _is_s3(storage=None) -> bool:
+    storage = storage or default_storage
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+def _s3_client(storage):
+    return storage.connection.meta.client
+
+
+# ---------------------------------------------------------------------------
+# Downloads
+# ---------------------------------------------------------------------------
+
+
+def presigned_download_url(file_field, filename: str | None = None, expires: int = DOWNLOAD_URL_TTL) -> str:
+    """Return a URL the client can fetch ``file_field`` from directly."""
+    storage = file_field.storage
+    filename = filename or os.path.basename(file_field.name)
+    disposition = f'attachment; filename="{filename}"'
+    if _is_s3(storage):
+        return _s3_client(storage).generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": storage.bucket_name,
+                "Key": storage._normalize_name(file_field.name),
+                "ResponseContentDisposition": disposition,
+            },
+            ExpiresIn=expires,
+        )
+    token = signing.dumps({"n": file_field.name, "f": filename}, salt=_DOWNLOAD_SALT)
+    return reverse("storage_signed_download", args=[token])
+
+
+def load_download_token(token: str, max_age: int = DOWNLOAD_URL_TTL) -> dict:
+    """Decode a local download token. Raises ``signing.BadSignature`` (or ``SignatureExpired``)."""
+    return signing.loads(token, salt=_DOWNLOAD_SALT, max_age=max_age)
+
+
+def record_download(file_id: int) -> None:
+    """Count one download of ``ProjectFile`` ``file_id`` without writing the row.
+
+    Falls back to an immediate ``F()`` update when the cache is unavailable.
+    """
+    key = _PENDING_KEY.format(file_id)
+    try:
+        cache.add(key, 0, _PENDING_TIMEOUT)
+        if cache.incr(key) == 1:
+            dirty = cache.get(_DIRTY_KEY) or set()
+            dirty.add(file_id)
+            cache.set(_DIRTY_KEY, dirty, _PENDING_TIMEOUT)
+        return
+    except Exception as exc:
+        logger.warning(f"[direct_storage] download counter cache unavailable ({exc}); writing directly")
+    from core.models import ProjectFile
+
+    ProjectFile.objects.filter(pk=file_id).update(download_count=F("download_count") + 1)
+
+
+def flush_download_counts() -> int:
+    """Apply buffered download counts to ``ProjectFile.download_count``.
+
+    Returns the number of files updated.
+    """
+    from core.models import ProjectFile
+
+    dirty = cache.get(_DIRTY_KEY) or set()
+    if not dirty:
+        return 0
+    cache.delete(_DIRTY_KEY)
+    updated = 0
+    for file_id in dirty:
+        key = _PENDING_KEY.format(file_id)
+        count = cache.get(key) or 0
+        if not count:
+            continue
+        # decr (not delete) so downloads counted during the flush survive
+        cache.decr(key, count)
+        updated += ProjectFile.objects.filter(pk=file_id).update(download_count=F("download_count") + count)
+    return updated
+
+
+# ---------------------------------------------------------------------------
+# Uploads
+# ---------------------------------------------------------------------------
+
+
+def build_upload_key(prefix: str, filename: str) -> str:
+    """Unique storage key under ``prefix`` that keeps the original extension."""
+    base, ext = os.path.splitext(os.path.basename(filename))
+    safe_base = "".join(c for c in base if c.isalnum() or c in "-_")[:80] or "file"
+    return f"{prefix.rstrip('/')}/{uuid.uuid4().hex[:12]}_{safe_base}{ext.lower()}"
+
+
+def presigned_upload(key: str, content_type: str = "application/octet-stream", meta: dict | None = None) -> dict:
+    """Prepare a direct upload of one object to ``key``.
+
+    Returns ``{"method", "url", "headers", "key", "token"}``. The client PUTs
+    the raw bytes to ``url`` and then posts ``token`` to the completion
+    endpoint, which creates the database record.
+    """
+    token = signing.dumps({"k": key, "ct": content_type, **(meta or {})}, salt=_UPLOAD_SALT)
+    if _is_s3():
+        url = _s3_client(default_storage).generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": default_storage.bucket_name,
+                "Key": default_storage._normalize_name(key),
+                "ContentType": content_type,
+            },
+            ExpiresIn=UPLOAD_URL_TTL,
+        )
+    else:
+        url = reverse("storage_signed_upload", args=[token])
+    return {
+        "method": "PUT",
+        "url": url,
+        "headers": {"Content-Type": content_type},
+        "key": key,
+        "token": token,
+    }
+
+
+def load_upload_token(token: str, max_age: int = UPLOAD_URL_TTL) -> dict:
+    """Decode an upload token. Raises ``signing.BadSignature`` (or ``SignatureExpired``)."""
+    return signing.loads(token, salt=_UPLOAD_SALT, max_age=max_age)
+
+
+def upload_max_bytes() -> int:
+    return getattr(settings, "DIRECT_UPLOAD_MAX_BYTES", UPLOAD_MAX_BYTES)
@@ -0,0 +1,173 @@
+"""
+Batched email delivery for notification emails.
+
+``send_pending_notifications`` used to build and send one message at a time,
+each over a fresh SMTP connection, then save every notification row on its
+own, and stopped after 100 emails per hour however long the queue was.
+
+This engine:
+
+  * ``deliver`` sends many messages over ONE backend connection
+    (``get_connection()`` + ``send_messages``), reconnecting only after a
+    failure, and reports success per message;
+  * ``send_pending_notification_emails`` coalesces each user's pending
+    notifications into a single email (the digest template when there is
+    more than one) and marks them all sent with one UPDATE per batch;
+  * an hourly rate budget (``EMAIL_HOURLY_LIMIT``, shared through the cache by
+    all workers) decides how many emails go out, so large backlogs drain in
+    batches without exceeding what the SMTP provider accepts.
+
+Works with any Django email backend (locmem in tests).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+DEFAULT_HOURLY_LIMIT = 1000
+DIGEST_ITEMS = 25
+BUDGET_KEY = "email_budget:{}"
+
+
+def hourly_limit() -> int:
+    return int(getattr(settings, "EMAIL_HOURLY_LIMIT", DEFAULT_HOURLY_LIMIT))
+
+
+def take_budget(requested: int) -> int:
+    """Reserve up to ``requested`` emails from this hour's budget; returns the grant."""
+    if requested <= 0:
+        return 0
+    key = BUDGET_KEY.format(timezone.now().strftime("%Y%m%d%H"))
+    cache.add(key, 0, 3600)
+    try:
+        used = cache.incr(key, requested)
+    except ValueError:
+        # Key expired between add and incr
+        cache.set(key, requested, 3600)
+        used = requested
+    if used is None:
+        # Cache unavailable (IGNORE_EXCEPTIONS): do not block email entirely
+        return requested
+    granted = max(0, min(requested, hourly_limit() - (used - requested)))
+    if granted < requested:
+        cache.decr(key, requested - granted)
+    return granted
+
+
+def deliver(messages, connection=None) -> list[bool]:
+    """Send ``messages`` over a single connection; one bool per message."""
+    if not messages:
+        return []
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error(f"Could not open email connection: {e}")
+        return [False] * len(messages)
+    results = []
+    try:
+        for message in messages:
+            try:
+                results.append(bool(connection.send_messages([message])))
+            except Exception as e:
+                logger.error(f"Failed to send email to {message.to}: {e}")
+                results.append(False)
+                # The session may be unusable after an SMTP error
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    results.extend([False] * (len(messages) - len(results)))
+                    break
+    finally:
+        connection.close()
+    return results
+
+
+def build_digest_email(user, items, since, now) -> EmailMultiAlternatives:
+    """Notification digest email for ``user`` (templates shared with ``send_notification_digest``)."""
+    context = {
+        "user": user,
+        "items": items[:DIGEST_ITEMS],  # cap list in email
+        "count": len(items),
+        "since": since,
+        "now": now,
+        "app_name": getattr(settings, "APP_NAME", "Kibray"),
+        "site_url": getattr(settings, "SITE_URL", ""),
+    }
+    context["remaining"] = max(0, context["count"] - len(context["items"]))
+    subject = f"[{context['app_name']}] Resumen de notificaciones ({context['count']})"
+    text_body = render_to_string("core/emails/notification_digest.txt", context)
+    html_body = render_to_string("core/emails/notification_digest.html", context)
+    msg = EmailMultiAlternatives(subject, text_body, to=[user.email])
+    msg.attach_alternative(html_body, "text/html")
+    return msg
+
+
+def send_pending_notification_emails(since_hours: int = 24) -> dict:
+    """Email every unsent notification of the last ``since_hours``, one email per user."""
+    from core.models import Notification
+    from core.services.email_service import KibrayEmailService
+
+    now = timezone.now()
+    since = now - timedelta(hours=since_hours)
+    pending = Notification.objects.filter(sent_via_email=False, created_at__gte=since).exclude(
+        user__email=""
+    )
+    user_ids = list(pending.order_by("user_id").values_list("user_id", flat=True).distinct())
+
+    summary = {"sent": 0, "errors": 0, "emails": 0, "deferred_users": 0}
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        chunk = user_ids[start : start + BATCH_SIZE]
+        granted = take_budget(len(chunk))
+        exhausted = granted < len(chunk)
+        if exhausted:
+            # Left for the next run (next hour's budget)
+            summary["deferred_users"] = len(user_ids) - start - granted
+        chunk = chunk[:granted]
+
+        by_user = {}
+        rows = pending.filter(user_id__in=chunk).select_related("user").order_by("user_id", "-created_at")
+        for notification in rows:
+            by_user.setdefault(notification.user_id, []).append(notification)
+
+        messages, groups = [], []
+        for items in by_user.values():
+            user = items[0].user
+            try:
+                if len(items) == 1:
+                    message = KibrayEmailService.build_simple_notification(
+                        [user.email], items[0].title, items[0].message
+                    )
+                else:
+                    message = build_digest_email(user, items, since, now)
+            except Exception as e:
+                logger.error(f"Failed to render email notifications for user {user.pk}: {e}")
+                summary["errors"] += len(items)
+                continue
+            messages.append(message)
+            groups.append(items)
+
+        sent_ids = []
+        for items, ok in zip(groups, deliver(messages)):
+            if ok:
+                sent_ids.extend(n.id for n in items)
+                summary["emails"] += 1
+            else:
+                summary["errors"] += len(items)
+        if sent_ids:
+            Notification.objects.filter(id__in=sent_ids).update(sent_via_email=True)
+            summary["sent"] += len(sent_ids)
+        if exhausted:
+            break
+    return summary
@@ -41,6 +41,57 @@ class KibrayEmailService:
         """Get the default from email from settings, with fallback."""
         return getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@kibraypainting.us')
     
+    @classmethod
+    def build_email(
+        cls,
+        subject: str,
+        template_name: str,
+        context: dict,
+        to_emails: list,
+        from_email: Optional[str] = None,
+        cc: Optional[list] = None,
+        bcc: Optional[list] = None,
+        attachments: Optional[list] = None,
+    ) -> EmailMultiAlternatives:
+        """
+        Render a templated email (HTML + plain text) without sending it.
+
+        Used by ``_send_email`` and by batch senders that deliver many
+        messages over one connection (see ``core.services.email_delivery``).
+        """
+        # Render HTML content
+        html_content = render_to_string(template_name, context)
+
+        # Create plain text version
+        text_content = strip_tags(html_content)
+        # Clean up the plain text
+        text_content = '\n'.join(line.strip() for line in text_content.split('\n') if line.strip())
+
+        # Create email
+        email = EmailMultiAlternatives(
+            subject=subject,
+            body=text_content,
+            from_email=from_email or cls._get_default_from_email(),
+            to=to_emails,
+            cc=cc or None,
+            bcc=bcc or None,
+        )
+        email.attach_alternative(html_content, "text/html")
+
+        # Optional file attachments: each item is a
+        # (filename, content_bytes, mimetype) tuple. Malformed entries are
+        # logged and skipped so one bad attachment can't abort the send.
+        for att in (attachments or []):
+            try:
+                filename, content, mimetype = att
+                email.attach(filename, content, mimetype)
+            except Exception as att_exc:
+                logger.error(
+                    "Skipping malformed email attachment for %s: %s",
+                    to_emails, att_exc,
+                )
+        return email
+
     @classmethod
     def _send_email(
         cls,
@@ -109,38 +160,11 @@ class KibrayEmailService:
             return False
 
         try:
-            # Render HTML content
-            html_content = render_to_string(template_name, context)
-            
-            # Create plain text version
-            text_content = strip_tags(html_content)
-            # Clean up the plain text
-            text_content = '\n'.join(line.strip() for line in text_content.split('\n') if line.strip())
-            
-            # Create email
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=from_email or cls._get_default_from_email(),
-                to=to_emails,
-                cc=cc or None,
-                bcc=bcc or None,
+            email = cls.build_email(
+                subject, template_name, context, to_emails,
+                from_email=from_email, cc=cc, bcc=bcc, attachments=attachments,
             )
-            email.attach_alternative(html_content, "text/html")
 
-            # Optional file attachments: each item is a
-            # (filename, content_bytes, mimetype) tuple. Malformed entries are
-            # logged and skipped so one bad attachment can't abort the send.
-            for att in (attachments or []):
-                try:
-                    filename, content, mimetype = att
-                    email.attach(filename, content, mimetype)
-                except Exception as att_exc:
-                    logger.error(
-                        "Skipping malformed email attachment for %s: %s",
-                        to_emails, att_exc,
-                    )
-            
             # Send. We forward the caller's `fail_silently` to email.send():
             #   * fail_silently=True  (default for most callers) → Django's
             #     SMTP backend swallows its own exceptions (socket.timeout,
@@ -447,20 +471,12 @@ class KibrayEmailService:
         Returns:
             bool: True if email was sent successfully
         """
-        context = {
-            'subject': subject,
-            'message': message,
-            'greeting': greeting,
-            'button_url': button_url,
-            'button_text': button_text,
-            'details': details,
-            'closing': closing,
-        }
-        
         return cls._send_email(
             subject=subject,
             template_name='emails/simple_notification.html',
-            context=context,
+            context=cls._simple_notification_context(
+                subject, message, greeting, button_url, button_text, details, closing
+            ),
             to_emails=to_emails,
             fail_silently=fail_silently,
             cc=cc,
@@ -468,6 +484,37 @@ class KibrayEmailService:
             attachments=attachments,
         )
 
+    @staticmethod
+    def _simple_notification_context(subject, message, greeting=None, button_url=None,
+                                     button_text=None, details=None, closing=None) -> dict:
+        return {
+            'subject': subject,
+            'message': message,
+            'greeting': greeting,
+            'button_url': button_url,
+            'button_text': button_text,
+            'details': details,
+            'closing': closing,
+        }
+
+    @classmethod
+    def build_simple_notification(
+        cls,
+        to_emails: list,
+        subject: str,
+        message: str,
+        greeting: Optional[str] = None,
+        button_url: Optional[str] = None,
+        button_text: Optional[str] = None,
+    ) -> EmailMultiAlternatives:
+        """Same email as ``send_simple_notification``, returned unsent."""
+        return cls.build_email(
+            subject,
+            'emails/simple_notification.html',
+            cls._simple_notification_context(subject, message, greeting, button_url, button_text),
+            to_emails,
+        )
+
     @classmethod
     def send_html_email(
         cls,
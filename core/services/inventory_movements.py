@@ -0,0 +1,120 @@
+"""
+Apply many inventory movements against stock at once.
+
+``InventoryMovement.apply()`` does a ``get_or_create`` and a ``save`` on the
+stock row for every movement, plus a low-stock check per ISSUE/CONSUME. A
+field sync of a few hundred movements therefore cost several queries each.
+
+``apply_movements`` runs the same rules over a whole batch:
+
+  * every (item, location) stock row the batch touches is loaded once,
+    locked with ``select_for_update``; missing rows are created together;
+  * movements are replayed in order against those rows in memory, so the
+    negative-inventory rule (Q15.10) sees the running quantity and a failing
+    movement leaves stock untouched;
+  * changed stock rows are written with one ``bulk_update`` and the low-stock
+    alert (Q15.5) is evaluated once per stock row, on its final quantity.
+
+Call it inside ``transaction.atomic()``. Movements may be unsaved: accepted
+ones get ``applied=True`` so ``bulk_create`` stores them as applied.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db.models import Q
+
+from core.services.change_stamps import touch
+
+
+def apply_movements(movements) -> dict[int, str]:
+    """Apply ``movements`` in order; returns ``{position: error}`` for the rejected ones."""
+    from core.models import ProjectInventory
+
+    pending = [(i, m) for i, m in enumerate(movements) if not m.applied]
+    keys = set()
+    for _, movement in pending:
+        for location_id in _locations(movement):
+            keys.add((movement.item_id, location_id))
+    if not keys:
+        return {}
+
+    lookup = Q()
+    for item_id, location_id in keys:
+        lookup |= Q(item_id=item_id, location_id=location_id)
+    stocks = {
+        (s.item_id, s.location_id): s
+        for s in ProjectInventory.objects.select_for_update().filter(lookup)
+    }
+    missing = [ProjectInventory(item_id=i, location_id=loc) for i, loc in keys - stocks.keys()]
+    for stock in ProjectInventory.objects.bulk_create(missing):
+        stocks[(stock.item_id, stock.location_id)] = stock
+
+    errors, changed, drawn = {}, {}, {}
+    for position, movement in pending:
+        error = _replay(movement, stocks, changed, drawn)
+        if error:
+            errors[position] = error
+            continue
+        movement.applied = True
+        if movement.movement_type == "RECEIVE" and movement.unit_cost and movement.to_location_id:
+            movement.item.update_average_cost(movement.unit_cost, movement.quantity)
+
+    if changed:
+        ProjectInventory.objects.bulk_update(list(changed.values()), ["quantity"])
+        touch("core.ProjectInventory")
+    # Q15.5: once per stock row, on its final quantity
+    for stock, movement in drawn.values():
+        movement._check_low_stock_alert(stock)
+    return errors
+
+
+def _locations(movement):
+    kind = movement.movement_type
+    if kind in ("RECEIVE", "RETURN", "ADJUST"):
+        return [movement.to_location_id] if movement.to_location_id else []
+    if kind in ("ISSUE", "CONSUME"):
+        return [movement.from_location_id] if movement.from_location_id else []
+    if kind == "TRANSFER":
+        return [loc for loc in (movement.from_location_id, movement.to_location_id) if loc]
+    return []
+
+
+def _replay(movement, stocks, changed, drawn):
+    """Apply one movement to the in-memory stock rows (same rules as InventoryMovement.apply)."""
+    kind, quantity = movement.movement_type, movement.quantity
+
+    def stock_at(location_id):
+        return stocks[(movement.item_id, location_id)]
+
+    if kind in ("ISSUE", "CONSUME", "TRANSFER") and movement.from_location_id:
+        source = stock_at(movement.from_location_id)
+        if source.quantity < quantity:
+            where = " en origen" if kind == "TRANSFER" else ""
+            return f"Inventario insuficiente{where}: {source.quantity} disponible, {quantity} solicitado"
+
+    if kind in ("RECEIVE", "RETURN") and movement.to_location_id:
+        target = stock_at(movement.to_location_id)
+        target.quantity += quantity
+        changed[target.pk] = target
+    elif kind in ("ISSUE", "CONSUME") and movement.from_location_id:
+        source = stock_at(movement.from_location_id)
+        source.quantity -= quantity
+        changed[source.pk] = source
+        drawn[source.pk] = (source, movement)
+    elif kind == "TRANSFER":
+        if movement.from_location_id:
+            source = stock_at(movement.from_location_id)
+            source.quantity -= quantity
+            changed[source.pk] = source
+        if movement.to_location_id:
+            target = stock_at(movement.to_location_id)
+            target.quantity += quantity
+            changed[target.pk] = target
+    elif kind == "ADJUST" and movement.to_location_id:
+        target = stock_at(movement.to_location_id)
+        # Q15.10: Prevent negative after adjustment
+        target.quantity = max(target.quantity + quantity, Decimal("0"))
+        changed[target.pk] = target
+    return None
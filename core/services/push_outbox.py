@@ -0,0 +1,390 @@
+"""
+Push notification outbox.
+
+Request handlers and signals used to call OneSignal synchronously (one HTTP
+round trip per event) and ``send_pwa_push`` sent one FCM message per device,
+deleting dead subscriptions one by one. Now:
+
+  * ``enqueue_push`` only inserts ``PushOutbox`` rows (one bulk INSERT) and
+    schedules a dispatch after commit, a few seconds later so bursts coalesce;
+  * ``dispatch_pending`` (Celery: ``core.tasks.dispatch_push_outbox``, also on
+    beat every minute) collapses each recipient's pending events into one
+    notification and sends them through the provider batch APIs
+    (OneSignal multi-user requests, FCM ``send_each``);
+  * transient failures are retried with exponential backoff, up to
+    ``MAX_ATTEMPTS``;
+  * FCM tokens reported as unregistered are deleted in one query.
+
+Providers are pluggable per channel (``set_provider``); ``FakePushProvider``
+records what would have been sent, for tests and local development.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+import json
+import logging
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_SECONDS = 5
+DISPATCH_LIMIT = 1000
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+ONESIGNAL_MAX_RECIPIENTS = 2000
+FCM_MAX_MESSAGES = 500
+
+SCHEDULE_KEY = "push_outbox:scheduled"
+DISPATCH_LOCK_KEY = "push_outbox:dispatching"
+DISPATCH_LOCK_TIMEOUT = 300
+
+
+@dataclass
+class PushMessage:
+    """One notification for one recipient (possibly several collapsed outbox rows)."""
+
+    user_id: int
+    title: str
+    body: str
+    url: str = ""
+    data: dict = field(default_factory=dict)
+    outbox_ids: list[int] = field(default_factory=list)
+    tokens: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PushResult:
+    ok: bool
+    error: str = ""
+    # Transient failure: try again later
+    retry: bool = False
+    dead_tokens: list[str] = field(default_factory=list)
+
+
+class PushProvider:
+    """Sends a batch of ``PushMessage`` and returns one ``PushResult`` per message."""
+
+    channel = ""
+    uses_device_tokens = False
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def send(self, messages: list[PushMessage]) -> list[PushResult]:
+        raise NotImplementedError
+
+
+class OneSignalProvider(PushProvider):
+    """OneSignal REST API; recipients of identical content share one request."""
+
+    channel = "onesignal"
+    BASE_URL = "https://onesignal.com/api/v1/notifications"
+
+    def __init__(self):
+        self._session = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "ONESIGNAL_APP_ID", None)) and bool(
+            getattr(settings, "ONESIGNAL_REST_API_KEY", None)
+        )
+
+    def _http(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def send(self, messages):
+        import requests
+
+        groups = defaultdict(list)
+        for index, message in enumerate(messages):
+            key = (message.title, message.body, message.url, json.dumps(message.data, sort_keys=True))
+            groups[key].append(index)
+
+        results: list[Optional[PushResult]] = [None] * len(messages)
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Authorization": f"Basic {settings.ONESIGNAL_REST_API_KEY}",
+        }
+        for (title, body, url, _data), indexes in groups.items():
+            for start in range(0, len(indexes), ONESIGNAL_MAX_RECIPIENTS):
+                chunk = indexes[start : start + ONESIGNAL_MAX_RECIPIENTS]
+                payload = {
+                    "app_id": settings.ONESIGNAL_APP_ID,
+                    "include_external_user_ids": [str(messages[i].user_id) for i in chunk],
+                    "headings": {"en": title},
+                    "contents": {"en": body},
+                    "web_url": url or None,
+                    "data": messages[chunk[0]].data,
+                }
+                try:
+                    response = self._http().post(self.BASE_URL, json=payload, headers=headers, timeout=10)
+                    response.raise_for_status()
+                    result = PushResult(ok=True)
+                except requests.exceptions.RequestException as e:
+                    status = getattr(getattr(e, "response", None), "status_code", None)
+                    # 4xx (other than rate limiting) will not succeed on retry
+                    retry = status is None or status == 429 or status >= 500
+                    result = PushResult(ok=False, error=str(e), retry=retry)
+                for i in chunk:
+                    results[i] = result
+        return results
+
+
+class FCMProvider(PushProvider):
+    """Firebase Cloud Messaging to each PWA subscription, via ``send_each``."""
+
+    channel = "fcm"
+    uses_device_tokens = True
+
+    @property
+    def enabled(self) -> bool:
+        from core.push_notifications import FIREBASE_AVAILABLE
+
+        return FIREBASE_AVAILABLE
+
+    def _build(self, message: PushMessage, token: str):
+        from firebase_admin import messaging
+
+        return messaging.Message(
+            notification=messaging.Notification(title=message.title, body=message.body),
+            data={str(k): str(v) for k, v in message.data.items()},
+            token=token,
+            webpush=messaging.WebpushConfig(
+                headers={"Urgency": "high"},
+                notification=messaging.WebpushNotification(
+                    title=message.title,
+                    body=message.body,
+                    icon="/static/icons/icon-192x192.png",
+                    badge="/static/icons/badge-72x72.png",
+                ),
+                fcm_options=messaging.WebpushFCMOptions(link=message.url) if message.url else None,
+            ),
+        )
+
+    def send(self, messages):
+        from firebase_admin import messaging
+
+        outgoing = [(index, token) for index, m in enumerate(messages) for token in m.tokens]
+        delivered = defaultdict(int)
+        errors = defaultdict(list)
+        dead = defaultdict(list)
+        for start in range(0, len(outgoing), FCM_MAX_MESSAGES):
+            chunk = outgoing[start : start + FCM_MAX_MESSAGES]
+            try:
+                batch = messaging.send_each([self._build(messages[i], token) for i, token in chunk])
+                responses = batch.responses
+            except Exception as e:
+                for i, _token in chunk:
+                    errors[i].append(str(e))
+                continue
+            for (i, token), response in zip(chunk, responses):
+                if response.success:
+                    delivered[i] += 1
+                elif isinstance(response.exception, messaging.UnregisteredError) or (
+                    "not-registered" in str(response.exception).lower()
+                ):
+                    dead[i].append(token)
+                else:
+                    errors[i].append(str(response.exception))
+
+        results = []
+        for index, _message in enumerate(messages):
+            if delivered[index] or not errors[index]:
+                results.append(PushResult(ok=True, dead_tokens=dead[index]))
+            else:
+                results.append(
+                    PushResult(ok=False, error=errors[index][0], retry=True, dead_tokens=dead[index])
+                )
+        return results
+
+
+class FakePushProvider(PushProvider):
+    """Records batches instead of sending them."""
+
+    def __init__(self, channel="onesignal", uses_device_tokens=False, dead_tokens=(), fail_with=None):
+        self.channel = channel
+        self.uses_device_tokens = uses_device_tokens
+        self.dead_tokens = set(dead_tokens)
+        self.fail_with = fail_with
+        self.batches: list[list[PushMessage]] = []
+
+    @property
+    def sent(self) -> list[PushMessage]:
+        return [m for batch in self.batches for m in batch]
+
+    def send(self, messages):
+        self.batches.append(list(messages))
+        if self.fail_with:
+            return [PushResult(ok=False, error=self.fail_with, retry=True) for _ in messages]
+        return [
+            PushResult(ok=True, dead_tokens=[t for t in m.tokens if t in self.dead_tokens])
+            for m in messages
+        ]
+
+
+_providers: dict[str, PushProvider] = {
+    OneSignalProvider.channel: OneSignalProvider(),
+    FCMProvider.channel: FCMProvider(),
+}
+
+
+def get_provider(channel: str) -> PushProvider:
+    return _providers[channel]
+
+
+def set_provider(channel: str, provider: PushProvider) -> PushProvider:
+    """Swap the provider of ``channel``; returns the previous one."""
+    previous = _providers.get(channel)
+    _providers[channel] = provider
+    return previous
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+
+
+def enqueue_push(user_ids, title, body="", url=None, data=None, channel="onesignal") -> int:
+    """Queue one notification per recipient; never contacts the provider."""
+    from core.models import PushOutbox
+
+    if not get_provider(channel).enabled:
+        logger.warning(f"{channel} push not configured. Skipping push notification.")
+        return 0
+
+    rows = [
+        PushOutbox(user_id=uid, channel=channel, title=title, body=body or "", url=url or "", data=data or {})
+        for uid in dict.fromkeys(user_ids)
+        if uid
+    ]
+    if not rows:
+        return 0
+    PushOutbox.objects.bulk_create(rows)
+    transaction.on_commit(_schedule_dispatch)
+    return len(rows)
+
+
+def _schedule_dispatch():
+    # One delayed dispatch per window collects the whole burst
+    if not cache.add(SCHEDULE_KEY, 1, BATCH_WINDOW_SECONDS):
+        return
+    try:
+        from core.tasks import dispatch_push_outbox
+
+        dispatch_push_outbox.apply_async(countdown=BATCH_WINDOW_SECONDS)
+    except Exception as e:
+        # The beat schedule picks the rows up within a minute
+        logger.warning(f"Could not schedule push dispatch: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Dispatcher
+# ---------------------------------------------------------------------------
+
+
+def _collapse(user_id, rows) -> PushMessage:
+    """One message for all pending events of one recipient."""
+    ids = [row.id for row in rows]
+    if len(rows) == 1:
+        row = rows[0]
+        return PushMessage(user_id, row.title, row.body, row.url, row.data, ids)
+    latest = rows[-1]
+    return PushMessage(
+        user_id,
+        f"You have {len(rows)} new notifications",
+        "\n".join(row.title for row in reversed(rows[-5:])),
+        latest.url,
+        {"type": "digest", "count": len(rows)},
+        ids,
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def dispatch_pending(limit: int = DISPATCH_LIMIT) -> dict:
+    """Send due outbox rows. Single-flight: concurrent calls return immediately."""
+    if not cache.add(DISPATCH_LOCK_KEY, 1, DISPATCH_LOCK_TIMEOUT):
+        return {"skipped": True}
+    try:
+        return _dispatch(limit)
+    finally:
+        cache.delete(DISPATCH_LOCK_KEY)
+
+
+def _dispatch(limit):
+    from core.models import PushOutbox, PushSubscription
+
+    now = timezone.now()
+    rows = list(
+        PushOutbox.objects.filter(status=PushOutbox.STATUS_PENDING, next_attempt_at__lte=now).order_by("id")[
+            :limit
+        ]
+    )
+    summary = {"sent": 0, "retried": 0, "failed": 0, "pruned": 0, "more": len(rows) == limit}
+    if not rows:
+        return summary
+
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[(row.channel, row.user_id)].append(row)
+    by_id = {row.id: row for row in rows}
+
+    dead_tokens = set()
+    for channel in {c for c, _ in grouped}:
+        provider = get_provider(channel)
+        messages = [_collapse(uid, rs) for (c, uid), rs in grouped.items() if c == channel]
+        if provider.uses_device_tokens:
+            tokens = defaultdict(list)
+            for user_id, endpoint in PushSubscription.objects.filter(
+                user_id__in=[m.user_id for m in messages]
+            ).values_list("user_id", "endpoint"):
+                tokens[user_id].append(endpoint)
+            for message in messages:
+                message.tokens = tokens[message.user_id]
+
+        try:
+            results = provider.send(messages)
+        except Exception as e:
+            logger.error(f"{channel} push batch failed: {e}")
+            results = [PushResult(ok=False, error=str(e), retry=True) for _ in messages]
+
+        for message, result in zip(messages, results):
+            dead_tokens.update(result.dead_tokens)
+            for row_id in message.outbox_ids:
+                row = by_id[row_id]
+                row.attempts += 1
+                if result.ok:
+                    row.status = PushOutbox.STATUS_SENT
+                    row.sent_at = now
+                    row.last_error = ""
+                    summary["sent"] += 1
+                elif result.retry and row.attempts < MAX_ATTEMPTS:
+                    row.next_attempt_at = now + backoff(row.attempts)
+                    row.last_error = result.error
+                    summary["retried"] += 1
+                else:
+                    row.status = PushOutbox.STATUS_FAILED
+                    row.last_error = result.error
+                    summary["failed"] += 1
+
+    PushOutbox.objects.bulk_update(
+        rows, ["status", "attempts", "next_attempt_at", "last_error", "sent_at"], batch_size=500
+    )
+    if dead_tokens:
+        summary["pruned"], _ = PushSubscription.objects.filter(endpoint__in=dead_tokens).delete()
+    return summary
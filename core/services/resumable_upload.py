@@ -0,0 +1,210 @@
+"""
+Resumable chunked uploads.
+
+Upload state lives in the shared cache (Redis in production), never in a
+worker's memory, so a client can reconnect to a different daphne/gunicorn
+process and carry on. Each accepted chunk is written straight to storage as
+a part object (``upload_parts/<session_id>/<offset>``); nothing is buffered
+beyond the chunk being handled, so memory per upload is bounded by
+``MAX_CHUNK_SIZE`` whatever the file size.
+
+Protocol (shared by the WebSocket ``file_upload`` actions and the HTTP
+``/api/v1/uploads/`` endpoints):
+
+  1. ``start_session`` → ``session_id`` and ``offset = 0``.
+  2. ``append_chunk(session_id, offset, data)``. ``offset`` must equal the
+     last acknowledged offset. A chunk that was already stored (client
+     resent after a dropped ack) is acknowledged again without being
+     written twice; a gap is rejected with the expected offset.
+  3. ``get_session`` returns the acknowledged offset to resume from.
+  4. ``finalize`` streams the parts into the final storage path.
+
+Integrity: every chunk extends a chained SHA-256 digest
+(``sha256(previous_digest + chunk)``). Unlike a plain ``hashlib`` object the
+chain is a short hex string, so it can be persisted with the session and
+continued by whichever worker receives the next chunk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+import uuid
+
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY_PREFIX = "resumable_upload:"
+SESSION_TTL = 24 * 3600  # idle sessions (and their parts) are abandoned after a day
+LOCK_TIMEOUT = 30
+MAX_CHUNK_SIZE = 1024 * 1024  # 1 MB
+PARTS_PREFIX = "upload_parts"
+
+
+class UploadError(Exception):
+    """Raised for protocol violations; ``expected_offset`` tells the client where to resume."""
+
+    def __init__(self, message, expected_offset=None):
+        super().__init__(message)
+        self.expected_offset = expected_offset
+
+
+def _key(session_id):
+    return f"{SESSION_KEY_PREFIX}{session_id}"
+
+
+def _part_name(session_id, offset):
+    return f"{PARTS_PREFIX}/{session_id}/{offset:012d}"
+
+
+def start_session(user_id, filename, file_type, file_size, session_id=None, **meta) -> dict:
+    """Create a new upload session and return its state."""
+    session_id = str(session_id or uuid.uuid4().hex)
+    if ":" in session_id or "/" in session_id or len(session_id) > 100:
+        raise UploadError("Invalid session id")
+    state = {
+        "session_id": session_id,
+        "user_id": user_id,
+        "filename": filename,
+        "file_type": file_type,
+        "file_size": int(file_size),
+        "offset": 0,
+        "parts": [],
+        "digest": "",
+        "created_at": time.time(),
+        "meta": meta,
+    }
+    if not cache.add(_key(session_id), state, SESSION_TTL):
+        raise UploadError("Upload session already exists")
+    return state
+
+
+def get_session(session_id, user_id=None) -> dict | None:
+    """Current state of ``session_id`` (``None`` if unknown, expired or owned by someone else)."""
+    state = cache.get(_key(session_id))
+    if state is None or (user_id is not None and state["user_id"] != user_id):
+        return None
+    return state
+
+
+def progress(state) -> float:
+    total = state["file_size"]
+    return round(state["offset"] / total * 100, 2) if total > 0 else 0
+
+
+def _locked(session_id):
+    lock_key = f"{_key(session_id)}:lock"
+    if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        raise UploadError("Another chunk for this upload is in progress")
+    return lock_key
+
+
+def append_chunk(session_id, offset, data: bytes, user_id=None) -> dict:
+    """Store ``data`` at ``offset`` and return the updated session state."""
+    if len(data) > MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunk too large (max {MAX_CHUNK_SIZE} bytes)")
+    lock_key = _locked(session_id)
+    try:
+        state = get_session(session_id, user_id)
+        if state is None:
+            raise UploadError("Invalid session")
+        offset = int(offset)
+        if offset < state["offset"]:
+            # Already stored: the ack was lost, acknowledge again.
+            return state
+        if offset > state["offset"]:
+            raise UploadError("Unexpected offset", expected_offset=state["offset"])
+        if not data:
+            return state
+        if state["offset"] + len(data) > state["file_size"]:
+            raise UploadError("Chunk exceeds declared file size", expected_offset=state["offset"])
+
+        name = _part_name(session_id, offset)
+        if default_storage.exists(name):
+            # Left over from an attempt whose state update never landed
+            default_storage.delete(name)
+        default_storage.save(name, ContentFile(data))
+
+        state["digest"] = hashlib.sha256(state["digest"].encode() + data).hexdigest()
+        state["parts"].append(name)
+        state["offset"] += len(data)
+        cache.set(_key(session_id), state, SESSION_TTL)
+        return state
+    finally:
+        cache.delete(lock_key)
+
+
+def finalize(session_id, dest_path, user_id=None) -> tuple[str, dict]:
+    """Concatenate the parts of a finished upload into ``dest_path``.
+
+    Returns ``(stored_name, state)``. Parts and session are removed.
+    """
+    lock_key = _locked(session_id)
+    try:
+        state = get_session(session_id, user_id)
+        if state is None:
+            raise UploadError("Invalid session")
+        if state["offset"] != state["file_size"]:
+            raise UploadError(
+                f"Size mismatch: expected {state['file_size']}, got {state['offset']}",
+                expected_offset=state["offset"],
+            )
+        stored = default_storage.save(dest_path, File(_PartsReader(state["parts"]), name=dest_path))
+        _discard(session_id, state)
+        return stored, state
+    finally:
+        cache.delete(lock_key)
+
+
+def cancel(session_id, user_id=None) -> bool:
+    state = get_session(session_id, user_id)
+    if state is None:
+        return False
+    _discard(session_id, state)
+    return True
+
+
+def _discard(session_id, state):
+    for name in state["parts"]:
+        try:
+            default_storage.delete(name)
+        except Exception as exc:
+            logger.warning(f"[resumable_upload] could not delete part {name}: {exc}")
+    cache.delete(_key(session_id))
+
+
+class _PartsReader:
+    """Sequential file-like view over stored parts; holds one part open at a time."""
+
+    def __init__(self, names):
+        self._names = list(names)
+        self._index = 0
+        self._current = None
+
+    def read(self, size=-1):
+        out = bytearray()
+        while self._index < len(self._names) and (size is None or size < 0 or len(out) < size):
+            if self._current is None:
+                self._current = default_storage.open(self._names[self._index], "rb")
+            want = -1 if size is None or size < 0 else size - len(out)
+            data = self._current.read(want)
+            if data:
+                out += data
+                continue
+            self._current.close()
+            self._current = None
+            self._index += 1
+        return bytes(out)
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
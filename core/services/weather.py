@@ -6,6 +6,7 @@ Provides abstraction for weather data fetching with multiple providers
 from abc import ABC, abstractmethod
 from datetime import datetime
 import os
+import threading
 from typing import Any, Optional
 
 from django.utils import timezone
@@ -175,6 +176,8 @@ class WeatherService:
             inst._calls_in_window = 0
             inst._failure_count = 0
             inst._circuit_opened_at = None
+            # get_weather is called from the ingestion thread pool
+            inst._lock = threading.Lock()
         return cls._instance
 
     # -----------------
@@ -203,14 +206,15 @@ class WeatherService:
         return (timezone.now() - fetched_at).total_seconds() > self.CACHE_TTL_SECONDS
 
     def _rate_limit_allow(self) -> bool:
-        now = timezone.now()
-        if (now - self._hour_window_start).total_seconds() >= 3600:
-            self._hour_window_start = now
-            self._calls_in_window = 0
-        if self._calls_in_window < self.MAX_CALLS_PER_HOUR:
-            self._calls_in_window += 1
-            return True
-        return False
+        with self._lock:
+            now = timezone.now()
+            if (now - self._hour_window_start).total_seconds() >= 3600:
+                self._hour_window_start = now
+                self._calls_in_window = 0
+            if self._calls_in_window < self.MAX_CALLS_PER_HOUR:
+                self._calls_in_window += 1
+                return True
+            return False
 
     def _circuit_open(self) -> bool:
         if self._circuit_opened_at is None:
@@ -310,6 +314,12 @@ class WeatherService:
                 }
             raise
 
+    def store(self, latitude: float, longitude: float, raw: dict[str, Any]) -> dict[str, Any]:
+        """Seed the cache with weather fetched elsewhere (e.g. batch ingestion)."""
+        normalized = self._normalize(raw, latitude, longitude)
+        self._cache[self._cache_key(latitude, longitude)] = normalized
+        return normalized
+
     @classmethod
     def configure_for_production(cls):
         """Configure service for production use with OpenWeatherMap"""
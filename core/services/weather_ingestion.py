@@ -0,0 +1,336 @@
+"""
+Weather ingestion engine.
+
+The 5 AM beat tasks used to call Open-Meteo once per active project, one
+blocking ``requests.get`` (10 s timeout) after another, and then call the
+weather provider again once per daily plan. Most projects sit in the same
+few towns, so nearly all of those calls fetched the same forecast.
+
+This module:
+
+  1. groups projects / plans by rounded coordinates (``LOCATION_PRECISION``
+     decimals, ~1 km), so each location is fetched once;
+  2. fetches the unique locations concurrently on a bounded thread pool
+     sharing one pooled ``requests.Session``;
+  3. writes every ``WeatherSnapshot`` with a single bulk upsert and every
+     ``DailyPlan.weather_data`` with a single ``bulk_update``;
+  4. seeds the ``WeatherService`` cache with what it fetched, so later
+     per-plan lookups at the same place are served from memory.
+
+Any ``WeatherProvider`` works as the source (``MockWeatherProvider`` in
+tests); ``OpenMeteoProvider`` is the production default for snapshots.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from django.utils import timezone
+
+from core.services.weather import WeatherProvider, weather_service
+
+logger = logging.getLogger(__name__)
+
+LOCATION_PRECISION = 2
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+
+# Defaults used until project addresses are geocoded
+DEFAULT_PROJECT_COORDINATES = (37.7749, -122.4194)  # San Francisco
+DEFAULT_PLAN_COORDINATES = (40.7128, -74.0060)  # New York
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# WMO Weather interpretation codes (https://open-meteo.com/en/docs#weathervariables)
+WEATHER_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Foggy",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow",
+    73: "Moderate snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Process-wide pooled HTTP session (one connection pool per host)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def location_key(latitude, longitude) -> tuple[float, float]:
+    return (round(float(latitude), LOCATION_PRECISION), round(float(longitude), LOCATION_PRECISION))
+
+
+def project_coordinates(project) -> tuple[float, float]:
+    return (
+        getattr(project, "latitude", None) or DEFAULT_PROJECT_COORDINATES[0],
+        getattr(project, "longitude", None) or DEFAULT_PROJECT_COORDINATES[1],
+    )
+
+
+def _estimate_humidity(precipitation) -> int:
+    # Not provided by the free tier: higher precipitation → higher humidity
+    if precipitation > 5:
+        return 80
+    if precipitation > 1:
+        return 65
+    return 50
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """Open-Meteo daily forecast (free, no API key) over the pooled session."""
+
+    def fetch_daily(self, latitude: float, longitude: float) -> dict:
+        """Today's forecast in ``WeatherSnapshot`` shape. Raises on HTTP errors."""
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "daily": [
+                "temperature_2m_max",
+                "temperature_2m_min",
+                "precipitation_sum",
+                "windspeed_10m_max",
+                "weathercode",
+            ],
+            "timezone": "America/Los_Angeles",
+            "forecast_days": 1,  # Only today
+        }
+        response = get_http_session().get(OPEN_METEO_URL, params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        daily = response.json().get("daily", {})
+
+        precipitation = daily.get("precipitation_sum", [0])[0]
+        wind_speed = daily.get("windspeed_10m_max", [0])[0]
+        weather_code = daily.get("weathercode", [0])[0]
+        return {
+            "temperature_max": daily.get("temperature_2m_max", [None])[0],
+            "temperature_min": daily.get("temperature_2m_min", [None])[0],
+            "conditions_text": WEATHER_CODES.get(weather_code, "Unknown"),
+            "precipitation_mm": precipitation,
+            "wind_kph": wind_speed * 1.60934,
+            "humidity_percent": _estimate_humidity(precipitation),
+            "weather_code": weather_code,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+
+    def get_weather(self, latitude: float, longitude: float, date: Optional[datetime] = None) -> dict:
+        daily = self.fetch_daily(latitude, longitude)
+        return {
+            "temperature": daily["temperature_max"],
+            "condition": daily["conditions_text"],
+            "humidity": daily["humidity_percent"],
+            "wind_speed": daily["wind_kph"],
+            "description": daily["conditions_text"],
+            "icon": None,
+            "provider": "open-meteo",
+            "fetched_at": datetime.now().isoformat(),
+        }
+
+
+def _daily_from_provider(provider, latitude, longitude) -> dict:
+    """Snapshot-shaped data from any provider (``fetch_daily`` or ``get_weather``)."""
+    if hasattr(provider, "fetch_daily"):
+        return provider.fetch_daily(latitude, longitude)
+    raw = provider.get_weather(latitude, longitude)
+    return {
+        "temperature_max": raw.get("temperature"),
+        "temperature_min": raw.get("temperature"),
+        "conditions_text": raw.get("description") or raw.get("condition") or "",
+        "precipitation_mm": 0,
+        "wind_kph": raw.get("wind_speed"),
+        "humidity_percent": raw.get("humidity"),
+        "weather_code": None,
+        "latitude": latitude,
+        "longitude": longitude,
+    }
+
+
+def fetch_locations(
+    locations: dict[tuple, tuple[float, float]], fetch: Callable[[float, float], Any], max_workers: int = MAX_WORKERS
+) -> dict[tuple, tuple[Any, Optional[Exception]]]:
+    """Call ``fetch(lat, lon)`` once per location on a bounded pool.
+
+    ``locations`` maps a location key to the coordinates to query. Returns
+    ``{key: (result, None)}`` or ``{key: (None, exception)}``.
+    """
+
+    def _one(item):
+        key, (lat, lon) = item
+        try:
+            return key, (fetch(lat, lon), None)
+        except Exception as exc:
+            return key, (None, exc)
+
+    if not locations:
+        return {}
+    workers = max(1, min(max_workers, len(locations)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather") as pool:
+        return dict(pool.map(_one, locations.items()))
+
+
+def ingest_project_snapshots(projects, target_date, provider: WeatherProvider = None) -> dict:
+    """Fetch today's weather for ``projects`` and upsert their ``WeatherSnapshot`` rows."""
+    from core.models import WeatherSnapshot
+
+    provider = provider or OpenMeteoProvider()
+    projects = list(projects)
+    groups = defaultdict(list)
+    coords = {}
+    for project in projects:
+        lat, lon = project_coordinates(project)
+        key = location_key(lat, lon)
+        groups[key].append(project)
+        coords.setdefault(key, (lat, lon))
+
+    results = fetch_locations(coords, lambda lat, lon: _daily_from_provider(provider, lat, lon))
+
+    source = "open-meteo"
+    existing = set(
+        WeatherSnapshot.objects.filter(
+            project__in=projects, date=target_date, source=source
+        ).values_list("project_id", flat=True)
+    )
+    rows = []
+    errors = []
+    for key, members in groups.items():
+        data, exc = results[key]
+        if exc is not None:
+            for project in members:
+                logger.error(f"Weather API error for {project.name}: {exc}")
+                errors.append(f"{project.name}: {exc}")
+            continue
+        weather_service.store(data["latitude"], data["longitude"], _as_service_payload(data))
+        for project in members:
+            rows.append(
+                WeatherSnapshot(
+                    project=project,
+                    date=target_date,
+                    source=source,
+                    temperature_max=data["temperature_max"],
+                    temperature_min=data["temperature_min"],
+                    conditions_text=data["conditions_text"],
+                    precipitation_mm=data["precipitation_mm"],
+                    wind_kph=data["wind_kph"],
+                    humidity_percent=data["humidity_percent"],
+                    raw_json=data,
+                    provider_url=(
+                        f"https://open-meteo.com/en/docs?latitude={data['latitude']}"
+                        f"&longitude={data['longitude']}"
+                    ),
+                )
+            )
+
+    if rows:
+        WeatherSnapshot.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["project", "date", "source"],
+            update_fields=[
+                "temperature_max",
+                "temperature_min",
+                "conditions_text",
+                "precipitation_mm",
+                "wind_kph",
+                "humidity_percent",
+                "raw_json",
+                "provider_url",
+                "fetched_at",
+            ],
+        )
+    written = {row.project_id for row in rows}
+    snapshot_ids = dict(
+        WeatherSnapshot.objects.filter(project_id__in=written, date=target_date, source=source).values_list(
+            "project_id", "id"
+        )
+    )
+    return {
+        "created": len(written - existing),
+        "updated": len(written & existing),
+        "locations": len(groups),
+        "errors": errors,
+        "project_snapshot_ids": snapshot_ids,
+    }
+
+
+def _as_service_payload(daily: dict) -> dict:
+    """``WeatherService`` cache entry built from a snapshot-shaped forecast."""
+    return {
+        "temperature": daily["temperature_max"],
+        "condition": daily["conditions_text"],
+        "humidity": daily["humidity_percent"],
+        "wind_speed": daily["wind_kph"],
+        "description": daily["conditions_text"],
+        "provider": "open-meteo",
+    }
+
+
+def refresh_plan_weather(plans, service=None) -> dict:
+    """Fetch weather once per plan location and store it on every plan."""
+    from core.models import DailyPlan
+
+    service = service or weather_service
+    groups = defaultdict(list)
+    coords = {}
+    for plan in plans:
+        lat, lon = plan.weather_coordinates()
+        key = location_key(lat, lon)
+        groups[key].append(plan)
+        coords.setdefault(key, (lat, lon))
+
+    results = fetch_locations(coords, service.get_weather)
+
+    now = timezone.now()
+    updated = []
+    errors = 0
+    for key, members in groups.items():
+        data, exc = results[key]
+        if exc is not None:
+            errors += len(members)
+            logger.error(f"Failed to fetch weather for DailyPlans {[p.id for p in members]}: {exc}")
+            continue
+        for plan in members:
+            plan.weather_data = data
+            plan.weather_fetched_at = now
+            updated.append(plan)
+    if updated:
+        DailyPlan.objects.bulk_update(updated, ["weather_data", "weather_fetched_at"])
+    return {"updated": len(updated), "errors": errors, "locations": len(groups)}
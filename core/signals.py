@@ -10,11 +10,12 @@ Responsabilidades:
 import contextlib
 
 from django.db import models
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.services import change_stamps
 from core.models import Task, TaskImage, TaskStatusChange
 
 
@@ -171,46 +172,39 @@ def send_task_status_notification(task, old_status, new_status):
     Envía notificaciones cuando cambia el status de una tarea.
     Q11.10: "Notificar al creador de la tarea y al PM del proyecto"
     """
-    from core.models import Notification
+    from core.notifications import notify_users
 
-    recipients = set()
+    recipients = []
 
     # 1. Creador de la tarea
-    if task.created_by:
-        recipients.add(task.created_by)
+    if task.created_by_id:
+        recipients.append(task.created_by_id)
 
     # 2. Usuario asignado (si existe y tiene user vinculado)
-    if task.assigned_to and hasattr(task.assigned_to, "user") and task.assigned_to.user:
-        recipients.add(task.assigned_to.user)
+    if task.assigned_to and getattr(task.assigned_to, "user_id", None):
+        recipients.append(task.assigned_to.user_id)
 
     # 3. PMs del proyecto (usuarios con perfil project_manager relacionados al proyecto)
     # Q11.10: Agregar project managers del proyecto
-    if task.project:
+    if task.project_id:
         # Obtener todos los PMs asignados al proyecto a través de ProjectManagerAssignment
-        pm_assignments = task.project.pm_assignments.select_related("pm").all()
-        for assignment in pm_assignments:
-            if assignment.pm:
-                recipients.add(assignment.pm)
+        recipients.extend(task.project.pm_assignments.values_list("pm_id", flat=True))
+
+    # Determinar el tipo de notificación según el nuevo status
+    notif_type = "task_completed" if new_status == "Completed" else "task_assigned"
 
     # Crear notificación para cada destinatario
-    for user in recipients:
+    notify_users(
+        recipients,
+        notification_type=notif_type,
+        title=_("Status Change: {}").format(task.title),
+        message=_('Task "{}" changed from {} to {}').format(task.title, old_status, new_status),
+        link_url=f"/task/{task.pk}/",
+        related_object_type="Task",
+        related_object_id=task.pk,
         # No notificar al usuario que hizo el cambio
-        changed_by = getattr(task, "_changed_by", None)
-        if user == changed_by:
-            continue
-
-        # Determinar el tipo de notificación según el nuevo status
-        notif_type = "task_completed" if new_status == "Completed" else "task_assigned"
-
-        Notification.objects.create(
-            user=user,
-            notification_type=notif_type,
-            title=_("Status Change: {}").format(task.title),
-            message=_('Task "{}" changed from {} to {}').format(task.title, old_status, new_status),
-            link_url=f"/task/{task.pk}/",
-            related_object_type="Task",
-            related_object_id=task.pk,
-        )
+        exclude=[getattr(task, "_changed_by", None)],
+    )
 
 
 # ============================================================================
@@ -239,6 +233,182 @@ def handle_task_image_versioning(sender, instance, created, **kwargs):
         instance.save(update_fields=["is_current"])
 
 
+# ======================================================
+# ACCESS: keep request-scoped principals fresh
+# ======================================================
+# core.access.Principal memoizes accessible project ids per request. Writes
+# to the rows those ids are derived from drop the memo for the affected user,
+# so "grant access, then check it" inside one request never reads stale data.
+
+
+def _invalidate_principal_for(user_id):
+    from core.access import invalidate_principals
+
+    if user_id:
+        invalidate_principals(user_id)
+
+
+@receiver([post_save, post_delete], sender="core.ProjectManagerAssignment")
+def invalidate_pm_principal(sender, instance, **kwargs):
+    _invalidate_principal_for(instance.pm_id)
+
+
+@receiver([post_save, post_delete], sender="core.ClientProjectAccess")
+def invalidate_client_principal(sender, instance, **kwargs):
+    _invalidate_principal_for(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender="core.ResourceAssignment")
+@receiver([post_save, post_delete], sender="core.TimeEntry")
+def invalidate_employee_principal(sender, instance, **kwargs):
+    # Resolving employee -> user would cost a query on every clock-in; the
+    # only live principals are this process's in-flight requests, so just
+    # reset all of them.
+    from core.access import invalidate_principals
+
+    invalidate_principals()
+
+
+# ======================================================
+# PLANNING: crew allocation index
+# ======================================================
+# core.services.crew_allocation caches "who works where" per plan date.
+# Drop the cached index when an activity, its crew or its plan changes.
+
+
+def _plan_date_of(daily_plan_id):
+    from core.models import DailyPlan
+
+    return DailyPlan.objects.filter(pk=daily_plan_id).values_list("plan_date", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender="core.PlannedActivity")
+def invalidate_allocation_for_activity(sender, instance, **kwargs):
+    from core.services.crew_allocation import invalidate_allocation_index
+
+    invalidate_allocation_index(_plan_date_of(instance.daily_plan_id))
+
+
+@receiver(m2m_changed, sender="core.PlannedActivity_assigned_employees")
+def invalidate_allocation_for_crew(sender, instance, action, reverse, pk_set, **kwargs):
+    from core.models import PlannedActivity
+    from core.services.crew_allocation import invalidate_allocation_index
+
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_allocation_index(_plan_date_of(instance.daily_plan_id))
+        return
+    # employee.assigned_activities.<add|remove|clear>(): instance is the Employee
+    if action == "pre_clear":
+        activities = instance.assigned_activities.all()
+    elif action in ("post_add", "post_remove"):
+        activities = PlannedActivity.objects.filter(pk__in=pk_set or ())
+    else:
+        return
+    invalidate_allocation_index(*set(activities.values_list("daily_plan__plan_date", flat=True)))
+
+
+@receiver([post_save, post_delete], sender="core.DailyPlan")
+def invalidate_allocation_for_plan(sender, instance, **kwargs):
+    from core.services.crew_allocation import invalidate_allocation_index
+
+    invalidate_allocation_index(instance.plan_date)
+
+
+# ======================================================
+# SYNC: change log for /api/v1/sync/
+# ======================================================
+# Same transaction as the change, so the log never lists a rolled-back row.
+# bulk_create()/update() send no signals: those call sites use
+# core.services.delta_sync.record_changes() themselves.
+
+
+@receiver(post_save, sender="core.Project")
+@receiver(post_save, sender="core.Task")
+@receiver(post_save, sender="core.DailyPlan")
+@receiver(post_save, sender="core.TouchUp")
+@receiver(post_save, sender="core.Notification")
+def log_sync_upsert(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from core.services.delta_sync import record_change
+
+    record_change(instance)
+
+
+@receiver(post_delete, sender="core.Project")
+@receiver(post_delete, sender="core.Task")
+@receiver(post_delete, sender="core.DailyPlan")
+@receiver(post_delete, sender="core.TouchUp")
+@receiver(post_delete, sender="core.Notification")
+def log_sync_delete(sender, instance, **kwargs):
+    from core.services.delta_sync import record_change
+
+    record_change(instance, deleted=True)
+
+
+# ======================================================
+# API: change stamps for conditional GET (ETag / 304)
+# ======================================================
+
+
+def touch_api_stamp(sender, update_fields=None, **kwargs):
+    # A login only writes last_login, which no payload shows
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    change_stamps.touch(sender._meta.label)
+
+
+for _label in change_stamps.TRACKED_MODELS:
+    post_save.connect(touch_api_stamp, sender=_label, dispatch_uid=f"api_stamp_save:{_label}")
+    post_delete.connect(touch_api_stamp, sender=_label, dispatch_uid=f"api_stamp_delete:{_label}")
+
+
+# ======================================================
+# DASHBOARD: debounced per-project snapshot push
+# ======================================================
+
+
+@receiver(post_save, sender="core.Project")
+@receiver(post_save, sender="core.Income")
+@receiver(post_delete, sender="core.Income")
+@receiver(post_save, sender="core.Expense")
+@receiver(post_delete, sender="core.Expense")
+@receiver(post_save, sender="core.BudgetLine")
+@receiver(post_delete, sender="core.BudgetLine")
+def schedule_dashboard_publish(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from core.services import dashboard_publisher
+
+    project_id = instance.pk if sender._meta.model_name == "project" else instance.project_id
+    dashboard_publisher.schedule(project_id)
+
+
+@receiver(post_save, sender="core.BudgetProgress")
+@receiver(post_delete, sender="core.BudgetProgress")
+def schedule_dashboard_publish_for_progress(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from core.models import BudgetLine
+    from core.services import dashboard_publisher
+
+    project_id = BudgetLine.objects.filter(pk=instance.budget_line_id).values_list("project_id", flat=True).first()
+    dashboard_publisher.schedule(project_id)
+
+
+@receiver(post_save, sender="core.PayrollRecord")
+def schedule_dashboard_publish_for_payroll(sender, instance, raw=False, **kwargs):
+    # Payroll cost reaches the projects listed in project_hours
+    if raw:
+        return
+    from core.services import dashboard_publisher
+
+    for project_id in (instance.project_hours or {}):
+        with contextlib.suppress(TypeError, ValueError):
+            dashboard_publisher.schedule(int(project_id))
+
+
 # ======================================================
 # SECURITY: Single active session per user
 # ======================================================
@@ -246,5 +416,9 @@ def handle_task_image_versioning(sender, instance, created, **kwargs):
 #   - kibray_backend/middleware.py  (SingleSessionMiddleware)
 #   - core/audit.py                (SingleSessionLoginSignal.on_login via user_logged_in signal)
 # These use Profile.active_session_key (DB) as the single source of truth.
-# Do NOT add a second session tracking system here (e.g. Redis cache)
-# as it conflicts with the middleware and causes session invalidation loops.
+# kibray_backend/sessions.py holds a read-through cache of that column; its
+# ONLY writers are SingleSessionMiddleware and the login/logout signal
+# handlers in core/audit.py, which update it together with the profile.
+# Do NOT add a second source of truth here (e.g. an independent session
+# registry or signal handler that writes the cache on its own) as it
+# conflicts with the middleware and causes session invalidation loops.
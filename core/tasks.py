@@ -29,7 +29,7 @@ def check_inventory_shortages():
     from django.contrib.auth import get_user_model
     from django.db.models import Q
 
-    from core.models import InventoryItem, Notification, ProjectInventory
+    from core.models import InventoryItem, ProjectInventory
 
     user_model = get_user_model()
     from datetime import date as _date
@@ -66,6 +66,8 @@ def check_inventory_shortages():
 
     # Send notifications to admins and managers
     if low_stock_items:
+        from core.notifications import notify_users
+
         recipients = user_model.objects.filter(Q(is_staff=True) | Q(is_superuser=True))
 
         # Create summary notification
@@ -79,16 +81,17 @@ def check_inventory_shortages():
         if len(low_stock_items) > 5:
             item_list += f" ... and {len(low_stock_items) - 5} more"
 
-        for user in recipients:
-            Notification.objects.create(
-                user=user,
-                notification_type="task_alert",
-                title=f"Low Inventory Alert: {len(low_stock_items)} items",
-                message=f"Items below threshold: {item_list}",
-                link_url="/inventory/",
-                related_object_type="inventory",
-                related_object_id=None,
-            )
+        notify_users(
+            recipients,
+            notification_type="task_alert",
+            title=f"Low Inventory Alert: {len(low_stock_items)} items",
+            message=f"Items below threshold: {item_list}",
+            link_url="/inventory/",
+            related_object_type="inventory",
+            related_object_id=None,
+            # Manual re-runs the same day do not repeat the alert
+            dedupe_window=timedelta(hours=12),
+        )
 
     logger.info(f"Inventory check: {len(low_stock_items)} items below threshold")
 
@@ -266,147 +269,32 @@ def update_daily_weather_snapshots():
     Creates WeatherSnapshot records using Open-Meteo API.
     Uses project latitude/longitude (from address geocoding) for accuracy.
     Falls back to default coordinates if address is not geocoded.
+
+    Projects are grouped by rounded coordinates: each unique location is
+    fetched once, concurrently over a pooled HTTP session, and all snapshots
+    are written with one bulk upsert (see core.services.weather_ingestion).
     """
     import logging
 
     from django.db.models import Q
-    import requests
 
     from core.models import Project, WeatherSnapshot
+    from core.services.weather_ingestion import ingest_project_snapshots
 
     logger = logging.getLogger(__name__)
 
-    # Compute both local and naive dates
-    local_today = timezone.localdate()
-    date.today()
-    # Use local_today as primary
-    today = local_today
+    today = timezone.localdate()
 
     # Only active projects: no end date or end date in the future
-    active_projects = Project.objects.filter(Q(end_date__isnull=True) | Q(end_date__gte=today))
-
-    snapshots_created = 0
-    snapshots_updated = 0
-    project_snapshot_ids = {}
-    errors = []
+    active_projects = list(Project.objects.filter(Q(end_date__isnull=True) | Q(end_date__gte=today)))
 
-    for project in active_projects:
-        # Fetch weather first; only create/update snapshot on success
-        try:
-            # Get coordinates (default to San Francisco Bay Area if not set)
-            # In production, use geocoding service to convert project.address → lat/lon
-            latitude = getattr(project, "latitude", 37.7749)  # Default: SF
-            longitude = getattr(project, "longitude", -122.4194)
-
-            # Open-Meteo API call (free, no API key required)
-            url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "daily": [
-                    "temperature_2m_max",
-                    "temperature_2m_min",
-                    "precipitation_sum",
-                    "windspeed_10m_max",
-                    "weathercode",
-                ],
-                "timezone": "America/Los_Angeles",
-                "forecast_days": 1,  # Only today
-            }
+    result = ingest_project_snapshots(active_projects, today)
+    errors = result["errors"]
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            api_data = response.json()
-            daily = api_data.get("daily", {})
-
-            # Weather code mapping (WMO Weather interpretation codes)
-            # https://open-meteo.com/en/docs#weathervariables
-            weather_codes = {
-                0: "Clear sky",
-                1: "Mainly clear",
-                2: "Partly cloudy",
-                3: "Overcast",
-                45: "Foggy",
-                48: "Depositing rime fog",
-                51: "Light drizzle",
-                53: "Moderate drizzle",
-                55: "Dense drizzle",
-                61: "Slight rain",
-                63: "Moderate rain",
-                65: "Heavy rain",
-                71: "Slight snow",
-                73: "Moderate snow",
-                75: "Heavy snow",
-                77: "Snow grains",
-                80: "Slight rain showers",
-                81: "Moderate rain showers",
-                82: "Violent rain showers",
-                85: "Slight snow showers",
-                86: "Heavy snow showers",
-                95: "Thunderstorm",
-                96: "Thunderstorm with slight hail",
-                99: "Thunderstorm with heavy hail",
-            }
-
-            # Extract data (indices [0] for today)
-            temp_max = daily.get("temperature_2m_max", [None])[0]
-            temp_min = daily.get("temperature_2m_min", [None])[0]
-            precipitation = daily.get("precipitation_sum", [0])[0]
-            wind_speed = daily.get("windspeed_10m_max", [0])[0]
-            weather_code = daily.get("weathercode", [0])[0]
-
-            conditions_text = weather_codes.get(weather_code, "Unknown")
-
-            # Calculate humidity estimate (not provided by free tier)
-            # Use heuristic: higher precipitation → higher humidity
-            if precipitation > 5:
-                humidity_estimate = 80
-            elif precipitation > 1:
-                humidity_estimate = 65
-            else:
-                humidity_estimate = 50
-
-            weather_data = {
-                "temperature_max": temp_max,
-                "temperature_min": temp_min,
-                "conditions_text": conditions_text,
-                "precipitation_mm": precipitation,
-                "wind_kph": wind_speed * 1.60934,  # Convert km/h to mph (or keep as km/h)
-                "humidity_percent": humidity_estimate,
-                "weather_code": weather_code,
-                "latitude": latitude,
-                "longitude": longitude,
-            }
-        except (requests.RequestException, Exception) as e:
-            logger.error(f"Weather API error for {project.name}: {e}")
-            errors.append(f"{project.name}: {str(e)}")
-            # Skip snapshot creation on API error per tests
-            continue
-
-        # Create or update snapshot for today
-        snapshot, created = WeatherSnapshot.objects.update_or_create(
-            project=project,
-            date=today,
-            source="open-meteo",
-            defaults={
-                "temperature_max": weather_data["temperature_max"],
-                "temperature_min": weather_data["temperature_min"],
-                "conditions_text": weather_data["conditions_text"],
-                "precipitation_mm": weather_data["precipitation_mm"],
-                "wind_kph": weather_data["wind_kph"],
-                "humidity_percent": weather_data["humidity_percent"],
-                "raw_json": weather_data,
-                "provider_url": f"https://open-meteo.com/en/docs?latitude={weather_data['latitude']}&longitude={weather_data['longitude']}",
-            },
-        )
-        project_snapshot_ids[project.id] = snapshot.id
-        if created:
-            snapshots_created += 1
-        else:
-            snapshots_updated += 1
-
-    logger.info(f"Weather snapshots: {snapshots_created} created, {snapshots_updated} updated")
+    logger.info(
+        f"Weather snapshots: {result['created']} created, {result['updated']} updated "
+        f"({result['locations']} locations)"
+    )
     if errors:
         logger.warning(f"Weather fetch errors: {len(errors)} projects failed")
 
@@ -416,12 +304,13 @@ def update_daily_weather_snapshots():
     )
     return {
         "date": str(today),
-        "created": snapshots_created,
-        "updated": snapshots_updated,
-        "total_projects": active_projects.count(),
+        "created": result["created"],
+        "updated": result["updated"],
+        "total_projects": len(active_projects),
+        "locations": result["locations"],
         "errors": errors,
         "snapshot_id": latest_snapshot.id if latest_snapshot else None,
-        "project_snapshot_ids": project_snapshot_ids,
+        "project_snapshot_ids": result["project_snapshot_ids"],
     }
 
 
@@ -516,42 +405,19 @@ def send_pending_notifications():
     Send pending email notifications.
     Runs every hour.
 
-    Finds unsent notifications and sends them via email.
+    Finds unsent notifications and sends them via email: one email per user
+    (a digest when several are pending), all over one SMTP connection per
+    batch, within the hourly EMAIL_HOURLY_LIMIT budget.
     """
-    from core.models import Notification
-    from core.services.email_service import KibrayEmailService
-
-    # Get notifications marked for email but not yet sent
-    pending = Notification.objects.filter(
-        sent_via_email=False,
-        created_at__gte=timezone.now() - timedelta(hours=24),  # Last 24h only
-    ).select_related("user")[:100]  # Batch of 100
+    from core.services.email_delivery import send_pending_notification_emails
 
-    sent_count = 0
-    error_count = 0
+    result = send_pending_notification_emails(since_hours=24)  # Last 24h only
 
-    for notification in pending:
-        try:
-            email_sent = KibrayEmailService.send_simple_notification(
-                to_emails=[notification.user.email],
-                subject=notification.title,
-                message=notification.message,
-                fail_silently=False,
-            )
-
-            if email_sent:
-                notification.sent_via_email = True
-                notification.save(update_fields=["sent_via_email"])
-                sent_count += 1
-            else:
-                error_count += 1
-
-        except Exception as e:
-            logger.error(f"Failed to send email notification {notification.id}: {e}")
-            error_count += 1
-
-    logger.info(f"Sent {sent_count} email notifications, {error_count} errors")
-    return {"sent": sent_count, "errors": error_count}
+    logger.info(
+        f"Sent {result['sent']} email notifications in {result['emails']} emails, "
+        f"{result['errors']} errors, {result['deferred_users']} users deferred"
+    )
+    return result
 
 
 @shared_task(name="core.tasks.update_invoice_statuses")
@@ -597,6 +463,19 @@ def cleanup_old_notifications():
     return {"deleted": deleted_count, "cutoff": str(cutoff)}
 
 
+@shared_task(name="core.tasks.prune_sync_log")
+def prune_sync_log():
+    """
+    Drop delta sync change-log rows past the retention window.
+    Runs daily at 2:15 AM; cursors that old already answer ``reset``.
+    """
+    from core.services import delta_sync
+
+    deleted_count = delta_sync.prune()
+    logger.info(f"Pruned {deleted_count} sync change-log rows")
+    return {"deleted": deleted_count}
+
+
 @shared_task(name="core.tasks.generate_daily_plan_reminders")
 def generate_daily_plan_reminders():
     """
@@ -645,6 +524,7 @@ def update_daily_plans_weather():
     Uses WeatherService with cache, rate limiting, and circuit breaker.
     """
     from core.models import DailyPlan
+    from core.services.weather_ingestion import refresh_plan_weather
 
     now = timezone.now()
     today = now.date()
@@ -655,10 +535,9 @@ def update_daily_plans_weather():
         plan_date__in=[today, tomorrow], status__in=["DRAFT", "PUBLISHED", "IN_PROGRESS"]
     ).select_related("project")
 
-    updated = 0
     skipped_no_address = 0
     skipped_stale = 0
-    errors = 0
+    due = []
 
     for plan in target_plans:
         # Skip if no project address (can't geocode)
@@ -672,17 +551,12 @@ def update_daily_plans_weather():
             if age < 2:  # Skip if fetched within last 2 hours
                 skipped_stale += 1
                 continue
+        due.append(plan)
 
-        # Attempt weather fetch
-        try:
-            plan.fetch_weather()
-            updated += 1
-            logger.info(
-                f"Updated weather for DailyPlan {plan.id} ({plan.project.name}, {plan.plan_date})"
-            )
-        except Exception as e:
-            errors += 1
-            logger.error(f"Failed to fetch weather for DailyPlan {plan.id}: {e}")
+    # One provider call per unique location, saved with a single bulk_update
+    refreshed = refresh_plan_weather(due)
+    updated = refreshed["updated"]
+    errors = refreshed["errors"]
 
     result = {
         "updated": updated,
@@ -1218,6 +1092,81 @@ def process_sop_image(sop_id: int, image_data: str):
         return {"status": "error", "error": str(e)}
 
 
+@shared_task(name="core.tasks.process_site_photo_image", bind=True, max_retries=2, default_retry_delay=30)
+def process_site_photo_image(self, photo_id: int):
+    """
+    Build SitePhoto renditions (thumbnail, medium, WebP) and extract EXIF GPS
+    in a single decode. Queued by ``SitePhoto.save`` after commit so uploads
+    return immediately with ``processing_status="pending"``.
+
+    Args:
+        photo_id: ID of the SitePhoto to process
+    """
+    from core.models import SitePhoto
+    from core.services.image_pipeline import process_site_photo
+
+    try:
+        photo = SitePhoto.objects.get(id=photo_id)
+    except SitePhoto.DoesNotExist:
+        logger.error(f"process_site_photo_image: SitePhoto {photo_id} not found")
+        return {"status": "error", "error": "SitePhoto not found"}
+
+    if not photo.image:
+        SitePhoto.objects.filter(id=photo_id).update(processing_status=SitePhoto.PROCESSING_READY)
+        return {"status": "skipped", "reason": "no_image"}
+
+    SitePhoto.objects.filter(id=photo_id).update(processing_status=SitePhoto.PROCESSING_PROCESSING)
+    try:
+        updates = process_site_photo(photo)
+    except (OSError, ValueError) as e:
+        # Unreadable/corrupt image: retrying will not help.
+        logger.warning(f"process_site_photo_image: cannot decode SitePhoto {photo_id}: {e}")
+        SitePhoto.objects.filter(id=photo_id).update(processing_status=SitePhoto.PROCESSING_FAILED)
+        return {"status": "error", "error": str(e)}
+    except Exception as e:
+        logger.error(f"process_site_photo_image: error processing SitePhoto {photo_id}: {e}")
+        if self.request.retries >= self.max_retries:
+            SitePhoto.objects.filter(id=photo_id).update(processing_status=SitePhoto.PROCESSING_FAILED)
+            return {"status": "error", "error": str(e)}
+        SitePhoto.objects.filter(id=photo_id).update(processing_status=SitePhoto.PROCESSING_PENDING)
+        raise self.retry(exc=e)
+
+    return {"status": "success", "photo_id": photo_id, "updated": sorted(updates)}
+
+
+@shared_task(name="core.tasks.flush_file_download_counts")
+def flush_file_download_counts():
+    """Apply buffered ``ProjectFile.download_count`` increments (see core.services.direct_storage)."""
+    from core.services.direct_storage import flush_download_counts
+
+    updated = flush_download_counts()
+    if updated:
+        logger.info(f"Flushed download counts for {updated} files")
+    return {"status": "ok", "updated": updated}
+
+
+@shared_task(name="core.tasks.dispatch_push_outbox")
+def dispatch_push_outbox():
+    """Send queued push notifications in provider batches (see core.services.push_outbox)."""
+    from core.services.push_outbox import dispatch_pending
+
+    result = dispatch_pending()
+    if result.get("more"):
+        # Backlog larger than one batch: keep draining
+        dispatch_push_outbox.delay()
+    if result.get("sent") or result.get("failed"):
+        logger.info(f"Push outbox: {result}")
+    return result
+
+
+@shared_task(name="core.tasks.publish_project_dashboard")
+def publish_project_dashboard(project_id: int):
+    """Recompute a project's dashboard once and push it to all viewers (see core.services.dashboard_publisher)."""
+    from core.services.dashboard_publisher import publish
+
+    publish(project_id)
+
+
 @shared_task(name="core.tasks.process_changeorder_photos")
 def process_changeorder_photos(changeorder_id: int, photo_data_list: list):
     """
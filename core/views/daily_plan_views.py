@@ -263,9 +263,8 @@ def daily_planning_dashboard(request):
                 "materials_needed": act.materials_needed or [],
                 "materials_checked": act.materials_checked,
                 "material_shortage": act.material_shortage,
-                "assigned_employee_ids": list(
-                    act.assigned_employees.values_list("id", flat=True)
-                ),
+                # .all() reuses the prefetch; values_list() would query per activity
+                "assigned_employee_ids": [e.id for e in act.assigned_employees.all()],
                 "is_group_activity": act.is_group_activity,
             })
 
@@ -302,10 +301,18 @@ def daily_planning_dashboard(request):
         Q(end_date__gte=today) | Q(end_date__isnull=True)
     ).order_by("name")
 
+    # Company-wide crew load for the days being planned (cached index)
+    from core.services.crew_allocation import get_allocation_index
+
+    crew_load = {
+        d.isoformat(): get_allocation_index(d).as_json() for d in (today, today + timedelta(days=1))
+    }
+
     context = {
         "today": today,
         "projects": active_projects,
         "plans_json": json.dumps(plans_json_list, default=str),
+        "crew_load_json": json.dumps(crew_load),
         "plan_dates_json": json.dumps(sorted(plan_dates_set)),
         "employees_json": json.dumps(employees, default=str),
         "plans_by_date": plans_json_list,
@@ -313,6 +313,12 @@ def dashboard_pm(request):
 
     today_plans = DailyPlan.objects.filter(plan_date=today).count()
 
+    # 6. Crew conflicts de hoy (double booking / > 8h, índice cacheado)
+    from core.services.crew_allocation import get_allocation_index
+
+    crew_index = get_allocation_index(today)
+    crew_conflicts = len(set(crew_index.overbooked()) | set(crew_index.double_booked()))
+
     # === MATERIALES PENDIENTES (top 10) ===
     pending_materials_list = (
         MaterialRequest.objects.filter(status__in=["pending", "submitted"])
@@ -440,6 +446,16 @@ def dashboard_pm(request):
                     "category": "approvals",
                 }
             )
+        if crew_conflicts > 0:
+            morning_briefing.append(
+                {
+                    "text": _("%d crew members double-booked or over 8h today") % crew_conflicts,
+                    "severity": "warning",
+                    "action_url": reverse("daily_planning_dashboard"),
+                    "action_label": _("Plan"),
+                    "category": "problems",
+                }
+            )
         if pending_touchups_count > 0:
             morning_briefing.append(
                 {
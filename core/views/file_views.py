@@ -1,4 +1,8 @@
 """File organization & workflow views — extracted from legacy_views.py in Phase 8."""
+import os
+
+from django.views.decorators.csrf import csrf_exempt
+
 from core.views._helpers import *  # noqa: F401, F403
 from core.views._helpers import (
     logger,
@@ -142,19 +146,10 @@ def file_category_create(request, project_id):
     return redirect("project_files", project_id=project_id)
 
 
-@login_required
-@require_POST
-def file_upload(request, project_id, category_id):
-    """Upload a file to a category - Staff only"""
-    from core.forms import ProjectFileForm
+def _resolve_upload_category(project, category_id, user):
+    """Target category of an upload; ``0`` means the project's "Documents" folder."""
     from core.models import FileCategory
 
-    # Security: Only staff can upload files
-    if not request.user.is_staff:
-        return JsonResponse({"error": gettext("You don't have permission to upload files")}, status=403)
-
-    project = get_object_or_404(Project, id=project_id)
-    
     # Si category_id es 0, usar la categoría "Documents" por defecto
     if category_id == 0:
         category = FileCategory.objects.filter(
@@ -169,10 +164,24 @@ def file_upload(request, project_id, category_id):
                 category_type="documents",
                 icon="bi-file-earmark-text",
                 color="info",
-                created_by=request.user,
+                created_by=user,
             )
-    else:
-        category = get_object_or_404(FileCategory, id=category_id, project=project)
+        return category
+    return get_object_or_404(FileCategory, id=category_id, project=project)
+
+
+@login_required
+@require_POST
+def file_upload(request, project_id, category_id):
+    """Upload a file to a category - Staff only"""
+    from core.forms import ProjectFileForm
+
+    # Security: Only staff can upload files
+    if not request.user.is_staff:
+        return JsonResponse({"error": gettext("You don't have permission to upload files")}, status=403)
+
+    project = get_object_or_404(Project, id=project_id)
+    category = _resolve_upload_category(project, category_id, request.user)
 
     form = ProjectFileForm(request.POST, request.FILES)
     if form.is_valid():
@@ -193,6 +202,88 @@ def file_upload(request, project_id, category_id):
     return redirect("project_files", project_id=project_id)
 
 
+@login_required
+@require_POST
+def file_upload_init(request, project_id, category_id):
+    """Start a direct-to-storage upload - Staff only.
+
+    Body (JSON): ``{"filename", "content_type", "size"}``. Returns the PUT
+    target from ``core.services.direct_storage.presigned_upload``; the
+    client then calls ``file_upload_complete`` with the returned token.
+    """
+    from core.services import direct_storage
+
+    if not request.user.is_staff:
+        return JsonResponse({"error": gettext("You don't have permission to upload files")}, status=403)
+
+    project = get_object_or_404(Project, id=project_id)
+    category = _resolve_upload_category(project, category_id, request.user)
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    filename = (payload.get("filename") or "").strip()
+    if not filename:
+        return JsonResponse({"error": "filename is required"}, status=400)
+    try:
+        size = int(payload.get("size") or 0)
+    except (TypeError, ValueError):
+        size = 0
+    if size > direct_storage.upload_max_bytes():
+        return JsonResponse({"error": "File too large"}, status=413)
+
+    key = direct_storage.build_upload_key(timezone.now().strftime("project_files/%Y/%m"), filename)
+    upload = direct_storage.presigned_upload(
+        key,
+        content_type=payload.get("content_type") or "application/octet-stream",
+        meta={"p": project.id, "c": category.id, "u": request.user.id, "f": filename},
+    )
+    return JsonResponse(upload)
+
+
+@login_required
+@require_POST
+def file_upload_complete(request):
+    """Completion callback of a direct upload: create the ``ProjectFile`` row.
+
+    Body (JSON): ``{"token", "name", "description", "tags", "is_public", "version"}``.
+    """
+    from core.models import FileCategory, ProjectFile
+    from core.services import direct_storage
+
+    if not request.user.is_staff:
+        return JsonResponse({"error": gettext("You don't have permission to upload files")}, status=403)
+    try:
+        payload = json.loads(request.body or b"{}")
+        data = direct_storage.load_upload_token(payload.get("token") or "")
+    except (ValueError, signing.BadSignature):
+        return JsonResponse({"error": "Invalid or expired upload token"}, status=400)
+    if data.get("u") != request.user.id:
+        return JsonResponse({"error": gettext("Permission denied")}, status=403)
+
+    key = data["k"]
+    from django.core.files.storage import default_storage
+
+    if not default_storage.exists(key):
+        return JsonResponse({"error": "Upload not found in storage"}, status=409)
+
+    category = get_object_or_404(FileCategory, id=data["c"], project_id=data["p"])
+    file_obj = ProjectFile(
+        project_id=data["p"],
+        category=category,
+        uploaded_by=request.user,
+        name=(payload.get("name") or data["f"])[:255],
+        description=payload.get("description") or "",
+        tags=(payload.get("tags") or "")[:255],
+        is_public=bool(payload.get("is_public")),
+        version=(payload.get("version") or "")[:20],
+    )
+    file_obj.file.name = key
+    file_obj.save()
+    return JsonResponse({"id": file_obj.id, "name": file_obj.name, "file_size": file_obj.file_size}, status=201)
+
+
 @login_required
 @require_POST
 def file_delete(request, file_id):
@@ -221,8 +312,7 @@ def file_delete(request, file_id):
 def file_download(request, file_id):
     """Download a file"""
     from core.models import ProjectFile
-    from django.http import FileResponse
-    import mimetypes
+    from core.services import direct_storage
 
     file_obj = get_object_or_404(ProjectFile, id=file_id)
 
@@ -249,26 +339,13 @@ def file_download(request, file_id):
         if not (has_access or is_project_client):
             return HttpResponseForbidden("You don't have access to this project")
 
-    # Serve file
+    # Serve file: redirect to storage instead of streaming through a worker
     if file_obj.file:
         try:
-            # Increment download counter
-            file_obj.download_count = (file_obj.download_count or 0) + 1
-            file_obj.save(update_fields=['download_count'])
-            
-            # Get content type
-            content_type, __ = mimetypes.guess_type(file_obj.name)
-            if not content_type:
-                content_type = "application/octet-stream"
-            
-            # Use FileResponse for better handling (works with S3 and local)
-            response = FileResponse(
-                file_obj.file.open('rb'),
-                content_type=content_type,
-                as_attachment=True,
-                filename=file_obj.name
-            )
-            return response
+            if not file_obj.file.storage.exists(file_obj.file.name):
+                raise FileNotFoundError(file_obj.file.name)
+            direct_storage.record_download(file_obj.id)
+            return redirect(direct_storage.presigned_download_url(file_obj.file, file_obj.name))
         except (FileNotFoundError, OSError, ValueError) as exc:
             # File doesn't exist on disk (ephemeral storage on Railway, file
             # deleted, etc.) - try to regenerate if it's a signed document.
@@ -761,6 +838,7 @@ def file_public_view(request, token):
 def file_public_download(request, token):
     """Download a shared file - no login required"""
     from core.models import ProjectFile
+    from core.services import direct_storage
 
     # Find file by token
     file_obj = get_object_or_404(ProjectFile, share_token=token, is_shared=True)
@@ -769,19 +847,57 @@ def file_public_download(request, token):
     if file_obj.share_expires and file_obj.share_expires < timezone.now():
         return HttpResponseForbidden(gettext("Este link ha expirado"))
     
-    # Increment download count
-    file_obj.download_count += 1
-    file_obj.save(update_fields=["download_count"])
-    
     # Serve file
     if file_obj.file:
-        response = HttpResponse(file_obj.file, content_type="application/octet-stream")
-        response["Content-Disposition"] = f'attachment; filename="{file_obj.name}"'
-        return response
+        direct_storage.record_download(file_obj.id)
+        return redirect(direct_storage.presigned_download_url(file_obj.file, file_obj.name))
     
     return HttpResponseNotFound(gettext("Archivo no encontrado"))
 
 
+def storage_signed_download(request, token):
+    """Local-storage stand-in for a presigned GET URL (see ``core.services.direct_storage``)."""
+    from django.core.files.storage import default_storage
+    from django.http import FileResponse
+
+    from core.services import direct_storage
+
+    try:
+        data = direct_storage.load_download_token(token)
+    except signing.BadSignature:
+        return HttpResponseForbidden(gettext("Este link ha expirado"))
+    try:
+        fh = default_storage.open(data["n"], "rb")
+    except (FileNotFoundError, OSError):
+        return HttpResponseNotFound(gettext("Archivo no encontrado"))
+    return FileResponse(fh, as_attachment=True, filename=data["f"])
+
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+def storage_signed_upload(request, token):
+    """Local-storage stand-in for a presigned PUT URL (see ``core.services.direct_storage``)."""
+    from django.core.files import File
+    from django.core.files.storage import default_storage
+
+    from core.services import direct_storage
+
+    try:
+        data = direct_storage.load_upload_token(token)
+    except signing.BadSignature:
+        return HttpResponseForbidden(gettext("Este link ha expirado"))
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    if length > direct_storage.upload_max_bytes():
+        return HttpResponse(status=413)
+    if default_storage.exists(data["k"]):
+        return HttpResponse(status=409)
+    default_storage.save(data["k"], File(request, name=os.path.basename(data["k"])))
+    return HttpResponse(status=200)
+
+
 @login_required
 @require_POST
 def folder_generate_share_link(request, category_id):
@@ -2,7 +2,8 @@
 WebSocket File Attachment System for Kibray
 
 Handles file uploads through WebSocket connections:
-- Chunked file upload
+- Chunked, resumable file upload (state shared across workers, see
+  core.services.resumable_upload)
 - Progress tracking
 - File validation
 - Thumbnail generation
@@ -10,7 +11,6 @@ Handles file uploads through WebSocket connections:
 """
 
 from datetime import datetime
-import hashlib
 import io
 import os
 
@@ -19,13 +19,15 @@ from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from PIL import Image
 
+from core.services import resumable_upload
+
 
 class FileAttachmentHandler:
     """
     Handler for file attachments in WebSocket messages.
 
     Features:
-    - Chunked upload support
+    - Chunked, resumable upload support
     - File type validation
     - Size limits
     - Virus scanning integration
@@ -51,9 +53,6 @@ class FileAttachmentHandler:
     # Thumbnail settings
     THUMBNAIL_SIZE = (300, 300)
 
-    def __init__(self):
-        self.upload_sessions = {}  # {session_id: {chunks: [], metadata: {}}}
-
     def validate_file_metadata(self, filename, file_type, file_size):
         """
         Validate file metadata before upload.
@@ -88,16 +87,20 @@ class FileAttachmentHandler:
 
         return True, None
 
-    def start_upload_session(self, session_id, metadata):
+    def start_upload_session(self, session_id, metadata, user_id=None):
         """
         Start a new file upload session.
 
+        Session state is kept in the shared cache by
+        ``core.services.resumable_upload``, so chunks may arrive on any worker.
+
         Args:
             session_id: Unique session identifier
             metadata: File metadata (filename, size, type, etc.)
+            user_id: Owner of the upload
 
         Returns:
-            bool: Success
+            tuple: (success, error_message)
         """
         # Validate metadata
         is_valid, error = self.validate_file_metadata(
@@ -107,34 +110,35 @@ class FileAttachmentHandler:
         if not is_valid:
             return False, error
 
-        # Create session
-        self.upload_sessions[session_id] = {
-            "chunks": [],
-            "metadata": metadata,
-            "started_at": datetime.now(),
-            "bytes_received": 0,
-        }
+        try:
+            resumable_upload.start_session(
+                user_id,
+                metadata["filename"],
+                metadata["file_type"],
+                metadata["file_size"],
+                session_id=session_id,
+                channel_id=metadata.get("channel_id"),
+            )
+        except resumable_upload.UploadError as e:
+            return False, str(e)
 
         return True, None
 
-    def add_chunk(self, session_id, chunk_data, chunk_index):
+    def add_chunk(self, session_id, chunk_data, chunk_index=None, offset=None, user_id=None):
         """
         Add a chunk to upload session.
 
         Args:
             session_id: Session identifier
             chunk_data: Base64 encoded chunk data
-            chunk_index: Chunk sequence number
+            chunk_index: Chunk sequence number (informational)
+            offset: Byte offset of the chunk; ``None`` appends at the last
+                acknowledged offset (clients that predate resumable uploads)
+            user_id: Owner of the upload
 
         Returns:
-            tuple: (success, progress_percent)
+            tuple: (success, progress_percent or error_message)
         """
-        if session_id not in self.upload_sessions:
-            return False, "Invalid session"
-
-        session = self.upload_sessions[session_id]
-
-        # Decode chunk
         import base64
 
         try:
@@ -142,62 +146,55 @@ class FileAttachmentHandler:
         except Exception as e:
             return False, f"Invalid chunk data: {e}"
 
-        # Store chunk
-        session["chunks"].append(
-            {
-                "index": chunk_index,
-                "data": chunk_bytes,
-            }
-        )
-
-        session["bytes_received"] += len(chunk_bytes)
+        if offset is None:
+            state = resumable_upload.get_session(session_id, user_id)
+            if state is None:
+                return False, "Invalid session"
+            offset = state["offset"]
 
-        # Calculate progress
-        total_size = session["metadata"]["file_size"]
-        progress = (session["bytes_received"] / total_size) * 100 if total_size > 0 else 0
+        try:
+            state = resumable_upload.append_chunk(session_id, offset, chunk_bytes, user_id=user_id)
+        except resumable_upload.UploadError as e:
+            return False, str(e)
 
-        return True, round(progress, 2)
+        return True, resumable_upload.progress(state)
 
     def complete_upload(self, session_id, user, channel_id):
         """
         Complete file upload and save to storage.
 
+        Parts are streamed into the final file; the upload is never held in
+        memory as a whole.
+
         Args:
             session_id: Session identifier
             user: User uploading file
             channel_id: Chat channel ID
 
         Returns:
-            tuple: (file_attachment_id, file_url, thumbnail_url)
+            tuple: (file_attachment_id, file_url, thumbnail_url); on failure
+            ``(None, error_message, None)``
         """
-        if session_id not in self.upload_sessions:
-            return None, "Invalid session"
-
-        session = self.upload_sessions[session_id]
-
-        # Combine chunks
-        chunks = sorted(session["chunks"], key=lambda x: x["index"])
-        file_data = b"".join(chunk["data"] for chunk in chunks)
-
-        # Verify size
-        expected_size = session["metadata"]["file_size"]
-        if len(file_data) != expected_size:
-            return None, f"Size mismatch: expected {expected_size}, got {len(file_data)}"
+        state = resumable_upload.get_session(session_id, user.id)
+        if state is None:
+            return None, "Invalid session", None
 
         # Generate filename
-        original_filename = session["metadata"]["filename"]
-        file_hash = hashlib.sha256(file_data).hexdigest()[:12]
+        original_filename = state["filename"]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_filename = f"{timestamp}_{file_hash}_{original_filename}"
-
-        # Save file
+        safe_filename = f"{timestamp}_{state['digest'][:12]}_{os.path.basename(original_filename)}"
         file_path = f"chat_attachments/{channel_id}/{safe_filename}"
-        file_url = default_storage.save(file_path, ContentFile(file_data))
+
+        try:
+            file_url, state = resumable_upload.finalize(session_id, file_path, user_id=user.id)
+        except resumable_upload.UploadError as e:
+            return None, str(e), None
 
         # Generate thumbnail for images
         thumbnail_url = None
-        if session["metadata"]["file_type"] in self.ALLOWED_IMAGE_TYPES:
-            thumbnail_url = self._generate_thumbnail(file_data, file_path)
+        if state["file_type"] in self.ALLOWED_IMAGE_TYPES:
+            with default_storage.open(file_url, "rb") as fh:
+                thumbnail_url = self._generate_thumbnail(fh, file_url)
 
         # Create database record
         attachment = self._create_attachment_record(
@@ -205,22 +202,20 @@ class FileAttachmentHandler:
             channel_id=channel_id,
             filename=original_filename,
             file_path=file_url,
-            file_type=session["metadata"]["file_type"],
-            file_size=len(file_data),
+            file_type=state["file_type"],
+            file_size=state["file_size"],
             thumbnail_path=thumbnail_url,
+            upload_session_id=session_id,
         )
 
-        # Cleanup session
-        del self.upload_sessions[session_id]
-
         return attachment.id, file_url, thumbnail_url
 
-    def _generate_thumbnail(self, image_data, original_path):
+    def _generate_thumbnail(self, image_file, original_path):
         """
         Generate thumbnail for image.
 
         Args:
-            image_data: Image bytes
+            image_file: Open binary file (or bytes) of the stored image
             original_path: Path to original image
 
         Returns:
@@ -228,7 +223,9 @@ class FileAttachmentHandler:
         """
         try:
             # Open image
-            image = Image.open(io.BytesIO(image_data))
+            if isinstance(image_file, bytes):
+                image_file = io.BytesIO(image_file)
+            image = Image.open(image_file)
 
             # Convert RGBA to RGB if needed
             if image.mode == "RGBA":
@@ -258,9 +255,8 @@ class FileAttachmentHandler:
             logger.error(f"Failed to generate thumbnail: {e}")
             return None
 
-    @database_sync_to_async
     def _create_attachment_record(
-        self, user, channel_id, filename, file_path, file_type, file_size, thumbnail_path
+        self, user, channel_id, filename, file_path, file_type, file_size, thumbnail_path, upload_session_id=""
     ):
         """
         Create FileAttachment database record.
@@ -273,6 +269,7 @@ class FileAttachmentHandler:
             file_type: MIME type
             file_size: Size in bytes
             thumbnail_path: Thumbnail path (optional)
+            upload_session_id: Resumable upload session the file came from
 
         Returns:
             FileAttachment: Created record
@@ -288,39 +285,38 @@ class FileAttachmentHandler:
             file_path=file_path,
             file_type=file_type,
             file_size=file_size,
+            file_category="image" if file_type in self.ALLOWED_IMAGE_TYPES else "document",
             thumbnail_path=thumbnail_path,
+            upload_session_id=upload_session_id or "",
         )
 
         return attachment
 
-    def cancel_upload(self, session_id):
-        """Cancel an upload session"""
-        if session_id in self.upload_sessions:
-            del self.upload_sessions[session_id]
-            return True
-        return False
+    def cancel_upload(self, session_id, user_id=None):
+        """Cancel an upload session and drop its stored parts"""
+        return resumable_upload.cancel(session_id, user_id)
 
-    def get_session_progress(self, session_id):
+    def get_session_progress(self, session_id, user_id=None):
         """
         Get upload progress for session.
 
+        ``offset`` is the last acknowledged byte offset a client resumes from.
+
         Returns:
             dict: Progress information
         """
-        if session_id not in self.upload_sessions:
+        state = resumable_upload.get_session(session_id, user_id)
+        if state is None:
             return None
 
-        session = self.upload_sessions[session_id]
-        total_size = session["metadata"]["file_size"]
-        bytes_received = session["bytes_received"]
-
         return {
             "session_id": session_id,
-            "filename": session["metadata"]["filename"],
-            "total_size": total_size,
-            "bytes_received": bytes_received,
-            "progress": (bytes_received / total_size * 100) if total_size > 0 else 0,
-            "chunks_received": len(session["chunks"]),
+            "filename": state["filename"],
+            "total_size": state["file_size"],
+            "bytes_received": state["offset"],
+            "offset": state["offset"],
+            "progress": resumable_upload.progress(state),
+            "chunks_received": len(state["parts"]),
         }
 
 
@@ -334,10 +330,14 @@ async def handle_file_upload_message(consumer, data):
 
     Message types:
     - start_upload: Initialize upload session
-    - upload_chunk: Send file chunk
+    - upload_chunk: Send file chunk (``offset`` makes it resumable)
+    - upload_status: Ask for the offset to resume from (e.g. after reconnect)
     - complete_upload: Finalize upload
     - cancel_upload: Cancel upload
 
+    Storage and cache I/O run in a worker thread so the event loop is not
+    blocked while chunks are written.
+
     Args:
         consumer: WebSocket consumer instance
         data: Message data
@@ -345,13 +345,28 @@ async def handle_file_upload_message(consumer, data):
     import json
 
     action = data.get("action")
+    session_id = data.get("session_id")
+    user_id = consumer.user.id
+
+    async def _error(error, **extra):
+        await consumer.send(
+            text_data=json.dumps(
+                {
+                    "type": "upload_error",
+                    "session_id": session_id,
+                    "error": error,
+                    **extra,
+                }
+            )
+        )
 
     if action == "start_upload":
         # Start new upload session
-        session_id = data.get("session_id")
         metadata = data.get("metadata", {})
 
-        success, error = file_handler.start_upload_session(session_id, metadata)
+        success, error = await database_sync_to_async(file_handler.start_upload_session)(
+            session_id, metadata, user_id
+        )
 
         if success:
             await consumer.send(
@@ -359,30 +374,25 @@ async def handle_file_upload_message(consumer, data):
                     {
                         "type": "upload_started",
                         "session_id": session_id,
+                        "offset": 0,
+                        "max_chunk_size": resumable_upload.MAX_CHUNK_SIZE,
                         "message": "Upload session started",
                     }
                 )
             )
         else:
-            await consumer.send(
-                text_data=json.dumps(
-                    {
-                        "type": "upload_error",
-                        "session_id": session_id,
-                        "error": error,
-                    }
-                )
-            )
+            await _error(error)
 
     elif action == "upload_chunk":
         # Receive file chunk
-        session_id = data.get("session_id")
-        chunk_data = data.get("chunk_data")
         chunk_index = data.get("chunk_index")
 
-        success, result = file_handler.add_chunk(session_id, chunk_data, chunk_index)
+        success, result = await database_sync_to_async(file_handler.add_chunk)(
+            session_id, data.get("chunk_data"), chunk_index, data.get("offset"), user_id
+        )
 
         if success:
+            progress = await database_sync_to_async(file_handler.get_session_progress)(session_id, user_id)
             await consumer.send(
                 text_data=json.dumps(
                     {
@@ -390,26 +400,26 @@ async def handle_file_upload_message(consumer, data):
                         "session_id": session_id,
                         "progress": result,
                         "chunk_index": chunk_index,
+                        "offset": progress["offset"] if progress else None,
                     }
                 )
             )
         else:
-            await consumer.send(
-                text_data=json.dumps(
-                    {
-                        "type": "upload_error",
-                        "session_id": session_id,
-                        "error": result,
-                    }
-                )
-            )
+            progress = await database_sync_to_async(file_handler.get_session_progress)(session_id, user_id)
+            await _error(result, offset=progress["offset"] if progress else None)
+
+    elif action == "upload_status":
+        progress = await database_sync_to_async(file_handler.get_session_progress)(session_id, user_id)
+        if progress:
+            await consumer.send(text_data=json.dumps({"type": "upload_status", **progress}))
+        else:
+            await _error("Invalid session")
 
     elif action == "complete_upload":
         # Complete upload
-        session_id = data.get("session_id")
         channel_id = data.get("channel_id")
 
-        attachment_id, file_url, thumbnail_url = file_handler.complete_upload(
+        attachment_id, file_url, thumbnail_url = await database_sync_to_async(file_handler.complete_upload)(
             session_id, consumer.user, channel_id
         )
 
@@ -441,21 +451,11 @@ async def handle_file_upload_message(consumer, data):
                 )
             )
         else:
-            await consumer.send(
-                text_data=json.dumps(
-                    {
-                        "type": "upload_error",
-                        "session_id": session_id,
-                        "error": file_url,  # Error message
-                    }
-                )
-            )
+            await _error(file_url)  # Error message
 
     elif action == "cancel_upload":
         # Cancel upload
-        session_id = data.get("session_id")
-
-        success = file_handler.cancel_upload(session_id)
+        success = await database_sync_to_async(file_handler.cancel_upload)(session_id, user_id)
 
         await consumer.send(
             text_data=json.dumps(
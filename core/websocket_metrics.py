@@ -6,6 +6,7 @@ Collects and tracks real-time metrics for WebSocket connections:
 - Message throughput
 - Latency statistics
 - Error rates
+- Bytes sent per wire format (compression ratios)
 - Connection lifecycle
 """
 
@@ -58,6 +59,11 @@ class WebSocketMetrics:
         self.errors_by_type = defaultdict(int)
         self.last_errors = deque(maxlen=100)
 
+        # Bytes per wire format (core.websocket_wire)
+        self.frames_by_format = defaultdict(
+            lambda: {"frames": 0, "compressed_frames": 0, "payload_bytes": 0, "wire_bytes": 0}
+        )
+
         # Connection lifecycle
         self.connection_durations = deque(maxlen=1000)
         self.connections_created = 0
@@ -192,6 +198,31 @@ class WebSocketMetrics:
             "count": count,
         }
 
+    def frame_sent(self, wire_format: str, payload_bytes: int, wire_bytes: int, compressed: bool):
+        """Record bytes of one outgoing frame before/after compression"""
+        totals = self.frames_by_format[wire_format]
+        totals["frames"] += 1
+        totals["compressed_frames"] += int(compressed)
+        totals["payload_bytes"] += payload_bytes
+        totals["wire_bytes"] += wire_bytes
+
+    def get_bandwidth_stats(self) -> dict:
+        """Get bytes sent per wire format and the resulting compression ratios"""
+        by_format = {}
+        for name, totals in self.frames_by_format.items():
+            by_format[name] = {
+                **totals,
+                "ratio": totals["wire_bytes"] / totals["payload_bytes"] if totals["payload_bytes"] else 1.0,
+            }
+        payload = sum(t["payload_bytes"] for t in by_format.values())
+        wire = sum(t["wire_bytes"] for t in by_format.values())
+        return {
+            "payload_bytes": payload,
+            "wire_bytes": wire,
+            "ratio": wire / payload if payload else 1.0,
+            "by_format": by_format,
+        }
+
     # ============================================================================
     # ERROR TRACKING
     # ============================================================================
@@ -276,6 +307,7 @@ class WebSocketMetrics:
                 "rate_15m": self.get_message_rate(900),
                 "latency": self.get_latency_stats(),
             },
+            "bandwidth": self.get_bandwidth_stats(),
             "errors": self.get_error_stats(),
             "connection_duration": self.get_connection_duration_stats(),
         }
@@ -315,6 +347,11 @@ def track_message_sent(message_type: str, latency_ms: Optional[float] = None):
     metrics.message_sent(message_type, latency_ms)
 
 
+def track_frame_sent(wire_format: str, payload_bytes: int, wire_bytes: int, compressed: bool = False):
+    """Helper to track bytes of an outgoing frame"""
+    metrics.frame_sent(wire_format, payload_bytes, wire_bytes, compressed)
+
+
 def track_error(error_type: str, error_message: str):
     """Helper to track error"""
     metrics.error_occurred(error_type, error_message)
@@ -113,8 +113,10 @@ class MessageCompressionMiddleware(BaseMiddleware):
                     )
 
                     if compression_enabled:
-                        # Message will be compressed by the WebSocket protocol layer
-                        # Just pass through - compression handled automatically
+                        # permessage-deflate is applied by the ASGI server
+                        # (daphne/uvicorn) when it negotiated the extension;
+                        # consumers wanting app-level compression use
+                        # core.websocket_wire.WireFormatMixin
                         pass
 
             # Send message (compressed if applicable)
@@ -136,8 +138,15 @@ def get_compression_stats(scope):
             - enabled: bool - Whether compression is active
             - window_bits: int - Compression window size
             - context_takeover: bool - Context preservation setting
+            - wire_format: str - Format negotiated by a WireFormatMixin consumer
+            - frames / compressed_frames: int - Frames sent, and how many deflated
+            - payload_bytes / wire_bytes: int - Bytes before/after compression
+            - ratio: float - wire_bytes / payload_bytes (1.0 = no saving)
     """
     compression = scope.get("websocket", {}).get("compression", {})
+    wire = scope.get("websocket", {}).get("wire", {})
+    payload_bytes = wire.get("payload_bytes", 0)
+    wire_bytes = wire.get("wire_bytes", 0)
 
     return {
         "enabled": compression.get("enabled", False),
@@ -145,4 +154,10 @@ def get_compression_stats(scope):
         "client_window_bits": compression.get("client_max_window_bits", 15),
         "server_context_takeover": not compression.get("server_no_context_takeover", True),
         "client_context_takeover": not compression.get("client_no_context_takeover", True),
+        "wire_format": wire.get("format", "json"),
+        "frames": wire.get("frames", 0),
+        "compressed_frames": wire.get("compressed_frames", 0),
+        "payload_bytes": payload_bytes,
+        "wire_bytes": wire_bytes,
+        "ratio": wire_bytes / payload_bytes if payload_bytes else 1.0,
     }
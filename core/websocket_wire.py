@@ -0,0 +1,133 @@
+"""
+Negotiated wire formats for WebSocket consumers.
+
+Consumers send every event as JSON text. A consumer that mixes in
+``WireFormatMixin`` lets each client pick a more compact format through the
+WebSocket subprotocol it offers:
+
+    new WebSocket(url, ["kibray.msgpack+deflate", "kibray.json+deflate"])
+
+    subprotocol              frames
+    (none)                   JSON text, exactly as before
+    kibray.json+deflate      binary: 1 header byte + JSON
+    kibray.msgpack           binary: 1 header byte + msgpack
+    kibray.msgpack+deflate   binary: 1 header byte + msgpack
+
+The header byte is ``0x01`` when the body is zlib-compressed (only bodies
+above ``DEFLATE_THRESHOLD`` bytes are: below that deflate costs more than it
+saves) and ``0x00`` otherwise. The server picks the first format in the
+client's list that it supports; clients that offer none keep plain JSON.
+Text frames are always plain JSON (e.g. rate-limit errors sent by shared
+mixins), and client -> server messages stay JSON text.
+
+Bytes before and after compression are counted per connection (see
+``core.websocket_middleware.get_compression_stats``) and per format in
+``core.websocket_metrics``.
+"""
+
+from dataclasses import dataclass
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - ships with channels-redis
+    msgpack = None
+
+from core.websocket_metrics import track_frame_sent
+
+DEFLATE_THRESHOLD = 1024  # bytes; smaller bodies are sent as-is
+DEFLATE_LEVEL = 6
+HEADER_PLAIN = b"\x00"
+HEADER_DEFLATED = b"\x01"
+
+
+@dataclass(frozen=True)
+class WireFormat:
+    name: str
+    subprotocol: str | None
+    encoding: str  # "json" | "msgpack"
+    deflate: bool = False
+
+    def encode(self, content) -> tuple[str | bytes, int, bool]:
+        """``(frame, body size before compression, compressed?)``"""
+        if self.subprotocol is None:
+            text = json.dumps(content)
+            return text, len(text.encode()), False
+        if self.encoding == "msgpack":
+            body = msgpack.packb(content, default=str, use_bin_type=True)
+        else:
+            body = json.dumps(content, separators=(",", ":"), default=str).encode()
+        if self.deflate and len(body) > DEFLATE_THRESHOLD:
+            return HEADER_DEFLATED + zlib.compress(body, DEFLATE_LEVEL), len(body), True
+        return HEADER_PLAIN + body, len(body), False
+
+
+JSON = WireFormat("json", None, "json")
+FORMATS = [JSON, WireFormat("json+deflate", "kibray.json+deflate", "json", deflate=True)]
+if msgpack is not None:
+    FORMATS += [
+        WireFormat("msgpack", "kibray.msgpack", "msgpack"),
+        WireFormat("msgpack+deflate", "kibray.msgpack+deflate", "msgpack", deflate=True),
+    ]
+BY_SUBPROTOCOL = {fmt.subprotocol: fmt for fmt in FORMATS if fmt.subprotocol}
+
+
+def negotiate(offered) -> WireFormat:
+    """First offered subprotocol we support, else plain JSON."""
+    for subprotocol in offered or ():
+        if subprotocol in BY_SUBPROTOCOL:
+            return BY_SUBPROTOCOL[subprotocol]
+    return JSON
+
+
+def decode(frame, wire_format=JSON):
+    """Inverse of ``WireFormat.encode`` (tests and Python clients)."""
+    if isinstance(frame, str):
+        return json.loads(frame)
+    body = zlib.decompress(frame[1:]) if frame[:1] == HEADER_DEFLATED else frame[1:]
+    if wire_format.encoding == "msgpack":
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+class WireFormatMixin:
+    """
+    Send events in the wire format the client negotiated.
+
+    Mix in before ``AsyncWebsocketConsumer`` and send with
+    ``await self.send_event({...})`` instead of
+    ``self.send(text_data=json.dumps({...}))``.
+    """
+
+    wire_format = JSON
+
+    async def accept(self, subprotocol=None, headers=None):
+        if subprotocol is None:
+            self.wire_format = negotiate(self.scope.get("subprotocols"))
+            subprotocol = self.wire_format.subprotocol
+        self.scope.setdefault("websocket", {})["wire"] = {
+            "format": self.wire_format.name,
+            "frames": 0,
+            "compressed_frames": 0,
+            "payload_bytes": 0,
+            "wire_bytes": 0,
+        }
+        await super().accept(subprotocol=subprotocol, headers=headers)
+
+    async def send_event(self, content):
+        frame, payload_bytes, compressed = self.wire_format.encode(content)
+        if isinstance(frame, str):
+            await self.send(text_data=frame)
+            wire_bytes = payload_bytes
+        else:
+            await self.send(bytes_data=frame)
+            wire_bytes = len(frame)
+
+        stats = self.scope.get("websocket", {}).get("wire")
+        if stats is not None:
+            stats["frames"] += 1
+            stats["compressed_frames"] += compressed
+            stats["payload_bytes"] += payload_bytes
+            stats["wire_bytes"] += wire_bytes
+        track_frame_sent(self.wire_format.name, payload_bytes, wire_bytes, compressed)
@@ -76,6 +76,10 @@ app.conf.beat_schedule = {
         "task": "core.tasks.cleanup_old_notifications",
         "schedule": crontab(hour=2, minute=0, day_of_week=0),  # Sunday 02:00
     },
+    "prune-sync-log": {
+        "task": "core.tasks.prune_sync_log",
+        "schedule": crontab(hour=2, minute=15),  # daily 02:15 (delta sync retention)
+    },
     "generate-daily-plan-reminders": {
         "task": "core.tasks.generate_daily_plan_reminders",
         "schedule": crontab(hour=16, minute=0),  # daily 16:00 (afternoon prep)
@@ -100,6 +104,16 @@ app.conf.beat_schedule = {
         "schedule": crontab(hour=3, minute=0, day_of_week=0),  # Sunday 03:00
         "kwargs": {"days": 30},
     },
+    # ---- File downloads ----
+    "flush-file-download-counts": {
+        "task": "core.tasks.flush_file_download_counts",
+        "schedule": 60.0,  # every minute (buffered ProjectFile.download_count)
+    },
+    # ---- Push notifications ----
+    "dispatch-push-outbox": {
+        "task": "core.tasks.dispatch_push_outbox",
+        "schedule": 60.0,  # every minute (retries and anything not dispatched on commit)
+    },
     # ---- Earned Value snapshots (Phase D3) ----
     "generate-daily-ev-snapshots": {
         "task": "core.tasks.generate_daily_ev_snapshots",
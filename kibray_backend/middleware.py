@@ -1,4 +1,3 @@
-from django.contrib.sessions.models import Session
 from django.shortcuts import redirect
 from django.utils import timezone, translation
 
@@ -21,6 +20,28 @@ class LanguageQueryMiddleware:
         return response
 
 
+class PrincipalMiddleware:
+    """
+    Bind a request-scoped ``core.access.Principal`` to the authenticated user.
+
+    Must be placed right AFTER ``AuthenticationMiddleware``. The principal
+    loads the profile once and memoizes role, employee link, accessible
+    project ids and similar lookups, so decorators, nav, context processors
+    and DRF permissions stop re-querying them on every call. Exposed as
+    ``request.principal`` (``None`` for anonymous users).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from core.access import bind_principal
+
+        user = getattr(request, "user", None)
+        request.principal = bind_principal(user) if user is not None else None
+        return self.get_response(request)
+
+
 class UserLanguageMiddleware:
     """
     Activate the authenticated user's preferred language (``Profile.language``)
@@ -55,7 +76,9 @@ class UserLanguageMiddleware:
         if user is not None and getattr(user, "is_authenticated", False):
             lang = None
             try:
-                profile = getattr(user, "profile", None)
+                from core.access import get_principal
+
+                profile = get_principal(user).profile
                 if profile is not None:
                     lang = getattr(profile, "language", None)
             except Exception:
@@ -118,17 +141,33 @@ class SingleSessionMiddleware:
         - If no stored key → store it (first visit after login).
         - If stored key matches → fine, continue.
         - If stored key differs → THIS session is stale, flush it.
+
+        The stored key is read through the active-session cache
+        (``kibray_backend.sessions``), so the common case — the current
+        session is the active one — costs no database query at all. On a
+        cache miss it comes from the request principal's profile, which
+        ``UserLanguageMiddleware`` has already loaded.
         
         Returns True if the session was stale and flushed, False otherwise.
         """
+        from core.access import get_principal
         from core.models import Profile
+        from kibray_backend.sessions import (
+            cache_active_session_key,
+            get_cached_active_session_key,
+            get_session_store_class,
+        )
 
         try:
-            profile = Profile.objects.filter(user=request.user).first()
-            if not profile:
+            user_id = request.user.pk
+            current_session_key = request.session.session_key
+
+            if get_cached_active_session_key(user_id) == current_session_key:
                 return False
 
-            current_session_key = request.session.session_key
+            profile = get_principal(request.user).profile
+            if not profile:
+                return False
             stored_key = profile.active_session_key
 
             # Treat 'None' (string), empty string, and NULL the same
@@ -137,17 +176,17 @@ class SingleSessionMiddleware:
                 Profile.objects.filter(pk=profile.pk).update(
                     active_session_key=current_session_key
                 )
+                profile.active_session_key = current_session_key
+                cache_active_session_key(user_id, current_session_key)
                 return False
             elif stored_key != current_session_key:
                 # A DIFFERENT session is the active one.
                 # Verify the active session actually exists before flushing this one.
-                from django.contrib.sessions.models import Session
-                active_session_exists = Session.objects.filter(
-                    session_key=stored_key
-                ).exists()
-                
+                active_session_exists = get_session_store_class()().exists(stored_key)
+
                 if active_session_exists:
                     # The other session is truly active → flush THIS (old) session
+                    cache_active_session_key(user_id, stored_key)
                     request.session.flush()
                     return True
                 else:
@@ -155,7 +194,8 @@ class SingleSessionMiddleware:
                     Profile.objects.filter(pk=profile.pk).update(
                         active_session_key=current_session_key
                     )
-                    return False
+                    profile.active_session_key = current_session_key
+            cache_active_session_key(user_id, current_session_key)
         except Exception:
             # Never let session enforcement crash the app
             pass
@@ -178,6 +218,7 @@ class SingleSessionLoginSignal:
         and stores the new session key in the user's profile.
         """
         from core.models import Profile
+        from kibray_backend.sessions import cache_active_session_key, get_session_store_class
 
         try:
             # Ensure session is created
@@ -192,14 +233,16 @@ class SingleSessionLoginSignal:
 
             old_session_key = profile.active_session_key
 
-            # Delete the old session from the DB (force logout on other device)
+            # Delete the old session (force logout on other device). Go through
+            # the configured engine so cached copies are evicted as well.
             if old_session_key and old_session_key != new_session_key:
-                Session.objects.filter(session_key=old_session_key).delete()
+                get_session_store_class()().delete(old_session_key)
 
             # Store the new active session
             Profile.objects.filter(pk=profile.pk).update(
                 active_session_key=new_session_key
             )
+            cache_active_session_key(user.pk, new_session_key)
         except Exception:
             # Never let this crash the login flow
             pass
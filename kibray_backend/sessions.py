@@ -0,0 +1,108 @@
+"""
+Session engine and active-session cache.
+
+``SESSION_ENGINE = "kibray_backend.sessions"`` selects a cached-db store that
+coalesces writes: with ``SESSION_SAVE_EVERY_REQUEST = True`` Django would
+otherwise UPDATE the ``django_session`` row on every single request just to
+slide the expiry forward. This store only writes when the session data
+actually changed or when the stored expiry is getting close to its end
+(less than ``SESSION_REFRESH_THRESHOLD`` seconds left). Reads are served from
+the ``SESSION_CACHE_ALIAS`` cache and fall back to the database.
+
+Trade-off: the browser cookie is still re-issued on every response, but the
+server-side expiry only slides forward on those coalesced writes. The
+effective idle timeout is therefore between
+``SESSION_COOKIE_AGE - SESSION_REFRESH_THRESHOLD`` and ``SESSION_COOKIE_AGE``.
+
+The module also owns the per-user "active session key" cache used by
+``SingleSessionMiddleware``. ``Profile.active_session_key`` stays the source
+of truth; the cache is a read-through copy that is written by the same code
+paths that update the profile (login, logout, first request after login).
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Epoch second at which the persisted copy of a session expires. Kept in its
+# own cache key (not in the session dict) so it never shows up in
+# ``session.items()`` or collides with application keys.
+EXPIRES_AT_KEY_PREFIX = "kibray.sessions.expires_at:"
+
+ACTIVE_SESSION_KEY_PREFIX = "single_session:active:"
+ACTIVE_SESSION_CACHE_TIMEOUT = 300  # Bound staleness if an invalidation is missed
+
+
+def get_refresh_threshold():
+    """Seconds of remaining lifetime below which a session is re-saved."""
+    default = settings.SESSION_COOKIE_AGE * 3 // 4
+    return getattr(settings, "SESSION_REFRESH_THRESHOLD", default)
+
+
+class SessionStore(CachedDBStore):
+    """Cached-db session store that skips redundant expiry-only writes."""
+
+    def _expires_at_key(self, session_key):
+        return f"{EXPIRES_AT_KEY_PREFIX}{session_key}"
+
+    def get_persisted_expiry(self):
+        """Epoch second the stored copy expires at, or ``None`` if unknown."""
+        if not self.session_key:
+            return None
+        try:
+            return self._cache.get(self._expires_at_key(self.session_key))
+        except Exception:
+            return None
+
+    def refresh_due(self):
+        expires_at = self.get_persisted_expiry()
+        if not expires_at:
+            # Unknown (cache evicted/unavailable): write once to re-stamp it.
+            return True
+        return expires_at - time.time() < get_refresh_threshold()
+
+    def save(self, must_create=False):
+        if not must_create and self.session_key and not self.modified and not self.refresh_due():
+            # Nothing changed and the stored expiry is still far away: the
+            # cache and DB copies are already correct, skip the write.
+            return
+        super().save(must_create=must_create)
+        age = self.get_expiry_age()
+        try:
+            self._cache.set(self._expires_at_key(self.session_key), int(time.time()) + age, age)
+        except Exception:
+            logger.exception("Error saving session expiry stamp to cache (%s)", self._cache)
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        super().delete(session_key)
+        if session_key:
+            self._cache.delete(self._expires_at_key(session_key))
+
+
+def get_session_store_class():
+    """Return the ``SessionStore`` class of the configured ``SESSION_ENGINE``."""
+    return import_string(f"{settings.SESSION_ENGINE}.SessionStore")
+
+
+def _active_cache():
+    return caches[getattr(settings, "SESSION_CACHE_ALIAS", "default")]
+
+
+def get_cached_active_session_key(user_id):
+    """Cached active session key for ``user_id`` (``None`` on miss)."""
+    return _active_cache().get(f"{ACTIVE_SESSION_KEY_PREFIX}{user_id}")
+
+
+def cache_active_session_key(user_id, session_key):
+    _active_cache().set(f"{ACTIVE_SESSION_KEY_PREFIX}{user_id}", session_key, ACTIVE_SESSION_CACHE_TIMEOUT)
+
+
+def clear_active_session_key(user_id):
+    _active_cache().delete(f"{ACTIVE_SESSION_KEY_PREFIX}{user_id}")
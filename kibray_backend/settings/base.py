@@ -47,6 +47,9 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Request-scoped access principal (core.access.Principal): profile, role
+    # and accessible project ids are loaded once and shared by every layer.
+    "kibray_backend.middleware.PrincipalMiddleware",
     # MUST come AFTER AuthenticationMiddleware: activates request.user.profile.language
     # so per-user English preference is honored on every view (not just the
     # handful that called translation.activate() manually).
@@ -128,7 +131,7 @@ LOGIN_URL = "/login/"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.api.authentication.PrincipalJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
@@ -208,6 +211,8 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 # Celery - Test Configuration
 _running_tests = (
     os.getenv("PYTEST_CURRENT_TEST")
+    # pytest-xdist workers are started without "pytest" in argv
+    or os.getenv("PYTEST_XDIST_WORKER")
     or os.getenv("RUN_TESTS") == "1"
     or any("pytest" in arg or "test" in arg for arg in __import__("sys").argv)
 )
@@ -65,6 +65,8 @@ CSRF_TRUSTED_ORIGINS = [
 # Channel Layers / Cache
 USE_IN_MEMORY_LAYERS = (
     os.getenv("PYTEST_CURRENT_TEST")
+    # pytest-xdist workers are started without "pytest" in argv
+    or os.getenv("PYTEST_XDIST_WORKER")
     or os.getenv("USE_IN_MEMORY_CHANNEL_LAYER") == "1"
     or any("pytest" in arg for arg in sys.argv)
 )
@@ -184,10 +184,18 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 
 # Session Settings — enforce single session & auto-expire
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Cached-db store with write coalescing: reads hit Redis, and the DB row is only
+# rewritten when data changes or fewer than SESSION_REFRESH_THRESHOLD seconds
+# remain (see kibray_backend/sessions.py).
+SESSION_ENGINE = "kibray_backend.sessions"
+SESSION_CACHE_ALIAS = "sessions"
 SESSION_COOKIE_AGE = 28800  # 8 hours (was default 2 weeks — way too long)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Keep session until timeout
-SESSION_SAVE_EVERY_REQUEST = True  # Reset timeout on activity
+SESSION_SAVE_EVERY_REQUEST = True  # Re-issue the cookie on activity (server expiry: see below)
+# The server-side expiry only slides forward once less than 6h of the 8h window
+# is left, so activity resets the timeout at most every ~2h. The effective idle
+# timeout is therefore anywhere from 6h to 8h, not a strict 8h since last request.
+SESSION_REFRESH_THRESHOLD = 21600
 
 # Channel Layers - Redis with connection pooling
 REDIS_URL = os.getenv("REDIS_URL")
@@ -230,7 +238,21 @@ CACHES = {
         "OPTIONS": {
             "MAX_ENTRIES": 1000,
         },
-    }
+    },
+    # Sessions must live in a cache shared by every worker: a per-process
+    # LocMemCache would keep serving sessions that another worker deleted.
+    # IGNORE_EXCEPTIONS turns Redis outages into cache misses (DB fallback).
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL.replace("/0", "/1"),
+        "KEY_PREFIX": "kibray_sessions",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+            "SOCKET_CONNECT_TIMEOUT": 2,
+            "SOCKET_TIMEOUT": 2,
+        },
+    },
 }
 
 # ============================================
@@ -680,6 +680,14 @@ urlpatterns = [
         views.file_upload,
         name="file_upload",
     ),
+    path(
+        "projects/<int:project_id>/files/<int:category_id>/upload/direct/",
+        views.file_upload_init,
+        name="file_upload_init",
+    ),
+    path("files/upload/complete/", views.file_upload_complete, name="file_upload_complete"),
+    path("storage/signed/<str:token>/", views.storage_signed_download, name="storage_signed_download"),
+    path("storage/upload/<str:token>/", views.storage_signed_upload, name="storage_signed_upload"),
     path("files/<int:file_id>/delete/", views.file_delete, name="file_delete"),
     path("files/<int:file_id>/download/", views.file_download, name="file_download"),
     path("files/<int:file_id>/edit/", views.file_edit_metadata, name="file_edit_metadata"),
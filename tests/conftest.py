@@ -52,7 +52,39 @@ def mocker():
     helper.stopall()
 
 
+@pytest.fixture(autouse=True)
+def _isolated_media_root(settings, tmp_path):
+    """Keep test uploads out of the repo's ``media/`` directory."""
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+
+
 def pytest_collection_modifyitems(config, items):
     for item in items:
         if "django_db" not in item.keywords:
             item.add_marker(pytest.mark.django_db)
+
+
+@pytest.fixture
+def assert_constant_queries():
+    """N+1 guard for list endpoints.
+
+    ``check(fetch, grow)`` runs ``fetch()``, lets ``grow()`` add rows, runs
+    ``fetch()`` again and fails if the second call issued more queries than
+    the first. Returns both results so the test can assert they differ.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def check(fetch, grow):
+        with CaptureQueriesContext(connection) as before:
+            first = fetch()
+        grow()
+        with CaptureQueriesContext(connection) as after:
+            second = fetch()
+        assert len(after) == len(before), (
+            f"query count grew with the result size ({len(before)} -> {len(after)}):\n"
+            + "\n".join(q["sql"] for q in after.captured_queries)
+        )
+        return first, second
+
+    return check
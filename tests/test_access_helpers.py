@@ -330,3 +330,91 @@ class TestConvenienceHelpers:
     def test_filter_by_project_access_anonymous(self, projects):
         qs = Project.objects.all()
         assert access.filter_by_project_access(AnonymousUser(), qs).count() == 0
+
+
+class TestPrincipal:
+    def test_unbound_principal_stays_fresh(self, pm_user, projects):
+        p1 = projects[0]
+        assert not access.can_view_project(pm_user, p1)
+        ProjectManagerAssignment.objects.create(project=p1, pm=pm_user)
+        assert access.can_view_project(pm_user, p1)
+        assert list(access.accessible_projects(pm_user)) == [p1]
+
+    def test_bound_principal_resolves_projects_once(self, pm_user, projects):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        p1, p2, _ = projects
+        ProjectManagerAssignment.objects.create(project=p1, pm=pm_user)
+        user = User.objects.get(pk=pm_user.pk)
+        principal = access.bind_principal(user)
+        assert access.get_principal(user) is principal
+        assert principal.accessible_project_ids == frozenset({p1.pk})
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert access.is_pm(user)
+            assert access.can_view_project(user, p1)
+            assert not access.can_view_project(user, p2)
+            assert access.can_edit_project(user, p1) is True
+        # Only can_edit_project's own assignment lookup hits the database.
+        assert len(ctx.captured_queries) == 1
+        assert list(access.accessible_projects(user)) == [p1]
+
+    def test_bound_principal_remembers_missing_profile(self, projects):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        u = User.objects.create_user(username="acc_noprofile", password="x")
+        u.profile.delete()
+        user = User.objects.get(pk=u.pk)
+        access.bind_principal(user)
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(5):
+                assert access.get_role(user) is None
+        assert len(ctx.captured_queries) == 1
+
+    def test_middleware_exposes_principal(self, employee_user):
+        from django.test import RequestFactory
+
+        from kibray_backend.middleware import PrincipalMiddleware
+
+        request = RequestFactory().get("/")
+        request.user = employee_user
+        PrincipalMiddleware(lambda r: None)(request)
+        assert request.principal is access.get_principal(employee_user)
+        assert request.principal.bound
+        assert request.principal.role == access.ROLE_EMPLOYEE
+
+    def test_bound_principal_sees_access_granted_in_same_request(self, pm_user, client_user, projects):
+        p1 = projects[0]
+        pm = User.objects.get(pk=pm_user.pk)
+        access.bind_principal(pm)
+        assert not access.can_view_project(pm, p1)
+        ProjectManagerAssignment.objects.create(project=p1, pm=pm_user)
+        assert access.can_view_project(pm, p1)
+        assert list(access.accessible_projects(pm)) == [p1]
+
+        client_ = User.objects.get(pk=client_user.pk)
+        access.bind_principal(client_)
+        assert access.accessible_projects(client_).count() == 0
+        cpa = ClientProjectAccess.objects.create(user=client_user, project=p1, is_active=True)
+        assert list(access.accessible_projects(client_)) == [p1]
+        cpa.delete()
+        assert access.accessible_projects(client_).count() == 0
+
+    def test_invalidate_clears_memo(self, pm_user, projects):
+        user = User.objects.get(pk=pm_user.pk)
+        principal = access.bind_principal(user)
+        assert principal.accessible_project_ids == frozenset()
+        ProjectManagerAssignment.objects.filter(pm=pm_user).delete()
+        principal._memo["project_ids"] = frozenset({projects[0].pk})
+        principal.invalidate()
+        assert principal.accessible_project_ids == frozenset()
+
+    def test_lazy_request_user_resolves_profile(self, client_user):
+        from django.utils.functional import SimpleLazyObject
+
+        lazy = SimpleLazyObject(lambda: User.objects.get(pk=client_user.pk))
+        access.bind_principal(lazy)
+        assert access.get_role(lazy) == access.ROLE_CLIENT
+        assert access.is_client(lazy)
@@ -0,0 +1,169 @@
+"""
+Annotated serializer counts: list endpoints issue a constant number of queries.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+import pytest
+from rest_framework.test import APIClient
+
+from core.api.serializers import (
+    CostCodeSerializer,
+    FloorPlanSerializer,
+    ProjectSerializer,
+    TaskSerializer,
+)
+from core.models import (
+    ChatChannel,
+    CostCode,
+    DamagePhoto,
+    DamageReport,
+    Expense,
+    FloorPlan,
+    Income,
+    PlanPin,
+    Project,
+    Task,
+    TaskStatusChange,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_superuser(username="annot_admin", password="x", email="a@example.com")
+
+
+@pytest.fixture
+def api(admin):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="Annotated", start_date=date.today())
+
+
+def _image(name="p.png"):
+    return SimpleUploadedFile(name, b"bytes", content_type="image/png")
+
+
+def _results(response):
+    assert response.status_code == 200, response.content
+    data = response.json()
+    return data["results"] if isinstance(data, dict) else data
+
+
+def _floor_plan(project, admin, pins):
+    plan = FloorPlan.objects.create(project=project, name="Level", image=_image())
+    for i in range(pins):
+        PlanPin.objects.create(plan=plan, x=0.1, y=0.1, pin_type="note", title=f"Pin {i}", created_by=admin)
+    PlanPin.objects.create(plan=plan, x=0.2, y=0.2, pin_type="note", title="Moved", created_by=admin, status="pending_migration")
+    return plan
+
+
+def test_floor_plan_list(api, admin, project, assert_constant_queries):
+    _floor_plan(project, admin, pins=1)
+    first, second = assert_constant_queries(
+        lambda: _results(api.get(f"/api/v1/floor-plans/?project={project.id}")),
+        lambda: [_floor_plan(project, admin, pins=3) for _ in range(3)],
+    )
+    assert len(second) == len(first) + 3
+    counts = sorted((p["pin_count"], p["pending_migration_count"]) for p in second)
+    assert counts == [(1, 1)] + [(3, 1)] * 3
+
+
+def test_damage_report_list(api, project, assert_constant_queries):
+    def grow():
+        for i in range(3):
+            report = DamageReport.objects.create(project=project, title=f"Crack {i}")
+            for _ in range(i):
+                DamagePhoto.objects.create(report=report, image=_image())
+
+    DamageReport.objects.create(project=project, title="First")
+    _, reports = assert_constant_queries(
+        lambda: _results(api.get(f"/api/v1/damage-reports/?project={project.id}")), grow
+    )
+    assert sorted(r["photo_count"] for r in reports) == [0, 0, 1, 2]
+
+
+def test_cost_code_list(api, project, assert_constant_queries):
+    def grow():
+        for i in range(3):
+            code = CostCode.objects.create(code=f"CC-{i}", name=f"Code {i}")
+            for _ in range(i):
+                Expense.objects.create(
+                    project=project, project_name=project.name, amount=Decimal("10.50"),
+                    date=date.today(), category="MATERIALES", cost_code=code,
+                )
+
+    CostCode.objects.create(code="CC-X", name="Empty")
+    _, codes = assert_constant_queries(lambda: _results(api.get("/api/v1/cost-codes/")), grow)
+    by_code = {c["code"]: c for c in codes}
+    assert by_code["CC-2"]["expense_count"] == 2
+    assert Decimal(str(by_code["CC-2"]["total_expenses"])) == Decimal("21.00")
+    assert by_code["CC-X"]["expense_count"] == 0
+
+
+def test_chat_channel_list(api, admin, project, assert_constant_queries):
+    def grow():
+        for i in range(3):
+            channel = ChatChannel.objects.create(name=f"Room {i}", project=project)
+            channel.participants.add(*[User.objects.create_user(username=f"chat{i}_{j}") for j in range(i + 1)])
+
+    ChatChannel.objects.create(name="Lobby", project=project).participants.add(admin)
+    _, channels = assert_constant_queries(
+        lambda: _results(api.get(f"/api/v1/chat/channels/?project={project.id}")), grow
+    )
+    by_name = {c["name"]: c for c in channels}
+    assert by_name["Room 2"]["participant_count"] == 3
+    assert len(by_name["Room 2"]["participant_usernames"]) == 3
+
+
+def test_task_and_project_serializers_on_annotated_queryset(project, admin, assert_constant_queries):
+    def grow():
+        for i in range(3):
+            task = Task.objects.create(project=project, title=f"Task {i}")
+            TaskStatusChange.objects.create(task=task, old_status="Completed", new_status="In Progress", changed_by=admin)
+        extra = Project.objects.create(name="Second", start_date=date.today())
+        Income.objects.create(project=extra, project_name=extra.name, amount=Decimal("5"), date=date.today())
+
+    Task.objects.create(project=project, title="Seed")
+
+    def serialize():
+        tasks = TaskSerializer.annotate_queryset(Task.objects.select_related("project", "assigned_to").prefetch_related("dependencies"))
+        projects = ProjectSerializer.annotate_queryset(Project.objects.all())
+        return TaskSerializer(tasks, many=True).data, ProjectSerializer(projects, many=True).data
+
+    _, (tasks, projects) = assert_constant_queries(serialize, grow)
+    assert sorted(t["reopen_events_count"] for t in tasks) == [0, 1, 1, 1]
+    assert {p["name"]: p["income_count"] for p in projects}["Second"] == 1
+    for data in projects:
+        instance = Project.objects.get(pk=data["id"])
+        expected = ProjectSerializer(instance).data  # model-method fallback
+        assert data["profit"] == expected["profit"] == str(instance.profit())
+        assert data["budget_remaining"] == expected["budget_remaining"]
+
+
+def test_fallback_for_instances_outside_an_annotated_queryset(admin, project):
+    plan = _floor_plan(project, admin, pins=2)
+    data = FloorPlanSerializer(FloorPlan.objects.get(pk=plan.pk)).data
+    assert (data["pin_count"], data["pending_migration_count"]) == (2, 1)
+
+    code = CostCode.objects.create(code="CC-F", name="Fallback")
+    Expense.objects.create(
+        project=project, project_name=project.name, amount=Decimal("4.25"),
+        date=date.today(), category="MATERIALES", cost_code=code,
+    )
+    data = CostCodeSerializer(code).data
+    assert data["expense_count"] == 1
+    assert Decimal(str(data["total_expenses"])) == Decimal("4.25")
+
+    task = Task.objects.create(project=project, title="Plain")
+    assert TaskSerializer(task).data["reopen_events_count"] == 0
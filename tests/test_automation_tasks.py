@@ -34,7 +34,7 @@ def test_update_daily_weather_snapshots():
         }
     }
 
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         from core.tasks import update_daily_weather_snapshots
         result = update_daily_weather_snapshots()
 
@@ -0,0 +1,140 @@
+"""
+Bulk write endpoints: one transaction per batch, per-item results.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+import pytest
+from rest_framework.test import APIClient
+
+from core.models import (
+    DailyPlan,
+    Employee,
+    InventoryItem,
+    InventoryLocation,
+    InventoryMovement,
+    PlannedActivity,
+    Project,
+    ProjectInventory,
+    TimeEntry,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_superuser(username="bulk_admin", password="x", email="b@example.com")
+
+
+@pytest.fixture
+def api(admin):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="Bulk", start_date=date.today())
+
+
+@pytest.fixture
+def employee(db):
+    return Employee.objects.create(first_name="Ana", last_name="R", social_security_number="111-11-1111", hourly_rate=Decimal("25"))
+
+
+def _inserts(ctx, table):
+    return sum(1 for q in ctx.captured_queries if q["sql"].startswith(f'INSERT INTO "{table}"'))
+
+
+def test_time_entries_created_in_one_insert(api, project, employee):
+    items = [
+        {"client_id": f"local-{i}", "employee": employee.id, "project": project.id,
+         "date": str(date.today()), "start_time": "07:00", "end_time": "15:00"}
+        for i in range(5)
+    ]
+    items.insert(2, {"client_id": "bad", "employee": employee.id, "date": "not-a-date", "start_time": "07:00"})
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api.post("/api/v1/time-entries/bulk/", items, format="json")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (5, 1)
+    assert _inserts(ctx, "core_timeentry") == 1
+    bad = body["results"][2]
+    assert bad["status"] == "error" and bad["client_id"] == "bad" and "date" in bad["errors"]
+
+    created = {r["client_id"]: r["id"] for r in body["results"] if r["status"] == "created"}
+    entry = TimeEntry.objects.get(pk=created["local-0"])
+    # Derived fields normally filled by save(): 8h shift spanning lunch
+    assert entry.hours_worked == Decimal("7.50")
+    assert entry.cost_rate_snapshot == Decimal("25.00")
+
+
+def test_time_entries_bulk_update(api, project, employee):
+    entries = [
+        TimeEntry.objects.create(employee=employee, project=project, date=date.today(), start_time="08:00")
+        for _ in range(2)
+    ]
+    payload = [{"id": e.id, "end_time": "10:00", "notes": "synced"} for e in entries] + [{"id": 999999, "notes": "x"}]
+
+    body = api.patch("/api/v1/time-entries/bulk/", {"items": payload}, format="json").json()
+
+    assert (body["updated"], body["failed"]) == (2, 1)
+    assert body["results"][2]["errors"] == {"id": ["Not found."]}
+    assert list(TimeEntry.objects.values_list("hours_worked", "notes").distinct()) == [(Decimal("2.00"), "synced")]
+
+
+def test_inventory_movements_apply_stock_once(api, project):
+    warehouse = InventoryLocation.objects.create(name="Warehouse", is_storage=True)
+    item = InventoryItem.objects.create(name="Tape", category="MATERIAL", valuation_method="AVG")
+    base = {"item": item.id}
+    items = [
+        {**base, "movement_type": "RECEIVE", "to_location": warehouse.id, "quantity": "10"},
+        {**base, "movement_type": "CONSUME", "from_location": warehouse.id, "quantity": "4"},
+        {**base, "movement_type": "CONSUME", "from_location": warehouse.id, "quantity": "20"},
+        {**base, "movement_type": "CONSUME", "from_location": warehouse.id, "quantity": "1"},
+    ]
+
+    body = api.post("/api/v1/inventory/movements/bulk/", items, format="json").json()
+
+    assert [r["status"] for r in body["results"]] == ["created", "created", "error", "created"]
+    assert "insuficiente" in body["results"][2]["errors"]["detail"]
+    assert ProjectInventory.objects.get(item=item, location=warehouse).quantity == Decimal("5")
+    assert InventoryMovement.objects.count() == 3
+    assert not InventoryMovement.objects.filter(applied=False).exists()
+
+
+def test_planned_activities_bulk_update_crew(api, project, employee):
+    plan = DailyPlan.objects.create(
+        project=project, plan_date=date.today() - timedelta(days=1), created_by=None,
+        completion_deadline=timezone.now() + timedelta(days=1),
+    )
+    first, second = (PlannedActivity.objects.create(daily_plan=plan, title=t) for t in ("Prime", "Paint"))
+
+    body = api.patch(
+        "/api/v1/planned-activities/bulk/",
+        [{"id": first.id, "status": "COMPLETED", "assigned_employee_ids": [employee.id]},
+         {"id": second.id, "progress_percentage": 50}],
+        format="json",
+    ).json()
+
+    assert body["updated"] == 2
+    first.refresh_from_db()
+    assert first.status == "COMPLETED"
+    assert list(first.assigned_employees.all()) == [employee]
+    assert PlannedActivity.objects.get(pk=second.id).progress_percentage == 50
+
+
+def test_limits_and_unsupported_operations(api):
+    assert api.post("/api/v1/site-photos/bulk/", [{"caption": "x"}], format="json").status_code == 405
+    assert api.post("/api/v1/time-entries/bulk/", [], format="json").status_code == 400
+    too_many = [{}] * 501
+    assert api.post("/api/v1/time-entries/bulk/", too_many, format="json").status_code == 400
@@ -0,0 +1,116 @@
+"""
+Conditional GET: unchanged resources answer 304 without serializing.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+import pytest
+from rest_framework.test import APIClient
+
+from core.api.conditional import ConditionalGetMixin
+from core.api.urls import router
+from core.models import Expense, FloorPlan, PlanPin, Project, Task
+from core.services.change_stamps import TRACKED_MODELS
+
+User = get_user_model()
+
+
+@pytest.fixture
+def admin(db):
+    return User.objects.create_superuser(username="etag_admin", password="x", email="e@example.com")
+
+
+@pytest.fixture
+def api(admin):
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="Conditional", start_date=date.today())
+
+
+@pytest.fixture
+def plan(project, admin):
+    plan = FloorPlan.objects.create(
+        project=project, name="Level 1", image=SimpleUploadedFile("p.png", b"bytes", content_type="image/png")
+    )
+    PlanPin.objects.create(plan=plan, x=0.1, y=0.1, pin_type="note", title="Pin", created_by=admin)
+    return plan
+
+
+def _revalidate(api, url, etag):
+    return api.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+def test_repeat_read_is_304_with_one_query(api, plan, django_assert_max_num_queries):
+    url = "/api/v1/floor-plans/?level=0"
+    first = api.get(url)
+    assert first.status_code == 200
+    assert first["Cache-Control"] == "private, no-cache" and first.has_header("Last-Modified")
+
+    with django_assert_max_num_queries(1):
+        again = _revalidate(api, url, first["ETag"])
+
+    assert again.status_code == 304 and again.content == b""
+    assert again["ETag"] == first["ETag"]
+
+
+def test_nested_and_update_writes_change_the_version(api, admin, plan):
+    url = f"/api/v1/floor-plans/{plan.id}/"
+    etag = api.get(url)["ETag"]
+    PlanPin.objects.create(plan=plan, x=0.5, y=0.5, pin_type="note", title="New", created_by=admin)
+    response = _revalidate(api, url, etag)
+    assert response.status_code == 200 and len(response.json()["pins"]) == 2
+
+    pins_url = f"/api/v1/plan-pins/?plan={plan.id}"
+    etag = api.get(pins_url)["ETag"]
+    # update() sends no signals: the version must change anyway
+    plan.create_new_version(SimpleUploadedFile("v2.png", b"v2", content_type="image/png"), admin)
+    assert _revalidate(api, pins_url, etag).status_code == 200
+
+
+def test_project_progress_follows_task_changes(api, project):
+    task = Task.objects.create(project=project, title="Paint")
+    url = f"/api/v1/projects/{project.id}/"
+    etag = api.get(url)["ETag"]
+    assert _revalidate(api, url, etag).status_code == 304
+
+    task.status = "Completed"
+    task.save()
+    response = _revalidate(api, url, etag)
+    assert response.status_code == 200 and response.json()["progress"] == 100
+
+
+def test_versions_are_per_user_and_per_query(api, plan):
+    url = "/api/v1/floor-plans/"
+    etag = api.get(url)["ETag"]
+    assert _revalidate(api, f"{url}?level=3", etag).status_code == 200
+
+    other = APIClient()
+    other.force_authenticate(User.objects.create_superuser(username="etag_other", password="x", email="o@example.com"))
+    assert _revalidate(other, url, etag).status_code == 200
+
+
+def test_bi_metrics_revalidate_without_queries(api, project, django_assert_num_queries):
+    url = "/api/v1/bi/margins/"
+    etag = api.get(url)["ETag"]
+    with django_assert_num_queries(0):
+        assert _revalidate(api, url, etag).status_code == 304
+
+    Expense.objects.create(project=project, amount=Decimal("10"), project_name="x", date=date.today())
+    assert _revalidate(api, url, etag).status_code == 200
+
+
+def test_conditional_models_are_tracked():
+    for _, viewset, _ in router.registry:
+        if issubclass(viewset, ConditionalGetMixin):
+            assert set(viewset.conditional_models) <= set(TRACKED_MODELS), viewset
+            serializer = getattr(viewset, "serializer_class", None)
+            if serializer is not None:
+                assert serializer.Meta.model._meta.label in TRACKED_MODELS, viewset
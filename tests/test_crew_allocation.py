@@ -0,0 +1,81 @@
+"""
+Company-wide crew allocation index (per plan date) and its consumers.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import DailyPlan, Employee, PlannedActivity, Project
+from core.services.crew_allocation import get_allocation_index
+from core.services.daily_plan_ai import DailyPlanAIAssistant
+
+User = get_user_model()
+
+
+def _plan(project, day, user):
+    return DailyPlan.objects.create(
+        project=project,
+        plan_date=day,
+        created_by=user,
+        completion_deadline=timezone.now() + timedelta(hours=8),
+    )
+
+
+@pytest.fixture
+def setup(db):
+    pm = User.objects.create_user(username="crew_pm", password="x")
+    day = date.today() + timedelta(days=3)
+    emp = Employee.objects.create(
+        first_name="Cesar", last_name="Lopez", social_security_number="111-22-3333", hourly_rate=20
+    )
+    other = Employee.objects.create(
+        first_name="Ana", last_name="Ruiz", social_security_number="111-22-4444", hourly_rate=20
+    )
+    plan_a = _plan(Project.objects.create(name="A", start_date=day), day, pm)
+    plan_b = _plan(Project.objects.create(name="B", start_date=day), day, pm)
+    act_a = PlannedActivity.objects.create(daily_plan=plan_a, title="Paint walls", estimated_hours=6)
+    act_b = PlannedActivity.objects.create(daily_plan=plan_b, title="Install windows", estimated_hours=4)
+    act_a.assigned_employees.add(emp, other)
+    act_b.assigned_employees.add(emp)
+    return {"day": day, "emp": emp, "other": other, "plan_a": plan_a, "plan_b": plan_b, "act_b": act_b}
+
+
+def test_index_built_in_one_query_and_cached(setup):
+    with CaptureQueriesContext(connection) as ctx:
+        index = get_allocation_index(setup["day"])
+    assert len(ctx.captured_queries) == 1
+    assert index.hours(setup["emp"].id) == 10
+    assert index.overbooked() == {setup["emp"].id: 10}
+    assert index.double_booked() == {setup["emp"].id: {setup["plan_a"].project_id, setup["plan_b"].project_id}}
+
+    with CaptureQueriesContext(connection) as ctx:
+        get_allocation_index(setup["day"])
+    assert len(ctx.captured_queries) == 0
+
+
+def test_index_invalidated_when_crew_changes(setup):
+    get_allocation_index(setup["day"])
+    setup["act_b"].assigned_employees.remove(setup["emp"])
+    assert get_allocation_index(setup["day"]).overbooked() == {}
+
+    setup["other"].assigned_activities.add(setup["act_b"])
+    assert get_allocation_index(setup["day"]).project_ids(setup["other"].id) == {
+        setup["plan_a"].project_id,
+        setup["plan_b"].project_id,
+    }
+
+
+def test_analysis_reports_cross_project_conflicts(setup):
+    report = DailyPlanAIAssistant().analyze_plan(setup["plan_a"])
+    by_type = {}
+    for issue in report.employee_issues:
+        by_type.setdefault(issue.issue_type, []).append(issue)
+
+    assert [i.employee_name for i in by_type["overtime"]] == ["Cesar Lopez"]
+    assert "Install windows" in by_type["double_booking"][0].description
+    assert "Employee Ana Ruiz workload is reasonable" in report.passed_checks
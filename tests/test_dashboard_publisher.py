@@ -0,0 +1,88 @@
+"""
+Dashboard publisher: one snapshot per change burst, shared by every viewer.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+import pytest
+
+from core.models import Expense, Income, Project
+from core.routing import websocket_urlpatterns
+from core.services import dashboard_publisher
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="Live", start_date=date.today(), budget_total=Decimal("1000"))
+
+
+def test_viewers_share_one_computation(project, django_assert_num_queries):
+    first = dashboard_publisher.current_snapshot(project.id)
+    assert first["project_name"] == "Live" and first["budget_total"] == 1000.0
+
+    with django_assert_num_queries(0):
+        assert [dashboard_publisher.current_snapshot(project.id) for _ in range(5)] == [first] * 5
+
+
+def test_write_burst_schedules_one_publish(project, mocker, django_capture_on_commit_callbacks):
+    apply_async = mocker.patch("core.tasks.publish_project_dashboard.apply_async")
+    dashboard_publisher.current_snapshot(project.id)  # someone is watching
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for i in range(3):
+            Expense.objects.create(project=project, amount=Decimal("10"), project_name="x", date=date.today())
+        Income.objects.create(project=project, amount=Decimal("50"), project_name="x", date=date.today())
+
+    apply_async.assert_called_once_with((project.id,), countdown=dashboard_publisher.DEBOUNCE_SECONDS)
+
+
+def test_unwatched_projects_are_not_recomputed(project, mocker, django_capture_on_commit_callbacks):
+    apply_async = mocker.patch("core.tasks.publish_project_dashboard.apply_async")
+    with django_capture_on_commit_callbacks(execute=True):
+        Expense.objects.create(project=project, amount=Decimal("10"), project_name="x", date=date.today())
+    apply_async.assert_not_called()
+
+
+def test_publish_broadcasts_fresh_snapshot(project):
+    layer = get_channel_layer()
+    channel = async_to_sync(layer.new_channel)()
+    async_to_sync(layer.group_add)(dashboard_publisher.group_name(project.id), channel)
+    Expense.objects.create(project=project, amount=Decimal("40"), project_name="x", date=date.today())
+
+    dashboard_publisher.publish(project.id)
+
+    message = async_to_sync(layer.receive)(channel)
+    assert message["type"] == "dashboard_snapshot"
+    assert message["snapshot"]["budget_remaining"] == 960.0
+    assert cache.get(dashboard_publisher.SNAPSHOT_KEY.format(project.id)) == message["snapshot"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_late_joiner_gets_cached_snapshot():
+    user = await User.objects.acreate(username="dash_viewer")
+    cached = {"project_name": "Cached", "computed_on": date.today().isoformat()}
+    cache.set(dashboard_publisher.SNAPSHOT_KEY.format(7), cached)
+
+    communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), "/ws/dashboard/project/7/")
+    communicator.scope["user"] = user
+    connected, _ = await communicator.connect()
+    assert connected
+    assert await communicator.receive_json_from() == {"type": "dashboard_data", **cached}
+    await communicator.disconnect()
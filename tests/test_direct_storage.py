@@ -0,0 +1,104 @@
+"""
+Direct-to-storage project file transfers (presigned URL layer, local stand-in).
+"""
+
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import Client
+
+from core.models import FileCategory, Project, ProjectFile
+from core.services import direct_storage
+
+User = get_user_model()
+
+
+@pytest.fixture
+def staff(db):
+    return User.objects.create_user(username="files_staff", password="pwd123", is_staff=True)
+
+
+@pytest.fixture
+def client_logged_in(staff):
+    c = Client()
+    c.force_login(staff)
+    return c
+
+
+@pytest.fixture
+def project_file(staff):
+    project = Project.objects.create(name="Files Project", start_date=date.today())
+    category = FileCategory.objects.create(project=project, name="Docs", category_type="documents")
+    pf = ProjectFile(project=project, category=category, name="plan.pdf", uploaded_by=staff)
+    pf.file.save("plan.pdf", ContentFile(b"%PDF-1.4 test"), save=False)
+    pf.save()
+    return pf
+
+
+def test_download_redirects_to_signed_url_and_buffers_counter(client_logged_in, project_file):
+    res = client_logged_in.get(f"/files/{project_file.id}/download/")
+    assert res.status_code == 302
+    assert res["Location"].startswith("/storage/signed/")
+
+    # Counter is buffered, not written on the request path
+    project_file.refresh_from_db()
+    assert project_file.download_count == 0
+
+    blob = client_logged_in.get(res["Location"])
+    assert blob.status_code == 200
+    assert b"".join(blob.streaming_content) == b"%PDF-1.4 test"
+
+    client_logged_in.get(f"/files/{project_file.id}/download/")
+    assert direct_storage.flush_download_counts() == 1
+    project_file.refresh_from_db()
+    assert project_file.download_count == 2
+    assert direct_storage.flush_download_counts() == 0
+
+
+def test_signed_download_rejects_tampered_token(client_logged_in, project_file):
+    url = direct_storage.presigned_download_url(project_file.file)
+    assert Client().get(url).status_code == 200  # no session needed
+    assert Client().get(url[:-3] + "xyz/").status_code == 403
+
+
+def test_direct_upload_round_trip(client_logged_in, project_file):
+    category = project_file.category
+    init = client_logged_in.post(
+        f"/projects/{category.project_id}/files/{category.id}/upload/direct/",
+        {"filename": "Site Report.pdf", "content_type": "application/pdf", "size": 11},
+        content_type="application/json",
+    )
+    assert init.status_code == 200
+    upload = init.json()
+    assert upload["method"] == "PUT"
+    assert upload["key"].endswith("_SiteReport.pdf")
+
+    put = Client().put(upload["url"], b"hello world", content_type="application/pdf")
+    assert put.status_code == 200
+
+    done = client_logged_in.post(
+        "/files/upload/complete/",
+        {"token": upload["token"], "description": "weekly"},
+        content_type="application/json",
+    )
+    assert done.status_code == 201
+    pf = ProjectFile.objects.get(pk=done.json()["id"])
+    assert pf.file.name == upload["key"]
+    assert pf.file_size == 11
+    assert pf.name == "Site Report.pdf"
+    assert pf.file_type == "pdf"
+
+
+def test_upload_complete_requires_object_in_storage(client_logged_in, project_file):
+    category = project_file.category
+    upload = client_logged_in.post(
+        f"/projects/{category.project_id}/files/{category.id}/upload/direct/",
+        {"filename": "missing.pdf"},
+        content_type="application/json",
+    ).json()
+    done = client_logged_in.post(
+        "/files/upload/complete/", {"token": upload["token"]}, content_type="application/json"
+    )
+    assert done.status_code == 409
@@ -0,0 +1,80 @@
+"""
+Batched notification email delivery (locmem backend).
+"""
+
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+
+from core.models import Notification
+from core.services import email_delivery
+from core.tasks import send_pending_notifications
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def fresh_budget():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def users(db):
+    return [User.objects.create_user(username=f"mail{i}", password="x", email=f"mail{i}@example.com") for i in range(3)]
+
+
+def _notify(user, title):
+    return Notification.objects.create(user=user, notification_type="info", title=title, message="Hola")
+
+
+def test_one_email_per_user_over_one_connection(users):
+    _notify(users[0], "Only one")
+    for i in range(3):
+        _notify(users[1], f"Item {i}")
+
+    with patch("core.services.email_delivery.get_connection", wraps=email_delivery.get_connection) as conn:
+        result = send_pending_notifications()
+
+    assert conn.call_count == 1
+    assert result["sent"] == 4 and result["emails"] == 2
+    subjects = sorted(m.subject for m in mail.outbox)
+    assert subjects[0] == "Only one"
+    assert "(3)" in subjects[1]
+    assert not Notification.objects.filter(sent_via_email=False).exists()
+
+
+@override_settings(EMAIL_HOURLY_LIMIT=2)
+def test_backlog_beyond_budget_is_deferred(users):
+    for user in users:
+        _notify(user, "Hello")
+
+    result = send_pending_notifications()
+    assert result["emails"] == 2 and result["deferred_users"] == 1
+    assert Notification.objects.filter(sent_via_email=False).count() == 1
+
+    # Budget exhausted for this hour
+    assert send_pending_notifications()["emails"] == 0
+
+
+def test_failed_message_stays_pending(users):
+    _notify(users[0], "A")
+    _notify(users[1], "B")
+
+    real_send = mail.get_connection().__class__.send_messages
+
+    def flaky(self, messages):
+        if messages[0].to == [users[0].email]:
+            raise OSError("connection reset")
+        return real_send(self, messages)
+
+    with patch("django.core.mail.backends.locmem.EmailBackend.send_messages", flaky):
+        result = send_pending_notifications()
+
+    assert result["sent"] == 1 and result["errors"] == 1
+    assert list(Notification.objects.filter(sent_via_email=False).values_list("user_id", flat=True)) == [users[0].id]
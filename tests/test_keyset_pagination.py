@@ -0,0 +1,101 @@
+"""
+Keyset pagination: opt-in via ?cursor=, stable across ties, walks both ways.
+"""
+
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+import pytest
+from rest_framework.test import APIClient
+
+from core.models import AuditLog, Employee, Notification, TimeEntry
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="keyset", password="x", is_staff=True)
+
+
+@pytest.fixture
+def api(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def notifications(user):
+    rows = [Notification.objects.create(user=user, notification_type="info", title=f"N{i}") for i in range(7)]
+    # Ties on created_at must still page deterministically (broken by id)
+    stamp = timezone.now()
+    Notification.objects.filter(id__in=[n.id for n in rows[2:5]]).update(created_at=stamp)
+    Notification.objects.filter(id__in=[n.id for n in rows[5:]]).update(created_at=stamp + timedelta(seconds=1))
+    return list(Notification.objects.filter(user=user).order_by("-created_at", "-id").values_list("id", flat=True))
+
+
+def _walk(api, url, link):
+    pages = []
+    while url:
+        data = api.get(url).json()
+        pages.append([row["id"] for row in data["results"]])
+        url = data[link]
+    return pages
+
+
+def test_forward_and_backward_walk(api, notifications):
+    forward = _walk(api, "/api/v1/notifications/?cursor=&page_size=3", "next")
+    assert [i for page in forward for i in page] == notifications
+    assert [len(page) for page in forward] == [3, 3, 1]
+
+    last_page = api.get("/api/v1/notifications/?cursor=&page_size=3").json()
+    last_page = api.get(api.get(last_page["next"]).json()["next"]).json()
+    assert last_page["has_more"] is False
+    backward = _walk(api, last_page["previous"], "previous")
+    assert backward == [notifications[3:6], notifications[0:3]]
+
+
+def test_envelope_and_optional_count(api, notifications):
+    data = api.get("/api/v1/notifications/?cursor=&page_size=5").json()
+    assert list(data) == ["count", "count_is_estimate", "next", "previous", "page_size", "has_more", "results"]
+    assert data["previous"] is None and data["has_more"] is True and data["page_size"] == 5
+
+    exact = api.get("/api/v1/notifications/?cursor=&count=exact").json()
+    assert exact["count"] == 7 and exact["count_is_estimate"] is False
+
+
+def test_page_number_clients_unchanged(api, notifications):
+    data = api.get("/api/v1/notifications/?page=1").json()
+    assert data["count"] == 7 and "has_more" not in data
+
+
+def test_invalid_cursor(api, notifications):
+    assert api.get("/api/v1/notifications/?cursor=bm9wZQ").status_code == 404
+
+
+def test_deep_pages_issue_the_same_queries(api, user, django_assert_max_num_queries):
+    now = timezone.now()
+    AuditLog.objects.bulk_create(
+        AuditLog(user=user, username=user.username, action="view", entity_type="project", entity_id=i) for i in range(40)
+    )
+    AuditLog.objects.update(timestamp=now)
+    url = "/api/v1/audit-logs/?cursor=&page_size=10"
+    seen = []
+    while url:
+        with django_assert_max_num_queries(4):
+            data = api.get(url).json()
+        seen.extend(row["id"] for row in data["results"])
+        url = data["next"]
+    assert sorted(seen) == sorted(AuditLog.objects.values_list("id", flat=True))
+    assert len(seen) == len(set(seen)) == 40
+
+
+def test_time_entries_keyed_on_date(api, user):
+    employee = Employee.objects.create(first_name="K", last_name="S", social_security_number="000-00-0001", hourly_rate=20)
+    for offset in range(5):
+        TimeEntry.objects.create(employee=employee, date=date.today() - timedelta(days=offset % 2), start_time="08:00")
+    expected = list(TimeEntry.objects.order_by("-date", "-id").values_list("id", flat=True))
+    pages = _walk(api, "/api/v1/time-entries/?cursor=&page_size=2", "next")
+    assert [i for page in pages for i in page] == expected
@@ -0,0 +1,63 @@
+"""
+Notification fan-out: constant queries per event, dedupe window, WS push.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Notification, Project
+from core.notifications import notify_users
+
+User = get_user_model()
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="Fanout", start_date=date.today())
+
+
+def _staff(n):
+    return [User.objects.create_user(username=f"staff{i}", password="x", is_staff=True) for i in range(n)]
+
+
+@pytest.mark.parametrize("audience_size", [2, 20])
+def test_queries_do_not_grow_with_audience(project, audience_size, django_capture_on_commit_callbacks):
+    _staff(audience_size)
+    with CaptureQueriesContext(connection) as ctx, django_capture_on_commit_callbacks():
+        created = notify_users(
+            User.objects.filter(is_staff=True),
+            notification_type="task_alert",
+            title="Heads up",
+            project=project,
+        )
+    assert len(created) == audience_size
+    assert len(ctx.captured_queries) <= 3
+    assert Notification.objects.filter(title="Heads up").count() == audience_size
+
+
+def test_dedupe_window_and_exclude(project):
+    users = _staff(3)
+    kwargs = dict(notification_type="task_alert", title="Low stock: Tape", related_object_type="inventory", related_object_id=7)
+
+    assert len(notify_users(users, exclude=[users[0]], dedupe_window=3600, **kwargs)) == 2
+    # Same alert again: only the user who has not received it yet
+    assert [n.user_id for n in notify_users(users, dedupe_window=3600, **kwargs)] == [users[0].id]
+    assert notify_users(users, dedupe_window=3600, **kwargs) == []
+
+
+def test_push_sent_per_recipient_after_commit(project, django_capture_on_commit_callbacks):
+    users = _staff(2)
+    with patch("channels.layers.InMemoryChannelLayer.group_send") as group_send:
+        with django_capture_on_commit_callbacks(execute=True):
+            created = notify_users(users, notification_type="task_alert", title="Ping")
+
+    groups = sorted(call.args[0] for call in group_send.call_args_list)
+    assert groups == sorted(f"notifications_{u.id}" for u in users)
+    event = group_send.call_args_list[0].args[1]
+    assert event["type"] == "notification"
+    assert event["notification_id"] in {n.id for n in created}
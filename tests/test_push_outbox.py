@@ -0,0 +1,87 @@
+"""
+Push outbox: enqueue without provider round trips, batched dispatch, retries.
+"""
+
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.models import PushOutbox, PushSubscription
+from core.notifications_push import PushNotificationService
+from core.services import push_outbox
+
+User = get_user_model()
+
+
+@pytest.fixture
+def fake():
+    provider = push_outbox.FakePushProvider()
+    previous = push_outbox.set_provider("onesignal", provider)
+    cache.delete(push_outbox.DISPATCH_LOCK_KEY)
+    yield provider
+    push_outbox.set_provider("onesignal", previous)
+
+
+@pytest.fixture
+def users(db):
+    return [User.objects.create_user(username=f"push{i}", password="x") for i in range(3)]
+
+
+def test_send_notification_only_queues(fake, users, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        queued = PushNotificationService.send_notification(
+            [u.id for u in users], "CO approved", "CO #7", url="/co/7/"
+        )
+    assert queued == 3
+    assert PushOutbox.objects.filter(status=PushOutbox.STATUS_PENDING).count() == 3
+    assert fake.batches == []
+    assert callbacks == [push_outbox._schedule_dispatch]
+
+
+def test_dispatch_collapses_per_recipient_in_one_batch(fake, users):
+    for title in ("Task A", "Task B"):
+        push_outbox.enqueue_push([users[0].id], title, "body")
+    push_outbox.enqueue_push([users[1].id], "Invoice", "body")
+
+    result = push_outbox.dispatch_pending()
+    assert result["sent"] == 3
+    assert len(fake.batches) == 1
+    by_user = {m.user_id: m for m in fake.sent}
+    assert by_user[users[0].id].title == "You have 2 new notifications"
+    assert by_user[users[1].id].title == "Invoice"
+    assert not PushOutbox.objects.exclude(status=PushOutbox.STATUS_SENT).exists()
+
+
+def test_failures_back_off_then_give_up(fake, users):
+    fake.fail_with = "503 Service Unavailable"
+    push_outbox.enqueue_push([users[0].id], "Hello")
+
+    push_outbox.dispatch_pending()
+    row = PushOutbox.objects.get()
+    assert row.status == PushOutbox.STATUS_PENDING and row.attempts == 1
+    assert row.next_attempt_at > timezone.now()
+    # Not due yet
+    assert push_outbox.dispatch_pending()["retried"] == 0
+
+    PushOutbox.objects.update(attempts=push_outbox.MAX_ATTEMPTS - 1, next_attempt_at=timezone.now() - timedelta(1))
+    assert push_outbox.dispatch_pending()["failed"] == 1
+    assert PushOutbox.objects.get().status == PushOutbox.STATUS_FAILED
+
+
+def test_dead_fcm_tokens_pruned_in_bulk(users):
+    fcm = push_outbox.FakePushProvider("fcm", uses_device_tokens=True, dead_tokens={"https://push/dead"})
+    previous = push_outbox.set_provider("fcm", fcm)
+    cache.delete(push_outbox.DISPATCH_LOCK_KEY)
+    try:
+        for endpoint in ("https://push/ok", "https://push/dead"):
+            PushSubscription.objects.create(user=users[0], endpoint=endpoint, p256dh="k", auth="a")
+        push_outbox.enqueue_push([users[0].id], "Hi", channel="fcm")
+        result = push_outbox.dispatch_pending()
+    finally:
+        push_outbox.set_provider("fcm", previous)
+
+    assert set(fcm.sent[0].tokens) == {"https://push/ok", "https://push/dead"}
+    assert result["pruned"] == 1
+    assert list(PushSubscription.objects.values_list("endpoint", flat=True)) == ["https://push/ok"]
@@ -0,0 +1,110 @@
+"""
+Resumable chunked uploads: shared session state, offsets, streaming assembly.
+"""
+
+import base64
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from rest_framework.test import APIClient
+
+from core.models import ChatChannel, FileAttachment, Project
+from core.services import resumable_upload
+from core.websocket_file_handler import FileAttachmentHandler
+
+User = get_user_model()
+
+PAYLOAD = b"%PDF-1.4 " + bytes(range(256)) * 40
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="uploader", password="x", is_staff=True)
+
+
+@pytest.fixture
+def channel(user):
+    project = Project.objects.create(name="Upload Project", start_date=date.today())
+    return ChatChannel.objects.create(project=project, name="general", created_by=user)
+
+
+def test_chunks_resume_from_acknowledged_offset(user):
+    state = resumable_upload.start_session(user.id, "a.pdf", "application/pdf", len(PAYLOAD))
+    sid = state["session_id"]
+
+    resumable_upload.append_chunk(sid, 0, PAYLOAD[:4000], user_id=user.id)
+    # Resent chunk after a lost ack is acknowledged, not stored twice
+    state = resumable_upload.append_chunk(sid, 0, PAYLOAD[:4000], user_id=user.id)
+    assert state["offset"] == 4000
+    # A gap is refused with the offset to resume from
+    with pytest.raises(resumable_upload.UploadError) as exc:
+        resumable_upload.append_chunk(sid, 8000, PAYLOAD[8000:], user_id=user.id)
+    assert exc.value.expected_offset == 4000
+
+    # Nothing lives in the handler: a "different worker" only needs the cache
+    assert resumable_upload.get_session(sid)["offset"] == 4000
+    resumable_upload.append_chunk(sid, 4000, PAYLOAD[4000:], user_id=user.id)
+
+    stored, state = resumable_upload.finalize(sid, "test_uploads/a.pdf", user_id=user.id)
+    with default_storage.open(stored, "rb") as fh:
+        assert fh.read() == PAYLOAD
+    assert len(state["digest"]) == 64
+    assert resumable_upload.get_session(sid) is None
+    assert not default_storage.exists(resumable_upload._part_name(sid, 0))
+
+
+def test_session_is_private_to_its_owner(user):
+    other = User.objects.create_user(username="other", password="x")
+    sid = resumable_upload.start_session(user.id, "a.pdf", "application/pdf", 10)["session_id"]
+    assert resumable_upload.get_session(sid, other.id) is None
+    with pytest.raises(resumable_upload.UploadError):
+        resumable_upload.append_chunk(sid, 0, b"x", user_id=other.id)
+
+
+def test_websocket_handler_keeps_no_per_process_state(user, channel):
+    meta = {"filename": "doc.pdf", "file_type": "application/pdf", "file_size": len(PAYLOAD)}
+    ok, error = FileAttachmentHandler().start_upload_session("ws-1", meta, user.id)
+    assert ok, error
+
+    # Chunks handled by two separate handler instances (two workers)
+    half = len(PAYLOAD) // 2
+    ok, _ = FileAttachmentHandler().add_chunk("ws-1", base64.b64encode(PAYLOAD[:half]), 0, 0, user.id)
+    assert ok
+    ok, progress = FileAttachmentHandler().add_chunk(
+        "ws-1", base64.b64encode(PAYLOAD[half:]), 1, half, user.id
+    )
+    assert ok and progress == 100
+
+    attachment_id, file_url, _thumb = FileAttachmentHandler().complete_upload("ws-1", user, channel.id)
+    attachment = FileAttachment.objects.get(pk=attachment_id)
+    assert attachment.file_size == len(PAYLOAD)
+    assert attachment.upload_session_id == "ws-1"
+    with default_storage.open(file_url, "rb") as fh:
+        assert fh.read() == PAYLOAD
+
+
+def test_http_upload_with_resume(user, channel):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    res = client.post(
+        "/api/v1/uploads/",
+        {"filename": "doc.pdf", "file_type": "application/pdf", "file_size": len(PAYLOAD), "channel_id": channel.id},
+        format="json",
+    )
+    assert res.status_code == 201
+    sid = res.data["session_id"]
+    url = f"/api/v1/uploads/{sid}/chunk/"
+
+    res = client.put(url, PAYLOAD[:5000], content_type="application/octet-stream", HTTP_UPLOAD_OFFSET="0")
+    assert res.data["offset"] == 5000
+    res = client.put(url, PAYLOAD[6000:], content_type="application/octet-stream", HTTP_UPLOAD_OFFSET="6000")
+    assert res.status_code == 409 and res.data["offset"] == 5000
+
+    assert client.get(f"/api/v1/uploads/{sid}/").data["offset"] == 5000
+    client.put(url, PAYLOAD[5000:], content_type="application/octet-stream", HTTP_UPLOAD_OFFSET="5000")
+
+    res = client.post(f"/api/v1/uploads/{sid}/complete/")
+    assert res.status_code == 201
+    assert FileAttachment.objects.get(pk=res.data["attachment_id"]).channel == channel
@@ -0,0 +1,125 @@
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from kibray_backend.sessions import SessionStore, get_cached_active_session_key
+
+User = get_user_model()
+
+CACHED_SESSIONS = override_settings(
+    SESSION_ENGINE="kibray_backend.sessions",
+    SESSION_SAVE_EVERY_REQUEST=True,
+    SESSION_COOKIE_AGE=28800,
+    SESSION_REFRESH_THRESHOLD=21600,
+)
+
+
+def _session_writes(queries):
+    return [
+        q["sql"]
+        for q in queries
+        if "django_session" in q["sql"] and q["sql"].lstrip().upper().startswith(("UPDATE", "INSERT"))
+    ]
+
+
+@pytest.mark.django_db
+@CACHED_SESSIONS
+def test_unmodified_session_is_not_rewritten():
+    store = SessionStore()
+    store["foo"] = "bar"
+    store.save()
+    expires_at = store.get_persisted_expiry()
+    assert expires_at
+    assert "_kibray_expires_at" not in dict(store.items())
+
+    reloaded = SessionStore(store.session_key)
+    assert reloaded["foo"] == "bar"
+    with CaptureQueriesContext(connection) as ctx:
+        reloaded.save()
+    assert _session_writes(ctx.captured_queries) == []
+    assert SessionStore(store.session_key).get_persisted_expiry() == expires_at
+
+
+@pytest.mark.django_db
+@CACHED_SESSIONS
+def test_session_refreshed_when_expiry_is_near(monkeypatch):
+    # Save seven hours "ago" so the persisted copy only has one hour left
+    now = time.time()
+    monkeypatch.setattr("kibray_backend.sessions.time.time", lambda: now - 7 * 3600)
+    store = SessionStore()
+    store["foo"] = "bar"
+    store.save()
+    near = store.get_persisted_expiry()
+    monkeypatch.undo()
+
+    reloaded = SessionStore(store.session_key)
+    with CaptureQueriesContext(connection) as ctx:
+        reloaded.save()
+    assert len(_session_writes(ctx.captured_queries)) == 1
+    assert SessionStore(store.session_key).get_persisted_expiry() > near
+
+
+@pytest.mark.django_db
+@CACHED_SESSIONS
+def test_authenticated_page_view_makes_no_session_or_profile_writes():
+    User.objects.create_user(username="cached", password="pwd123")
+    client = Client()
+    assert client.login(username="cached", password="pwd123")
+    client.get("/api/v1/notifications/")  # first request registers the session
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/v1/notifications/")
+    assert response.status_code == 200
+    sql = [q["sql"] for q in ctx.captured_queries]
+    assert _session_writes(ctx.captured_queries) == []
+    assert not any("django_session" in s for s in sql)
+    assert not any(s.startswith("UPDATE") and "core_profile" in s for s in sql)
+
+
+@pytest.mark.django_db
+@CACHED_SESSIONS
+def test_single_session_enforced_with_cached_engine():
+    user = User.objects.create_user(username="two", password="pwd123")
+
+    c1 = Client()
+    assert c1.login(username="two", password="pwd123")
+    assert c1.get("/api/v1/notifications/").status_code == 200
+    old_key = c1.session.session_key
+
+    c2 = Client()
+    assert c2.login(username="two", password="pwd123")
+    assert c2.get("/api/v1/notifications/").status_code == 200
+    assert get_cached_active_session_key(user.pk) == c2.session.session_key
+
+    # The old session is gone from both the DB and the session cache
+    assert not Session.objects.filter(session_key=old_key).exists()
+    assert not SessionStore().exists(old_key)
+    assert c1.get("/api/v1/notifications/").status_code in (401, 403)
+
+
+@pytest.mark.django_db
+@CACHED_SESSIONS
+def test_idle_session_expires_after_expire_date():
+    from datetime import timedelta
+
+    from django.core.cache import caches
+    from django.utils import timezone
+
+    User.objects.create_user(username="idle", password="pwd123")
+    client = Client()
+    assert client.login(username="idle", password="pwd123")
+    assert client.get("/api/v1/notifications/").status_code == 200
+    key = client.session.session_key
+
+    # Server-side expiry passes while the user is idle. The cached copy was
+    # stored with the same TTL, so it is gone too.
+    Session.objects.filter(session_key=key).update(expire_date=timezone.now() - timedelta(seconds=1))
+    caches["default"].delete(f"django.contrib.sessions.cached_db{key}")
+
+    assert SessionStore(key).load() == {}
+    assert client.get("/api/v1/notifications/").status_code in (401, 403)
@@ -0,0 +1,132 @@
+"""
+Site photo background image pipeline (renditions + EXIF GPS in one decode).
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.models import Project, SitePhoto
+from core.services.image_pipeline import render_image
+
+User = get_user_model()
+
+
+def _jpeg_with_gps(size=(2400, 1800)):
+    """A JPEG with an EXIF GPS block (39°38'24"N, 106°3'0"W — Silverthorne, CO)."""
+    img = Image.new("RGB", size, (200, 120, 40))
+    exif = Image.Exif()
+    gps = exif.get_ifd(0x8825)
+    gps[1] = "N"
+    gps[2] = (39.0, 38.0, 24.0)
+    gps[3] = "W"
+    gps[4] = (106.0, 3.0, 0.0)
+    out = BytesIO()
+    img.save(out, format="JPEG", exif=exif)
+    return out.getvalue()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def admin_user(db):
+    return User.objects.create_user(username="pipeline_admin", password="x", is_staff=True)
+
+
+@pytest.fixture
+def project(db):
+    return Project.objects.create(name="PipelineProject", start_date=date.today())
+
+
+@pytest.fixture(autouse=True)
+def run_pipeline_inline():
+    """Run the Celery task in-process whatever the eager setting is."""
+    from core.tasks import process_site_photo_image
+
+    with mock.patch.object(process_site_photo_image, "delay", side_effect=process_site_photo_image):
+        yield
+
+
+def test_render_image_builds_all_renditions_from_one_decode():
+    result = render_image(BytesIO(_jpeg_with_gps()))
+
+    assert result["gps"] == (39.64, -106.05)
+    thumb = Image.open(BytesIO(result["renditions"]["thumbnail"]))
+    medium = Image.open(BytesIO(result["renditions"]["medium"]))
+    webp = Image.open(BytesIO(result["renditions"]["webp"]))
+    assert max(thumb.size) == 300
+    assert max(medium.size) <= 1600
+    assert (thumb.format, medium.format, webp.format) == ("JPEG", "JPEG", "WEBP")
+
+
+def test_render_image_flattens_transparent_png():
+    img = Image.new("RGBA", (50, 40), (0, 0, 0, 0))
+    out = BytesIO()
+    img.save(out, format="PNG")
+    result = render_image(BytesIO(out.getvalue()))
+    assert result["gps"] == (None, None)
+    assert Image.open(BytesIO(result["renditions"]["thumbnail"])).mode == "RGB"
+
+
+def test_upload_returns_pending_then_pipeline_fills_renditions(
+    api_client, admin_user, project, django_capture_on_commit_callbacks
+):
+    api_client.force_authenticate(user=admin_user)
+    upload = SimpleUploadedFile("field.jpg", _jpeg_with_gps(), content_type="image/jpeg")
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        res = api_client.post(
+            "/api/v1/site-photos/", {"project": project.id, "image": upload}, format="multipart"
+        )
+    assert res.status_code == 201
+    assert res.data["processing_status"] == SitePhoto.PROCESSING_PENDING
+    assert res.data["thumbnail"] is None
+
+    # Run the queued Celery task.
+    for callback in callbacks:
+        callback()
+
+    photo = SitePhoto.objects.get(pk=res.data["id"])
+    assert photo.processing_status == SitePhoto.PROCESSING_READY
+    assert photo.thumbnail and photo.medium and photo.webp
+    assert photo.location_lat == Decimal("39.640000")
+    assert photo.location_lng == Decimal("-106.050000")
+
+
+def test_pipeline_keeps_client_supplied_location(api_client, admin_user, project, django_capture_on_commit_callbacks):
+    api_client.force_authenticate(user=admin_user)
+    upload = SimpleUploadedFile("field.jpg", _jpeg_with_gps(), content_type="image/jpeg")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        res = api_client.post(
+            "/api/v1/site-photos/",
+            {"project": project.id, "image": upload, "location_lat": "37.7749", "location_lng": "-122.4194"},
+            format="multipart",
+        )
+
+    photo = SitePhoto.objects.get(pk=res.data["id"])
+    assert photo.location_lat == Decimal("37.774900")
+    assert photo.location_lng == Decimal("-122.419400")
+
+
+def test_corrupt_upload_marks_photo_failed(api_client, admin_user, project, django_capture_on_commit_callbacks):
+    api_client.force_authenticate(user=admin_user)
+    upload = SimpleUploadedFile("broken.jpg", b"not really a jpeg", content_type="image/jpeg")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        res = api_client.post(
+            "/api/v1/site-photos/", {"project": project.id, "image": upload}, format="multipart"
+        )
+
+    assert res.status_code == 201
+    assert SitePhoto.objects.get(pk=res.data["id"]).processing_status == SitePhoto.PROCESSING_FAILED
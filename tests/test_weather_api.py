@@ -37,7 +37,7 @@ class TestWeatherAPI:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_get = mocker.patch("requests.get", return_value=mock_response)
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Run task
         result = update_daily_weather_snapshots()
@@ -65,7 +65,7 @@ class TestWeatherAPI:
         # Mock API error
         import requests
 
-        mock_get = mocker.patch.object(requests, "get", side_effect=Exception("API timeout"))
+        mock_get = mocker.patch.object(requests.Session, "get", side_effect=Exception("API timeout"))
 
         # Run task (should not crash)
         result = update_daily_weather_snapshots()
@@ -108,7 +108,7 @@ class TestWeatherAPI:
             }
         }
         mock_response.raise_for_status = Mock()
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Run task
         result = update_daily_weather_snapshots()
@@ -145,7 +145,7 @@ class TestWeatherAPI:
                 }
             }
             mock_response.raise_for_status = Mock()
-            mocker.patch("requests.get", return_value=mock_response)
+            mocker.patch("requests.Session.get", return_value=mock_response)
 
             # Delete existing snapshot
             WeatherSnapshot.objects.filter(project=project).delete()
@@ -188,7 +188,7 @@ class TestWeatherAPI:
             }
         }
         mock_response.raise_for_status = Mock()
-        mocker.patch("requests.get", return_value=mock_response)
+        mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Run task
         result = update_daily_weather_snapshots()
@@ -215,7 +215,7 @@ class TestWeatherAPI:
         }
         mock_response.raise_for_status = Mock()
 
-        mock_get = mocker.patch("requests.get", return_value=mock_response)
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
         # Run task
         update_daily_weather_snapshots()
@@ -255,7 +255,7 @@ class TestWeatherAPI:
                 }
             }
             mock_response.raise_for_status = Mock()
-            mocker.patch("requests.get", return_value=mock_response)
+            mocker.patch("requests.Session.get", return_value=mock_response)
 
             # Delete existing snapshot
             WeatherSnapshot.objects.filter(project=project).delete()
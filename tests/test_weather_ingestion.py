@@ -0,0 +1,87 @@
+"""
+Weather ingestion: one fetch per unique location, bulk writes, shared cache.
+"""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from core.models import DailyPlan, Project, WeatherSnapshot
+from core.services import weather_ingestion
+from core.services.weather import MockWeatherProvider, weather_service
+from core.tasks import update_daily_plans_weather
+
+User = get_user_model()
+
+
+class CountingProvider(MockWeatherProvider):
+    def __init__(self):
+        self.calls = []
+
+    def get_weather(self, latitude, longitude, date=None):
+        self.calls.append((latitude, longitude))
+        return super().get_weather(latitude, longitude, date)
+
+
+@pytest.fixture
+def projects(db):
+    today = date.today()
+    return [Project.objects.create(name=f"P{i}", start_date=today, address="1 Main St") for i in range(5)]
+
+
+def test_projects_at_one_location_share_a_single_fetch(projects):
+    provider = CountingProvider()
+    today = timezone.localdate()
+
+    result = weather_ingestion.ingest_project_snapshots(projects, today, provider=provider)
+    assert len(provider.calls) == 1
+    assert result["locations"] == 1
+    assert result["created"] == 5 and result["updated"] == 0
+    assert WeatherSnapshot.objects.filter(date=today, source="open-meteo").count() == 5
+
+    # Re-running upserts the same rows
+    result = weather_ingestion.ingest_project_snapshots(projects, today, provider=provider)
+    assert result["created"] == 0 and result["updated"] == 5
+    assert set(result["project_snapshot_ids"]) == {p.id for p in projects}
+    assert WeatherSnapshot.objects.filter(date=today, source="open-meteo").count() == 5
+
+
+def test_fetch_failure_is_reported_per_project(projects):
+    provider = Mock(spec=["get_weather"])
+    provider.get_weather.side_effect = RuntimeError("timeout")
+
+    result = weather_ingestion.ingest_project_snapshots(projects[:2], timezone.localdate(), provider=provider)
+    assert result["errors"] == ["P0: timeout", "P1: timeout"]
+    assert not WeatherSnapshot.objects.exists()
+
+
+def test_daily_plans_refreshed_once_per_location(projects):
+    pm = User.objects.create_user(username="wx_pm", password="x")
+    today = timezone.now().date()
+    for project in projects:
+        for day in (today, today + timedelta(days=1)):
+            DailyPlan.objects.create(
+                project=project,
+                plan_date=day,
+                created_by=pm,
+                completion_deadline=timezone.now() + timedelta(hours=8),
+            )
+
+    # Plan creation may already have fetched weather; make every plan due
+    DailyPlan.objects.update(weather_data=None, weather_fetched_at=None)
+
+    provider = CountingProvider()
+    previous = weather_service.get_provider()
+    weather_service.set_provider(provider)
+    weather_service._cache.clear()
+    try:
+        result = update_daily_plans_weather()
+    finally:
+        weather_service.set_provider(previous)
+
+    assert result["updated"] == 10 and result["errors"] == 0
+    assert len(provider.calls) == 1
+    assert not DailyPlan.objects.filter(weather_fetched_at__isnull=True).exists()
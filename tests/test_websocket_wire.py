@@ -0,0 +1,95 @@
+"""
+Negotiated WebSocket wire formats: msgpack / deflate frames and byte stats.
+"""
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+import pytest
+
+from core import websocket_wire
+from core.routing import websocket_urlpatterns
+from core.websocket_metrics import metrics
+from core.websocket_middleware import get_compression_stats
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+_app = URLRouter(websocket_urlpatterns)
+
+TASK = {"title": "Prime and paint north wall " * 4, "status": "In Progress", "notes": "Two coats. " * 80}
+
+
+def test_negotiation_prefers_client_order():
+    assert websocket_wire.negotiate(["chat", "kibray.msgpack", "kibray.json+deflate"]).name == "msgpack"
+    assert websocket_wire.negotiate(["chat"]) is websocket_wire.JSON
+    assert websocket_wire.negotiate(None) is websocket_wire.JSON
+
+
+@pytest.mark.parametrize("name", ["json+deflate", "msgpack", "msgpack+deflate"])
+def test_round_trip_and_threshold(name):
+    fmt = next(f for f in websocket_wire.FORMATS if f.name == name)
+    small = {"type": "task_deleted", "task_id": 7}
+    big = {"type": "task_updated", "task_data": TASK}
+
+    frame, size, compressed = fmt.encode(small)
+    assert frame[:1] == websocket_wire.HEADER_PLAIN and not compressed
+    assert websocket_wire.decode(frame, fmt) == small
+
+    frame, size, compressed = fmt.encode(big)
+    assert compressed is fmt.deflate
+    assert websocket_wire.decode(frame, fmt) == big
+    if fmt.deflate:
+        assert len(frame) < size / 4
+
+
+def test_compression_stats_report_ratio():
+    scope = {"websocket": {"wire": {"format": "msgpack+deflate", "frames": 2, "compressed_frames": 1,
+                                    "payload_bytes": 4000, "wire_bytes": 1000}}}
+    stats = get_compression_stats(scope)
+    assert stats["wire_format"] == "msgpack+deflate" and stats["ratio"] == 0.25
+    assert get_compression_stats({})["ratio"] == 1.0
+
+
+async def _connect(subprotocols):
+    user = await database_sync_to_async(User.objects.create_user)(username=f"wire_{len(subprotocols)}", password="x")
+    communicator = WebsocketCommunicator(_app, "/ws/tasks/42/", subprotocols=subprotocols)
+    communicator.scope["user"] = user
+    connected, subprotocol = await communicator.connect()
+    assert connected
+    return communicator, subprotocol
+
+
+@pytest.mark.asyncio
+async def test_task_consumer_sends_negotiated_frames():
+    metrics.reset()
+    communicator, subprotocol = await _connect(["kibray.msgpack+deflate"])
+    fmt = websocket_wire.BY_SUBPROTOCOL[subprotocol]
+    assert fmt.name == "msgpack+deflate"
+
+    hello = await communicator.receive_output()
+    assert websocket_wire.decode(hello["bytes"], fmt)["type"] == "connection_established"
+
+    await get_channel_layer().group_send(
+        "tasks_project_42", {"type": "task_updated", "task_id": 1, "task_data": TASK, "timestamp": "now"}
+    )
+    update = await communicator.receive_output()
+    assert update["bytes"][:1] == websocket_wire.HEADER_DEFLATED
+    assert websocket_wire.decode(update["bytes"], fmt)["task_data"] == TASK
+
+    bandwidth = metrics.get_summary()["bandwidth"]["by_format"]["msgpack+deflate"]
+    assert bandwidth["frames"] == 2 and bandwidth["compressed_frames"] == 1
+    assert bandwidth["ratio"] < 0.5
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_clients_without_subprotocol_keep_json_text():
+    communicator, subprotocol = await _connect([])
+    assert subprotocol is None
+    hello = await communicator.receive_json_from()
+    assert hello["type"] == "connection_established"
+    await communicator.disconnect()